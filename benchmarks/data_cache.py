@@ -0,0 +1,43 @@
+# benchmarks/data_cache.py
+"""
+CSV parsing vs the itpu.data columnar cache.
+
+Writes a synthetic multi-channel CSV, then times np.genfromtxt, the one-off
+cache build, a cached open and a one-channel/one-minute slice read.
+
+Run:
+  python benchmarks/data_cache.py [n_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from itpu.data import build_csv_cache, open_csv_cached
+
+
+def main(n_rows=500_000, n_channels=14, fs=128):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rec.csv")
+        data = rng.normal(size=(n_rows, n_channels))
+        header = ",".join(f"ch{i}" for i in range(n_channels))
+        np.savetxt(path, data, delimiter=",", fmt="%.6f", header=header, comments="")
+        print(f"source: {n_rows} rows x {n_channels} ch, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        t0 = time.perf_counter(); np.genfromtxt(path, delimiter=",", skip_header=1); t1 = time.perf_counter()
+        print(f"genfromtxt:        {t1 - t0:8.3f} s")
+        t0 = time.perf_counter(); build_csv_cache(path); t1 = time.perf_counter()
+        print(f"cache build:       {t1 - t0:8.3f} s (once)")
+        t0 = time.perf_counter(); ds = open_csv_cached(path); t1 = time.perf_counter()
+        print(f"cached open:       {(t1 - t0) * 1e3:8.3f} ms")
+        t0 = time.perf_counter(); ds.read(["ch3"], start=n_rows // 2, stop=n_rows // 2 + 60 * fs); t1 = time.perf_counter()
+        print(f"1 ch x 60 s slice: {(t1 - t0) * 1e3:8.3f} ms")
+        t0 = time.perf_counter(); ds.read(); t1 = time.perf_counter()
+        print(f"full read:         {(t1 - t0) * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -1,7 +1,8 @@
 # examples/eeg_eye_state_demo.py
 """
 EEG Eye State demo:
-- Tries to load data/eeg_eye_state.csv with 14 EEG channels + binary label.
+- Tries to load data/eeg_eye_state.csv with 14 EEG channels + binary label
+  (through the itpu.data columnar cache).
 - Computes pairwise MI across channels and MI(channel, label).
 - Saves heatmap + bar chart under results/examples/.
 
@@ -14,53 +15,22 @@ import os
 import numpy as np
 import matplotlib.pyplot as plt
 
+from itpu.data import load_eeg_eye_state, make_synthetic_eeg
 from itpu.sdk import ITPU
 
 DATA_PATH = "data/eeg_eye_state.csv"
 
 
-def try_load_csv(path):
-    if not os.path.exists(path):
-        return None
-    # Try to load with or without header; numeric only
-    try:
-        data = np.genfromtxt(path, delimiter=",", dtype=float, names=None)
-        if data.ndim == 1:
-            # Single row? not useful
-            return None
-        return data
-    except Exception:
-        return None
-
-
-def make_fallback(n=15000, d=14, seed=7):
-    # synthetic: 14 channels with mild correlations + binary label tied to ch0
-    rng = np.random.default_rng(seed)
-    z = rng.standard_normal((n, 1))
-    noise = rng.standard_normal((n, d))
-    X = 0.5 * z + np.sqrt(1 - 0.5**2) * noise
-    # label from ch0 threshold
-    y = (X[:, 0] + 0.2 * rng.standard_normal(n) > 0).astype(float)
-    return X, y
-
-
 def main():
     os.makedirs("results/examples", exist_ok=True)
 
-    raw = try_load_csv(DATA_PATH)
-    if raw is None:
-        print("EEG CSV not found; using synthetic fallback.")
-        X, y = make_fallback()
+    # Parsed once into a columnar cache under data/.itpu_cache/; later runs memory-map it.
+    X, y, fallback = load_eeg_eye_state(DATA_PATH)
+    if fallback or y is None:
+        print("EEG CSV not found or has <15 columns; using synthetic fallback.")
+        X, y = make_synthetic_eeg()
     else:
-        # If file has header, genfromtxt returns 2D float array already.
-        # Expect at least 15 columns: 14 channels + label
-        if raw.shape[1] < 15:
-            print("EEG CSV has <15 columns; using synthetic fallback.")
-            X, y = make_fallback()
-        else:
-            X = raw[:, :14].astype(float)
-            y = raw[:, 14].astype(float)
-            print(f"Loaded EEG data: X shape={X.shape}, y shape={y.shape}")
+        print(f"Loaded EEG data: X shape={X.shape}, y shape={y.shape}")
 
     itpu = ITPU(device="software")
 
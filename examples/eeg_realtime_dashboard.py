@@ -16,94 +16,34 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.widgets import Button
 
+from itpu.data import EEGSimulator
+from itpu.io import ResultStore
 from itpu.sdk import ITPU
-from itpu.utils.windowed import windowed_mi
-
-
-# ----------------------------- EEG Simulator ----------------------------- #
-class EEGSimulator:
-    """Simulates realistic EEG-like data with controllable states."""
-
-    def __init__(self, n_channels: int = 8, sample_rate: int = 250):
-        self.n_channels = n_channels
-        self.sample_rate = sample_rate
-        self.t = 0.0
-        self.state = "eyes_open"  # "eyes_open", "eyes_closed", "attention"
-        self.rng = np.random.default_rng(0)
-        # Simplified 10-20 names
-        self.channel_names = ['Fp1', 'Fp2', 'F3', 'F4', 'C3', 'C4', 'P3', 'P4'][:n_channels]
-
-        # Per-state parameters
-        self.state_params = {
-            "eyes_open":   {"alpha": 0.5, "beta": 1.0, "gamma": 0.3, "corr": 0.3},
-            "eyes_closed": {"alpha": 2.0, "beta": 0.5, "gamma": 0.2, "corr": 0.7},
-            "attention":   {"alpha": 0.3, "beta": 1.5, "gamma": 0.8, "corr": 0.5},
-        }
-
-    def set_state(self, new_state: str) -> None:
-        if new_state in self.state_params:
-            self.state = new_state
-            print(f"[EEG] state -> {new_state}")
-
-    def generate_sample(self, duration: float = 0.1) -> np.ndarray:
-        """Generate (n_channels, n_samples) for given duration in seconds."""
-        n_samples = int(duration * self.sample_rate)
-        t = np.linspace(self.t, self.t + duration, n_samples, endpoint=False)
-        self.t += duration
-
-        p = self.state_params[self.state]
-        # Base mixture for correlation
-        base = (p["alpha"] * np.sin(2*np.pi*10*t + self.rng.random()*2*np.pi) +
-                p["beta"]  * np.sin(2*np.pi*20*t + self.rng.random()*2*np.pi) +
-                p["gamma"] * np.sin(2*np.pi*40*t + self.rng.random()*2*np.pi) +
-                self.rng.normal(0, 0.5, size=n_samples))
-
-        X = np.empty((self.n_channels, n_samples), dtype=float)
-        for i, name in enumerate(self.channel_names):
-            noise = self.rng.normal(0, 0.5, size=n_samples)
-            sig = p["corr"] * base + (1 - p["corr"]) * noise
-            if name.startswith("Fp"):   # more theta frontally
-                sig += 0.3 * np.sin(2*np.pi*5*t)
-            if name.startswith("P"):    # more alpha parietally
-                sig += 0.5 * np.sin(2*np.pi*10*t)
-            X[i] = sig
-        return X
-
-
-# ----------------------------- MI Utilities ----------------------------- #
-def mi_matrix_hist(X: np.ndarray, window_size: int = 500, bins: int = 64) -> np.ndarray:
-    """
-    Pairwise histogram MI over the last 'window_size' samples.
-    X: (C, N) channels by time.
-    """
-    C, N = X.shape
-    if N < window_size:
-        return np.zeros((C, C), dtype=float)
-    itpu = ITPU()
-    seg = X[:, -window_size:]
-    M = np.zeros((C, C), dtype=float)
-    for i in range(C):
-        for j in range(i+1, C):
-            mij = itpu.mutual_info(seg[i], seg[j], method="hist", bins=bins)
-            M[i, j] = M[j, i] = mij
-    return M
+from itpu.utils.streaming import StreamingMI
 
 
 # ----------------------------- Dashboard ----------------------------- #
 class RealTimeMIDashboard:
     """Real-time dashboard showing MI heatmap + a tracked-pair MI time series."""
 
-    def __init__(self, eeg_sim: EEGSimulator, window_size: int = 500, update_interval_ms: int = 100):
+    def __init__(self, eeg_sim: EEGSimulator, window_size: int = 500, update_interval_ms: int = 100,
+                 store_path: str = "results/examples/dashboard_store"):
         self.eeg_sim = eeg_sim
         self.ws = window_size
         self.dt = update_interval_ms
         self.fs = eeg_sim.sample_rate
 
-        # Rolling buffer of recent samples (for all channels)
-        self.X = np.zeros((eeg_sim.n_channels, 0))
+        # Streaming MI session: ring buffer + incremental per-pair histograms.
+        # Budget = one frame interval, so real-time capability is tracked live.
+        self.hop = max(1, int(self.fs * self.dt / 1000.0))
+        self.session = StreamingMI(eeg_sim.n_channels, window=self.ws, hop=self.hop,
+                                   bins=64, ranges=(-6.0, 6.0), budget_ms=self.dt)
+        # Raw preview buffer for the tracked pair (last 2s)
+        self.raw = np.zeros((2, 2 * self.fs))
         # Time series for a tracked pair (Fp1-Fp2 if available)
         self.track_pair = (0, 1)
-        self.ts_t, self.ts_mi = [], []
+        # Every window's all-pairs MI is persisted; the plot reads back the last 20 s.
+        self.store = ResultStore(store_path, mode="w")
 
         # Figure & axes
         self.fig = plt.figure(figsize=(14, 9))
@@ -116,9 +56,9 @@ class RealTimeMIDashboard:
         self.btn_open     = Button(plt.axes([0.72, 0.78, 0.22, 0.1]), "Eyes Open")
         self.btn_closed   = Button(plt.axes([0.72, 0.62, 0.22, 0.1]), "Eyes Closed")
         self.btn_attention= Button(plt.axes([0.72, 0.46, 0.22, 0.1]), "Attention")
-        self.btn_open.on_clicked(lambda _: self.eeg_sim.set_state("eyes_open"))
-        self.btn_closed.on_clicked(lambda _: self.eeg_sim.set_state("eyes_closed"))
-        self.btn_attention.on_clicked(lambda _: self.eeg_sim.set_state("attention"))
+        self.btn_open.on_clicked(lambda _: self._set_state("eyes_open"))
+        self.btn_closed.on_clicked(lambda _: self._set_state("eyes_closed"))
+        self.btn_attention.on_clicked(lambda _: self._set_state("attention"))
 
         # Heatmap
         C = self.eeg_sim.n_channels
@@ -150,45 +90,49 @@ class RealTimeMIDashboard:
         # Animation
         self.ani = animation.FuncAnimation(self.fig, self._step, interval=self.dt, blit=False, cache_frame_data=False)
 
+    def _set_state(self, state: str) -> None:
+        self.eeg_sim.set_state(state)
+        print(f"[EEG] state -> {state}")
+
     def _step(self, _frame):
-        # Generate new chunk
-        hop_s = self.dt / 1000.0
-        chunk = self.eeg_sim.generate_sample(hop_s)  # (C, hop)
-        self.X = np.concatenate([self.X, chunk], axis=1)
-        # Trim history (keep last ~4*window for safety)
-        if self.X.shape[1] > 4 * self.ws:
-            self.X = self.X[:, -4 * self.ws:]
-
-        # MI matrix for current window
-        self.MI = mi_matrix_hist(self.X, window_size=self.ws, bins=64)
-        self.im.set_data(self.MI)
-        vmax = max(1e-6, float(np.percentile(self.MI, 95)))
-        self.im.set_clim(0, vmax)
-
-        # Windowed MI time series for the tracked pair (median to reduce small-window bias)
-        starts, vals = windowed_mi(self.X[self.track_pair[0]], self.X[self.track_pair[1]],
-                                   window_size=self.ws, hop_size=max(1, int(self.fs * hop_s)), bins=64)
-        if len(vals):
-            t_s = self.X.shape[1] / self.fs
-            self.ts_t.append(t_s)
-            self.ts_mi.append(float(np.median(vals[-5:])))
-            # keep last 20s
-            while self.ts_t and self.ts_t[-1] - self.ts_t[0] > 20:
-                self.ts_t.pop(0); self.ts_mi.pop(0)
-            self.line_ts.set_data(self.ts_t, self.ts_mi)
-            self.ax_ts.set_xlim(max(0, self.ts_t[-1] - 20), self.ts_t[-1] + 0.01)
+        # Generate new chunk and push it through the streaming session
+        chunk = self.eeg_sim.generate_sample(self.hop / self.fs)  # (C, hop)
+        new_mi = self.session.push(chunk)
+        self.raw = np.roll(self.raw, -chunk.shape[1], axis=1)
+        self.raw[:, -chunk.shape[1]:] = chunk[list(self.track_pair)]
+
+        if len(new_mi):
+            # MI matrix for current window
+            self.MI = np.nan_to_num(self.session.matrix(new_mi[-1]))
+            self.im.set_data(self.MI)
+            vmax = max(1e-6, float(np.percentile(self.MI, 95)))
+            self.im.set_clim(0, vmax)
+
+            # MI time series for the tracked pair
+            t_s = self.session.n_seen / self.fs
+            self.store.append(t_s, *self.session.pairs, new_mi[-1])
+            recent = self.store.read_time(t_s - 20, np.inf)
+            track = (recent["i"] == self.track_pair[0]) & (recent["j"] == self.track_pair[1])
+            self.line_ts.set_data(recent["time"][track], recent["mi"][track])
+            self.ax_ts.set_xlim(max(0, t_s - 20), t_s + 0.01)
+            self.ax_heat.set_title(
+                f"Real-time MI (current window) — push p50 {self.session.latency_p50:.1f} ms, "
+                f"p99 {self.session.latency_p99:.1f} ms"
+            )
 
         # Raw preview for last 2s
-        L = min(self.X.shape[1], 2 * self.fs)
+        L = min(self.session.n_seen, 2 * self.fs)
         tt = np.linspace(0, L / self.fs, L, endpoint=False)
-        self.line_raw1.set_data(tt, self.X[self.track_pair[0], -L:])
-        self.line_raw2.set_data(tt, self.X[self.track_pair[1], -L:])
+        self.line_raw1.set_data(tt, self.raw[0, -L:])
+        self.line_raw2.set_data(tt, self.raw[1, -L:])
 
         return self.im, self.line_ts, self.line_raw1, self.line_raw2
 
     def start(self):
         print("Starting real-time EEG MI dashboard… (close the window to exit)")
         plt.show()
+        self.store.close()
+        print(f"Saved {len(self.store)} MI records to {self.store.path}")
 
 
 # ----------------------------- Benchmark ----------------------------- #
@@ -226,16 +170,18 @@ class BenchmarkComparison:
         dt = time.perf_counter() - t0
         return dt, mi_vals
 
-    def simulate_itpu_streaming(self, data: np.ndarray, window_size: int, hop_size: int) -> Tuple[float, List[np.ndarray]]:
-        """Streaming MI matrices over windows (histogram MI)."""
+    def simulate_itpu_streaming(self, data: np.ndarray, window_size: int, hop_size: int) -> Tuple[float, List[np.ndarray], StreamingMI]:
+        """Streaming MI matrices over windows (histogram MI), pushed one hop at a time."""
         C, N = data.shape
+        session = StreamingMI(C, window=window_size, hop=hop_size, bins=64,
+                              ranges=(data.min(), data.max()))
         t0 = time.perf_counter()
         mats: List[np.ndarray] = []
-        for s in range(0, N - window_size + 1, hop_size):
-            seg = data[:, s:s + window_size]
-            mats.append(mi_matrix_hist(seg, window_size=window_size, bins=64))
+        for s in range(0, N, hop_size):
+            for row in session.push(data[:, s:s + hop_size]):
+                mats.append(session.matrix(row))
         dt = time.perf_counter() - t0
-        return dt, mats
+        return dt, mats, session
 
     def run(self, duration_s: int = 30, n_channels: int = 8, fs: int = 250) -> dict:
         sim = EEGSimulator(n_channels=n_channels, sample_rate=fs)
@@ -246,11 +192,11 @@ class BenchmarkComparison:
         print("Running batch baseline…")
         t_batch, _ = self.simulate_traditional_batch(data)
         print("Running ITPU streaming…")
-        t_stream, mats = self.simulate_itpu_streaming(data, ws, hop)
+        t_stream, mats, session = self.simulate_itpu_streaming(data, ws, hop)
 
         n_windows = len(mats)
         per_window = t_stream / max(1, n_windows)
-        capable = per_window < (hop / fs)
+        capable = session.latency_p99 < 1e3 * hop / fs
 
         out = dict(
             duration_s=duration_s, n_channels=n_channels, fs=fs,
@@ -259,6 +205,8 @@ class BenchmarkComparison:
             batch_time_s=round(t_batch, 4),
             stream_time_s=round(t_stream, 4),
             per_window_latency_s=round(per_window, 4),
+            push_latency_p50_ms=round(session.latency_p50, 3),
+            push_latency_p99_ms=round(session.latency_p99, 3),
             real_time_capable=bool(capable),
             speedup_factor=round((t_batch / t_stream) if t_stream > 0 else float("inf"), 2),
         )
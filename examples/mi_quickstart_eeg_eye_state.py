@@ -1,40 +1,22 @@
 # examples/mi_quickstart_eeg_eye_state.py
 import os, numpy as np, matplotlib.pyplot as plt
-import pandas as pd
-
-try:
-    # optional convenience: pip install ucimlrepo
-    from ucimlrepo import fetch_ucirepo
-    _HAS_UCI = True
-except Exception:
-    _HAS_UCI = False
 
+from itpu.data import load_eeg_eye_state, open_csv_cached
 from itpu.sdk import ITPU
 
-def load_eeg_eye_state():
+CSV_PATH = "data/eeg_eye_state.csv"
+
+def load_channels(path=CSV_PATH):
     """
     Returns (X, colnames). X: (n_samples, n_channels) float array of 14 EEG channels.
-    If ucimlrepo is unavailable, tries local CSV at data/eeg_eye_state.csv.
+    Reads the columnar cache of the local CSV (built on first use); without the
+    CSV, itpu.data's synthetic EEG stand-in is used.
     """
-    if _HAS_UCI:
-        ds = fetch_ucirepo(id=264)  # EEG Eye State
-        df = pd.concat([ds.data.features, ds.data.targets], axis=1)
-    else:
-        path = "data/eeg_eye_state.csv"
-        if not os.path.exists(path):
-            raise FileNotFoundError(
-                "EEG Eye State not found. Either `pip install ucimlrepo` or put CSV at data/eeg_eye_state.csv"
-            )
-        df = pd.read_csv(path)
-
-    # Expect 14 EEG channels + label; drop label if present
-    label_cols = [c for c in df.columns if str(c).lower() in {"eye", "eye_state", "label", "target"}]
-    df_feat = df.drop(columns=label_cols, errors="ignore")
-    # keep first 14 numerical columns
-    df_feat = df_feat.select_dtypes(include=[np.number]).iloc[:, :14]
-    X = df_feat.to_numpy(dtype=float)
-    colnames = [str(c) for c in df_feat.columns]
-    return X, colnames
+    X, _, used_fallback = load_eeg_eye_state(path)
+    if used_fallback:
+        print(f"{path} not found; using synthetic EEG")
+        return X, [f"ch{i}" for i in range(X.shape[1])]
+    return X, open_csv_cached(path).columns[:X.shape[1]]
 
 def mi_matrix_hist(X, bins=64):
     """
@@ -51,12 +33,13 @@ def mi_matrix_hist(X, bins=64):
 
 def main():
     os.makedirs("results/demos", exist_ok=True)
-    X, names = load_eeg_eye_state()
+    X, names = load_channels()
     M = mi_matrix_hist(X, bins=128)
 
     # Save CSV
     out_csv = "results/demos/eeg_eye_state_mi.csv"
-    pd.DataFrame(M, index=names, columns=names).to_csv(out_csv, float_format="%.6f")
+    rows = [[name] + [f"{v:.6f}" for v in row] for name, row in zip(names, M)]
+    np.savetxt(out_csv, rows, fmt="%s", delimiter=",", header=",".join([""] + list(names)), comments="")
 
     # Plot heatmap
     plt.figure(figsize=(7, 6))
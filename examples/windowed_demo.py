@@ -2,7 +2,8 @@
 """
 Windowed MI demo with a change-point:
 - Two signals are weakly correlated first, then strongly correlated.
-- We compute MI over sliding windows and plot MI vs time index.
+- We compute MI over sliding windows at three window sizes in one pass
+  and plot MI vs time index.
 
 Run:
   python examples/windowed_demo.py
@@ -11,7 +12,7 @@ import os
 import numpy as np
 import matplotlib.pyplot as plt
 
-from itpu.windowed import windowed_mi
+from itpu.utils.windowed import multiscale_windowed_mi
 
 
 def make_series(n=50_000, switch=25_000, rho1=0.2, rho2=0.8, seed=0):
@@ -28,12 +29,14 @@ def main():
     os.makedirs("results/examples", exist_ok=True)
     x, y = make_series()
 
-    mi_vals, centers = windowed_mi(
-        x, y, window_size=2000, step=200, method="hist", bins=64
-    )
+    scales = multiscale_windowed_mi(x, y, window_sizes=[1000, 2000, 8000], hop_size=200, bins=64)
 
     plt.figure(figsize=(7.0, 3.2))
-    plt.plot(centers, mi_vals, lw=1.5)
+    for window_size, (starts, vals) in scales.items():
+        plt.plot(starts + window_size // 2, vals, lw=1.5, label=f"window={window_size}")
+    starts, mi_vals = scales[2000]
+    centers = starts + 1000
+    plt.legend()
     plt.axvline(25_000, color="k", linestyle="--", linewidth=1)
     plt.xlabel("sample index (center of window)")
     plt.ylabel("MI (nats)")
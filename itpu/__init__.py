@@ -8,13 +8,28 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal
 
 from .sdk import ITPU
-from .types import EstimatorValue, SurrogateResult
-from .utils.windowed import windowed_mi
+from .types import EstimatorValue, SurrogateMatrixResult, SurrogateResult
+from .utils.changepoint import MIChangeDetector
+from .utils.streaming import StreamingMI
+from .utils.windowed import multiscale_windowed_mi, windowed_mean, windowed_mi
 
 if TYPE_CHECKING:
     import numpy as np
 
-__all__ = ["ITPU", "windowed_mi", "EstimatorValue", "SurrogateResult", "to_common_basis"]
+    from .memo import MemoCache
+
+__all__ = [
+    "ITPU",
+    "windowed_mi",
+    "multiscale_windowed_mi",
+    "windowed_mean",
+    "StreamingMI",
+    "MIChangeDetector",
+    "EstimatorValue",
+    "SurrogateResult",
+    "SurrogateMatrixResult",
+    "to_common_basis",
+]
 __version__ = "0.1.0"
 
 
@@ -23,6 +38,7 @@ def to_common_basis(
     target_estimator: Literal["hist", "ksg"],
     x: "np.ndarray",
     y: "np.ndarray",
+    memo: "MemoCache | None" = None,
     **kwargs,
 ) -> EstimatorValue:
     """Recompute MI using a different estimator on the original data.
@@ -40,6 +56,10 @@ def to_common_basis(
         Estimator to use for recomputation. One of "hist" or "ksg".
     x, y:
         Original data arrays — must match those used to compute mi_value.
+    memo:
+        Optional MemoCache (see itpu.memo). Passing the same cache to
+        repeated calls reuses results for identical data and parameters;
+        default None recomputes every time.
     **kwargs:
         Passed through to mutual_info() (e.g., bins=32, k=5).
 
@@ -57,4 +77,4 @@ def to_common_basis(
             f"Input must be an EstimatorValue from ITPU.mutual_info(), "
             f"got {type(mi_value).__name__}."
         )
-    return ITPU(device="software").mutual_info(x, y, method=target_estimator, **kwargs)
+    return ITPU(device="software", memo=memo).mutual_info(x, y, method=target_estimator, **kwargs)
@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Compute backends behind ITPU(device=...).
+
+Built-in devices: "software" (reference, every kernel), "threaded" (batched
+kernels on a thread pool), "numba" (when numba is installed) and
+"fpga-sim" (a functional and cycle model of the R2 histogram pipeline). Third-party
+backends subclass Backend and call register_backend(); tests/test_backends.py
+runs the conformance suite against every registered backend.
+"""
+from __future__ import annotations
+
+from .base import KERNELS, Backend, get_backend, list_backends, register_backend
+from .fpga_sim import FPGACounters, FPGASimBackend, FPGASimConfig
+from .numba_backend import NumbaBackend
+from .software import SoftwareBackend
+from .threaded import ThreadedBackend
+
+__all__ = [
+    "KERNELS",
+    "Backend",
+    "register_backend",
+    "get_backend",
+    "list_backends",
+    "SoftwareBackend",
+    "ThreadedBackend",
+    "NumbaBackend",
+    "FPGASimBackend",
+    "FPGASimConfig",
+    "FPGACounters",
+]
+
+register_backend(SoftwareBackend())
+register_backend(ThreadedBackend())
+register_backend(NumbaBackend())
+register_backend(FPGASimBackend())
@@ -0,0 +1,112 @@
+# itpu/backends/base.py
+"""
+Backend interface and registry.
+
+A backend is an object that implements some of the kernels in KERNELS as
+methods of the same name and declares what it accepts (input dtypes, batch
+limits) and a routing priority. ITPU resolves every call to the first
+backend that can run it, so a backend only needs to implement the kernels
+it actually accelerates; everything else falls back per kernel.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+# Kernel name -> signature. All MI values are in nats.
+KERNELS = {
+    "hist_mi": "(x, y, bins) -> float",
+    "hist_local_mi": "(x, y, bins) -> ndarray (N,)",
+    "hist_mi_batch": "(X, Y, bins) -> ndarray (B,) for X, Y shaped (B, N)",
+    "ksg_mi": "(x, y, k) -> float (unclipped)",
+    "ksg_local_mi": "(x, y, k) -> ndarray (N,)",
+    "ksg_mi_batch": "(X, Y, k) -> ndarray (B,) for X, Y shaped (B, N)",
+}
+
+_REGISTRY: dict = {}
+
+
+class Backend:
+    """
+    Base class for compute backends.
+
+    Subclasses set the class attributes below and implement a subset of the
+    KERNELS as methods.
+
+    Attributes
+    ----------
+    name:
+        Device string accepted by ITPU(device=...).
+    priority:
+        Routing rank; with device="auto" each kernel goes to the capable
+        backend with the highest priority.
+    kernels:
+        Names of the implemented kernels.
+    dtypes:
+        Accepted input dtype names, or None for any real dtype. Inputs of
+        other dtypes are routed to the next capable backend.
+    max_batch:
+        Largest batch a *_batch kernel accepts per launch (None = unlimited);
+        ITPU splits larger batches.
+    tolerance:
+        Documented absolute deviation (nats) from the software backend on
+        top of floating-point rounding; 0 for exact backends.
+    workspace:
+        Whether the scalar kernels accept work= (an itpu.workspace.Workspace
+        of reusable scratch buffers, see ITPU.workspace()).
+    """
+
+    name = "base"
+    priority = 0
+    kernels: tuple = ()
+    dtypes: tuple | None = None
+    max_batch: int | None = None
+    tolerance: float = 0.0
+    workspace: bool = False
+
+    def available(self) -> bool:
+        """Whether the backend can run here (e.g. its dependencies import)."""
+        return True
+
+    def supports(self, kernel: str, dtype=None) -> bool:
+        if kernel not in self.kernels:
+            return False
+        return dtype is None or self.dtypes is None or np.dtype(dtype).name in self.dtypes
+
+    def capabilities(self) -> dict:
+        return {
+            "available": self.available(),
+            "priority": self.priority,
+            "kernels": list(self.kernels),
+            "dtypes": None if self.dtypes is None else list(self.dtypes),
+            "max_batch": self.max_batch,
+            "tolerance": self.tolerance,
+        }
+
+
+def register_backend(backend: Backend, replace: bool = False) -> Backend:
+    """Add a backend instance to the registry under backend.name."""
+    unknown = set(backend.kernels) - set(KERNELS)
+    if unknown:
+        raise ValueError(f"Backend {backend.name!r} declares unknown kernels: {sorted(unknown)}")
+    missing = [k for k in backend.kernels if not callable(getattr(backend, k, None))]
+    if missing:
+        raise ValueError(f"Backend {backend.name!r} does not implement {missing}")
+    if backend.name in _REGISTRY and not replace:
+        raise ValueError(f"Backend {backend.name!r} is already registered")
+    _REGISTRY[backend.name] = backend
+    return backend
+
+
+def get_backend(name: str) -> Backend:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise NotImplementedError(
+            f"Unknown device {name!r}; registered devices: {sorted(_REGISTRY)} (or 'auto')"
+        ) from None
+
+
+def list_backends(available_only: bool = True) -> list:
+    """Registered backends, highest priority first."""
+    out = [b for b in _REGISTRY.values() if b.available() or not available_only]
+    return sorted(out, key=lambda b: -b.priority)
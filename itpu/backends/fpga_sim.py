@@ -0,0 +1,220 @@
+# itpu/backends/fpga_sim.py
+"""
+Functional and cycle-level model of the R2 histogram pipeline (device="fpga-sim").
+
+Follows hardware/fpga_notes.md: samples arrive over DMA, a binning unit
+turns them into joint-cell codes, HIST_BUILD increments narrow counters in
+SRAM tiles of tile x tile cells, HIST_REDUCE folds the partial tiles into
+wide accumulators, and REDUCE_MI evaluates MI in fixed point from a log
+unit with log_frac_bits fractional bits.
+
+Functional behaviour: counts are exact (the stream is cut into segments of
+at most 2**counter_bits - 1 samples, so no narrow counter can overflow), and
+the only numerical difference from the software backend is the fixed-point
+log, which bounds the error to |MI_sim - MI_sw| <= 2**(1 - log_frac_bits)
+nats (~1.2e-7 at the default 24 bits).
+
+Timing is a simple throughput model: per pass over the data, DMA and
+HIST_BUILD overlap (the slower one sets the pass time, the gap is counted as
+a DMA stall), HIST_BUILD retires `lanes` samples per cycle plus one bubble
+per read-after-write hazard (a cell updated again within pipeline_depth
+samples), and grids with more tiles than fit in SRAM take several passes.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from itpu.kernels_sw.hist import hist_codes
+
+from .base import Backend
+
+STAGES = ("dma", "hist_build", "hist_reduce", "reduce_mi")
+
+
+@dataclass
+class FPGASimConfig:
+    """Card parameters of the simulated pipeline."""
+
+    clock_mhz: float = 250.0
+    dma_gbps: float = 12.0  # host -> card bandwidth, GB/s
+    sample_bytes: int = 4  # bytes per sample on the wire (float32)
+    tile: int = 128  # SRAM tile is tile x tile cells
+    sram_tiles: int = 1  # tiles resident on chip at once
+    counter_bits: int = 16  # HIST_BUILD counter width
+    lanes: int = 4  # samples retired per cycle by HIST_BUILD
+    pipeline_depth: int = 4  # read-modify-write distance for hazards
+    reduce_lanes: int = 16  # accumulator cells folded per cycle
+    mi_lanes: int = 4  # cells per cycle through the log unit
+    mi_latency: int = 32  # fixed REDUCE_MI pipeline latency, cycles
+    log_frac_bits: int = 24  # fractional bits of the fixed-point log
+
+    def __post_init__(self) -> None:
+        for f in fields(self):
+            if getattr(self, f.name) <= 0:
+                raise ValueError(f"{f.name} must be positive")
+
+    @property
+    def tolerance(self) -> float:
+        """Worst-case |MI_sim - MI_sw| in nats due to the fixed-point log."""
+        return 2.0 ** (1 - self.log_frac_bits)
+
+
+@dataclass
+class FPGACounters:
+    """Simulated performance counters, accumulated over calls."""
+
+    clock_hz: float
+    n_calls: int = 0
+    n_pairs: int = 0
+    n_samples: int = 0
+    bytes_in: int = 0
+    passes: int = 0
+    segments: int = 0
+    cycles: dict = field(default_factory=lambda: dict.fromkeys(STAGES, 0))
+    stalls: dict = field(default_factory=lambda: {"dma": 0, "hazard": 0})
+    total_cycles: int = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.total_cycles / self.clock_hz
+
+    @property
+    def samples_per_s(self) -> float:
+        """Sample pairs processed per simulated second."""
+        return self.n_samples / self.seconds if self.total_cycles else float("nan")
+
+    @property
+    def gbps(self) -> float:
+        """Achieved input bandwidth in GB/s."""
+        return self.bytes_in / self.seconds / 1e9 if self.total_cycles else float("nan")
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of cycles in which HIST_BUILD retired samples."""
+        return self.cycles["hist_build"] / self.total_cycles if self.total_cycles else float("nan")
+
+
+class FPGASimBackend(Backend):
+    """
+    Simulated FPGA backend for histogram MI; KSG falls back to software.
+
+    Parameters
+    ----------
+    config:
+        FPGASimConfig; defaults describe the R2 pathfinder card.
+
+    Attributes
+    ----------
+    counters:
+        FPGACounters accumulated since construction or reset().
+    last:
+        FPGACounters of the most recent call.
+    """
+
+    name = "fpga-sim"
+    priority = 0  # a model, never faster: only used when asked for by name
+    kernels = ("hist_mi", "hist_mi_batch")
+    dtypes = ("float32", "float64", "int16")
+    max_batch = 64  # command-queue depth
+
+    def __init__(self, config: FPGASimConfig | None = None) -> None:
+        self.config = config or FPGASimConfig()
+        self.tolerance = self.config.tolerance
+        self.reset()
+
+    def reset(self) -> None:
+        hz = self.config.clock_mhz * 1e6
+        self.counters = FPGACounters(hz)
+        self.last = FPGACounters(hz)
+
+    def hist_mi(self, x, y, bins):
+        return float(self.hist_mi_batch(np.asarray(x)[None], np.asarray(y)[None], bins)[0])
+
+    def hist_mi_batch(self, X, Y, bins):
+        bins = int(bins)
+        cells = hist_codes(X, bins) * bins + hist_codes(Y, bins)  # binning unit
+        call = FPGACounters(self.config.clock_mhz * 1e6, n_calls=1)
+        out = np.array([self._run_pair(row, bins, call) for row in cells], dtype=np.float64)
+        self.last = call
+        self._accumulate(call)
+        return out
+
+    # ------------------------------------------------------------------ #
+    def _run_pair(self, cells, bins, ctr) -> float:
+        cfg = self.config
+        n = len(cells)
+        n_cells = bins * bins
+        seg_len = 2 ** cfg.counter_bits - 1
+
+        # HIST_BUILD -> HIST_REDUCE: narrow partial tiles per segment, folded
+        # into wide accumulators.
+        acc = np.zeros(n_cells, dtype=np.int64)
+        n_seg = 0
+        for s in range(0, n, seg_len):
+            # A segment never exceeds the counter range, so partial tiles
+            # need no saturation handling.
+            acc += np.bincount(cells[s:s + seg_len], minlength=n_cells)
+            n_seg += 1
+        mi = self._reduce_mi(acc.reshape(bins, bins), n)
+
+        per_side = math.ceil(bins / cfg.tile)
+        passes = math.ceil(per_side * per_side / cfg.sram_tiles)
+        bytes_in = n * 2 * cfg.sample_bytes
+        bytes_per_cycle = cfg.dma_gbps * 1e9 / (cfg.clock_mhz * 1e6)
+        dma = math.ceil(bytes_in / bytes_per_cycle)
+        build = math.ceil(n / cfg.lanes)
+        hazards = self._hazards(cells)
+        # DMA overlaps HIST_BUILD; each sample lands in one tile, so hazard
+        # bubbles are paid once across all passes.
+        compute = passes * build + hazards
+        dma_stall = max(0, passes * dma - compute)
+        reduce = math.ceil(n_seg * n_cells / cfg.reduce_lanes)
+        reduce_mi = math.ceil((n_cells + 2 * bins) / cfg.mi_lanes) + cfg.mi_latency
+
+        ctr.n_pairs += 1
+        ctr.n_samples += n
+        ctr.bytes_in += passes * bytes_in
+        ctr.passes += passes
+        ctr.segments += n_seg
+        ctr.cycles["dma"] += passes * dma
+        ctr.cycles["hist_build"] += passes * build
+        ctr.cycles["hist_reduce"] += reduce
+        ctr.cycles["reduce_mi"] += reduce_mi
+        ctr.stalls["hazard"] += hazards
+        ctr.stalls["dma"] += dma_stall
+        ctr.total_cycles += compute + dma_stall + reduce + reduce_mi
+        return mi
+
+    def _hazards(self, cells) -> int:
+        # Updates to a cell still in flight from the previous depth-1 samples.
+        hit = np.zeros(len(cells), dtype=bool)
+        for d in range(1, self.config.pipeline_depth):
+            hit[d:] |= cells[d:] == cells[:-d]
+        return int(hit.sum())
+
+    def _reduce_mi(self, joint, n) -> float:
+        # MI = (N log N - Sx - Sy + Sxy) / N with S = sum c * log c, every
+        # log rounded to log_frac_bits and accumulated in int64.
+        if n == 0:
+            return 0.0
+        scale = 2.0 ** self.config.log_frac_bits
+
+        def s(counts):
+            counts = counts[counts > 0].astype(np.int64)
+            return int((counts * np.rint(np.log(counts) * scale).astype(np.int64)).sum())
+
+        total = s(np.array([n]))
+        fixed = total - s(joint.sum(axis=1)) - s(joint.sum(axis=0)) + s(joint.ravel())
+        return fixed / (n * scale)
+
+    def _accumulate(self, call: FPGACounters) -> None:
+        c = self.counters
+        for name in ("n_calls", "n_pairs", "n_samples", "bytes_in", "passes", "segments", "total_cycles"):
+            setattr(c, name, getattr(c, name) + getattr(call, name))
+        for stage in STAGES:
+            c.cycles[stage] += call.cycles[stage]
+        for reason in c.stalls:
+            c.stalls[reason] += call.stalls[reason]
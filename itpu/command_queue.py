@@ -0,0 +1,158 @@
+# itpu/command_queue.py
+"""
+Device-style command queue behind ITPU.submit().
+
+Callers enqueue commands and get a concurrent.futures.Future back. A single
+dispatcher thread groups pending commands by descriptor — everything a
+batched kernel launch needs to agree on (method, estimator parameter,
+length, dtype) — and launches a group once it reaches max_batch or its
+oldest command has waited max_latency_ms. This is the submission model an
+accelerator's DMA ring will need; on the CPU backends it turns thousands of
+small calls into a few vectorised batch launches.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class CommandQueue:
+    """
+    Coalescing queue of MI commands.
+
+    Parameters
+    ----------
+    launch:
+        Callable launch(descriptor, xs, ys) -> sequence of results, one per
+        command, run on the dispatcher thread.
+    max_batch:
+        Largest number of commands merged into one launch.
+    max_latency_ms:
+        Longest time a command waits for others to join its batch.
+
+    Attributes
+    ----------
+    n_submitted, n_launches:
+        Commands accepted and kernel launches issued so far.
+    batch_sizes:
+        Size of every launch, in order.
+    """
+
+    def __init__(self, launch, max_batch: int = 256, max_latency_ms: float = 2.0) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_latency_ms < 0:
+            raise ValueError("max_latency_ms must be non-negative")
+        self.launch = launch
+        self.max_batch = int(max_batch)
+        self.max_latency_s = max_latency_ms / 1e3
+        self.n_submitted = 0
+        self.n_launches = 0
+        self.batch_sizes: list[int] = []
+        self._pending: dict = {}  # descriptor -> [(x, y, future), ...]
+        self._oldest: dict = {}  # descriptor -> enqueue time of its first command
+        self._in_flight = 0
+        self._flushing = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, descriptor, x, y) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CommandQueue is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name="itpu-queue", daemon=True)
+                self._thread.start()
+            group = self._pending.setdefault(descriptor, [])
+            if not group:
+                self._oldest[descriptor] = time.perf_counter()
+            group.append((x, y, future))
+            self.n_submitted += 1
+            if len(group) == 1 or len(group) >= self.max_batch:
+                self._cond.notify_all()
+        return future
+
+    def flush(self) -> None:
+        """Launch everything pending now and wait until it has completed."""
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: not self._pending and not self._in_flight)
+            finally:
+                self._flushing -= 1
+
+    def close(self) -> None:
+        """Flush, then stop the dispatcher; later submit() calls raise."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def mean_batch(self) -> float:
+        return float(np.mean(self.batch_sizes)) if self.batch_sizes else float("nan")
+
+    # ------------------------------------------------------------------ #
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                batches = self._wait_for_ready()
+                if batches is None:
+                    return
+                self._in_flight += len(batches)
+            for descriptor, group in batches:
+                self._run(descriptor, group)
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def _wait_for_ready(self):
+        while True:
+            if not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+                continue
+            now = time.perf_counter()
+            ready = [
+                d for d, group in self._pending.items()
+                if self._flushing or self._closed or len(group) >= self.max_batch
+                or now - self._oldest[d] >= self.max_latency_s
+            ]
+            if ready:
+                batches = []
+                for d in ready:
+                    group = self._pending[d]
+                    batches.append((d, group[:self.max_batch]))
+                    if len(group) > self.max_batch:
+                        self._pending[d] = group[self.max_batch:]
+                        self._oldest[d] = now
+                    else:
+                        del self._pending[d], self._oldest[d]
+                return batches
+            due = min(self._oldest.values()) + self.max_latency_s
+            self._cond.wait(timeout=max(due - now, 0.0))
+
+    def _run(self, descriptor, group) -> None:
+        xs, ys, futures = zip(*group)
+        live = [f.set_running_or_notify_cancel() for f in futures]
+        self.n_launches += 1
+        self.batch_sizes.append(len(group))
+        try:
+            results = self.launch(descriptor, xs, ys)
+        except Exception as exc:  # deliver to every caller of the batch
+            for future, ok in zip(futures, live):
+                if ok:
+                    future.set_exception(exc)
+            return
+        for future, ok, result in zip(futures, live, results):
+            if ok:
+                future.set_result(result)
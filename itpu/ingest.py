@@ -0,0 +1,90 @@
+# itpu/ingest.py
+"""
+Zero-copy input handling and copy accounting.
+
+as_1d() turns estimator inputs into 1-D NumPy views without copying when
+possible: ndarrays and np.memmap (including strided views such as X[:, i]
+columns), objects exporting __dlpack__, and anything supporting the buffer
+protocol (memoryview, array.array, bytearray). The dtype is preserved;
+kernels read float32/int16 data through ufunc casting buffers instead of
+upcasting whole arrays.
+
+Every copy the SDK does make on input data — flattening a non-contiguous
+multi-dimensional input, converting a Python sequence, packing samples for
+cKDTree — is recorded by record_copy(); copy_stats() reports the totals.
+"""
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+_lock = threading.Lock()
+_stats = {"n_copies": 0, "bytes_copied": 0, "by_reason": {}}
+
+
+def record_copy(reason: str, nbytes: int) -> None:
+    """Account for a copy of input data (reason is a short label)."""
+    with _lock:
+        _stats["n_copies"] += 1
+        _stats["bytes_copied"] += int(nbytes)
+        _stats["by_reason"][reason] = _stats["by_reason"].get(reason, 0) + int(nbytes)
+
+
+def copy_stats() -> dict:
+    """Copies recorded since import or the last reset_copy_stats()."""
+    with _lock:
+        return {
+            "n_copies": _stats["n_copies"],
+            "bytes_copied": _stats["bytes_copied"],
+            "by_reason": dict(_stats["by_reason"]),
+        }
+
+
+def reset_copy_stats() -> None:
+    with _lock:
+        _stats["n_copies"] = 0
+        _stats["bytes_copied"] = 0
+        _stats["by_reason"] = {}
+
+
+def as_array(x) -> np.ndarray:
+    """NumPy view of an ndarray, memmap, DLPack or buffer-protocol object."""
+    if isinstance(x, np.ndarray):
+        return x
+    if hasattr(x, "__dlpack__"):
+        return np.from_dlpack(x)
+    try:
+        view = memoryview(x)
+    except TypeError:
+        a = np.asarray(x)
+        record_copy("convert", a.nbytes)
+        return a
+    return np.asarray(view)
+
+
+def as_1d(x) -> np.ndarray:
+    """
+    1-D view of x in its own dtype.
+
+    Inputs with a single non-trivial axis (e.g. (N, 1) or strided columns)
+    are squeezed into views; other multi-dimensional inputs are flattened,
+    which copies (and is recorded) only when they are not contiguous.
+    """
+    a = as_array(x)
+    if a.ndim == 1:
+        return a
+    if sum(s != 1 for s in a.shape) <= 1:
+        return a.reshape(-1) if a.size <= 1 else np.squeeze(a)
+    if not a.flags.c_contiguous:
+        record_copy("ravel", a.nbytes)
+    return a.ravel()
+
+
+def as_float(a: np.ndarray) -> np.ndarray:
+    """a itself if it is a real numeric array, else a float64 copy (recorded)."""
+    if a.dtype.kind in "fiu":
+        return a
+    out = a.astype(np.float64)
+    record_copy("cast", out.nbytes)
+    return out
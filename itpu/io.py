@@ -0,0 +1,226 @@
+# itpu/io.py
+"""
+Append-only, memory-mapped storage for long-running MI results.
+
+ResultStore keeps one fixed-schema record per (window, pair): time, channel
+pair, MI, p-value and estimator tag. Each column is a raw little-endian file
+that is preallocated and grown geometrically, and mapped with np.memmap, so
+appending writes only the new records and a range read touches only the
+requested rows. meta.json records how many rows are committed; it is
+rewritten (atomically) on every flush, and a reopened store resumes after
+the last committed row.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import numpy as np
+
+SCHEMA = (
+    ("time", "<f8"),
+    ("i", "<i4"),
+    ("j", "<i4"),
+    ("mi", "<f8"),
+    ("p_value", "<f8"),
+    ("estimator", "u1"),
+)
+STORE_VERSION = 1
+
+
+class ResultStore:
+    """
+    Growable columnar store of MI results.
+
+    Parameters
+    ----------
+    path:
+        Directory holding the column files and meta.json.
+    mode:
+        "a" opens an existing store to append (creating it if needed),
+        "w" starts an empty store, "r" opens read-only.
+    capacity:
+        Rows preallocated when the store is created; capacity doubles
+        whenever an append would exceed it.
+    flush_every:
+        Flush once this many rows are pending.
+    flush_interval_s:
+        Flush on the first append this many seconds after the last flush.
+        None disables the time-based flush.
+
+    Attributes
+    ----------
+    estimators:
+        Estimator tags seen so far; the estimator column stores indices
+        into this list.
+
+    Records must be appended in non-decreasing time order, so read_time()
+    can binary-search the time column. Rows appended after the last flush
+    are lost if the process dies; call flush() or close() at checkpoints.
+    """
+
+    def __init__(self, path: str, mode: str = "a", capacity: int = 65_536,
+                 flush_every: int = 4096, flush_interval_s: float | None = 5.0) -> None:
+        if mode not in ("a", "w", "r"):
+            raise ValueError(f"mode must be 'a', 'w' or 'r', got {mode!r}")
+        if capacity < 1 or flush_every < 1:
+            raise ValueError("capacity and flush_every must be at least 1")
+        self.path = path
+        self.mode = mode
+        self.flush_every = int(flush_every)
+        self.flush_interval_s = flush_interval_s
+        meta_path = os.path.join(path, "meta.json")
+
+        if mode == "w" or (mode == "a" and not os.path.exists(meta_path)):
+            os.makedirs(path, exist_ok=True)
+            self._n = 0
+            self._capacity = int(capacity)
+            self.estimators: list[str] = []
+            for name, dtype in SCHEMA:
+                with open(self._file(name), "wb") as f:
+                    f.truncate(self._capacity * np.dtype(dtype).itemsize)
+            self._write_meta()
+        else:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get("version") != STORE_VERSION:
+                raise ValueError(f"{path}: unsupported ResultStore version {meta.get('version')!r}")
+            self._n = int(meta["n_records"])
+            self.estimators = list(meta["estimators"])
+            self._capacity = min(os.path.getsize(self._file(name)) // np.dtype(dtype).itemsize
+                                 for name, dtype in SCHEMA)
+        self._columns = self._map()
+        self._n_flushed = self._n
+        self._last_flush = time.monotonic()
+
+    # ------------------------------------------------------------------ #
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _map(self) -> dict:
+        access = "r" if self.mode == "r" else "r+"
+        return {name: np.memmap(self._file(name), dtype=dtype, mode=access, shape=(self._capacity,))
+                for name, dtype in SCHEMA}
+
+    def _write_meta(self) -> None:
+        meta = {
+            "version": STORE_VERSION,
+            "n_records": self._n,
+            "estimators": self.estimators,
+            "schema": [list(c) for c in SCHEMA],
+        }
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for col in self._columns.values():
+            col.flush()
+        self._columns = {}
+        for name, dtype in SCHEMA:
+            with open(self._file(name), "r+b") as f:
+                f.truncate(capacity * np.dtype(dtype).itemsize)
+        self._capacity = capacity
+        self._columns = self._map()
+
+    def _codes(self, estimator) -> np.ndarray:
+        tags = np.atleast_1d(np.asarray(estimator, dtype=str))
+        codes = np.empty(tags.shape, dtype=np.uint8)
+        for tag in np.unique(tags):
+            if tag not in self.estimators:
+                if len(self.estimators) == 255:
+                    raise ValueError("ResultStore supports at most 255 estimator tags")
+                self.estimators.append(str(tag))
+            codes[tags == tag] = self.estimators.index(tag)
+        return codes
+
+    # ------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, t, i, j, mi, p_value=np.nan, estimator=None) -> None:
+        """
+        Append records; array arguments broadcast against each other.
+
+        One window of StreamingMI output is append(t, *session.pairs, row).
+        estimator defaults to the tag of an EstimatorValue mi, else "hist".
+        """
+        if self.mode == "r":
+            raise RuntimeError("ResultStore opened read-only")
+        if estimator is None:
+            estimator = getattr(mi, "estimator", "hist")
+        t, i, j, mi, p_value, estimator = np.broadcast_arrays(
+            np.asarray(t, dtype=np.float64), i, j, np.asarray(mi, dtype=np.float64), p_value,
+            np.asarray(estimator, dtype=str))
+        m = t.size
+        if m == 0:
+            return
+        t = t.ravel()
+        last = self._columns["time"][self._n - 1] if self._n else -np.inf
+        if t[0] < last or np.any(np.diff(t) < 0):
+            raise ValueError("Records must be appended in non-decreasing time order")
+        if self._n + m > self._capacity:
+            self._grow(self._n + m)
+        rows = slice(self._n, self._n + m)
+        cols = self._columns
+        cols["time"][rows] = t
+        cols["i"][rows] = i.ravel()
+        cols["j"][rows] = j.ravel()
+        cols["mi"][rows] = mi.ravel()
+        cols["p_value"][rows] = p_value.ravel()
+        cols["estimator"][rows] = self._codes(estimator.ravel())
+        self._n += m
+        pending = self._n - self._n_flushed
+        if pending >= self.flush_every or (
+            self.flush_interval_s is not None and time.monotonic() - self._last_flush >= self.flush_interval_s
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows to disk and commit them to meta.json."""
+        if self.mode == "r":
+            return
+        for col in self._columns.values():
+            col.flush()
+        self._write_meta()
+        self._n_flushed = self._n
+        self._last_flush = time.monotonic()
+
+    def read(self, start: int | None = None, stop: int | None = None, columns=None) -> dict:
+        """
+        Rows [start, stop) as a dict of column arrays (copies).
+
+        The estimator column is decoded to tag strings. Only the requested
+        rows of the requested column files are read.
+        """
+        rows = slice(*slice(start, stop).indices(self._n)[:2])
+        names = [name for name, _ in SCHEMA] if columns is None else list(columns)
+        out = {}
+        for name in names:
+            if name not in self._columns:
+                raise KeyError(f"Unknown column {name!r}")
+            values = np.array(self._columns[name][rows])
+            if name == "estimator":
+                values = np.array(self.estimators, dtype=str)[values] if len(values) else values.astype(str)
+            out[name] = values
+        return out
+
+    def read_time(self, t0: float, t1: float, columns=None) -> dict:
+        """Rows with t0 <= time < t1 (binary search on the time column)."""
+        t = self._columns["time"][:self._n]
+        return self.read(int(np.searchsorted(t, t0, "left")), int(np.searchsorted(t, t1, "left")), columns)
+
+    def close(self) -> None:
+        self.flush()
+        self._columns = {}
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -6,6 +6,529 @@ Histogram-based entropy and mutual information estimators.
 from __future__ import annotations
 import numpy as np
 
+from itpu.ingest import as_array, as_float
+
+
+# Samples binned per pass; bounds the float64/bool temporaries of hist_codes
+# (512 KiB of float64) whatever the input length.
+_CHUNK = 1 << 16
+
+
+def _scratch(work, name, shape, dtype):
+    """Buffer from a Workspace (see itpu.workspace), or a fresh array."""
+    if work is None:
+        return np.empty(shape, dtype=dtype)
+    return work.get(name, shape, dtype)
+
+
+def hist_codes(x, bins: int, range=None, out=None, work=None) -> np.ndarray:
+    """
+    Histogram bin index of every sample, identical to np.histogram(x, bins).
+
+    Works along the last axis: each row is binned over its own [min, max]
+    range, so a (C, N) array yields the codes of C independent histograms.
+
+    Parameters:
+        x: array (..., N)
+        bins: number of equal-width bins
+        range: optional fixed (lo, hi) edges shared by every row (lo and hi
+            may also be arrays broadcasting against x[..., :1]). Samples
+            outside [lo, hi] are clipped into the first/last bin rather
+            than dropped, so fixed-edge histograms always count N samples.
+        out: optional intp array of x's shape to receive the codes
+        work: optional Workspace supplying the float/bool temporaries
+            (at most _CHUNK samples, or one sample per row if there are
+            more rows than that)
+
+    Returns:
+        codes: intp array of the same shape as x, values in [0, bins)
+
+    Raises:
+        ValueError: if the range (autodetected or supplied) is not finite,
+            e.g. because x contains NaN or inf, as np.histogram does.
+
+    Any real dtype and strided views are read in place; arithmetic is done
+    in float64 through ufunc buffers, so codes match binning x.astype(float64).
+    Samples are binned in column chunks, so the float64/bool scratch stays
+    bounded instead of growing with N.
+    1-D 8/16-bit integer input whose value span is shorter than the signal
+    is binned through a lookup table instead (same codes, no float pass).
+    """
+    x = as_float(as_array(x))  # float32/int16 stay as they are
+    codes = out if out is not None else np.empty(x.shape, dtype=np.intp)
+    if x.shape[-1] == 0:
+        codes.fill(0)
+        return codes
+    if x.ndim == 1 and x.dtype.kind in "iu" and x.dtype.itemsize <= 2:
+        xmin, xmax = int(x.min()), int(x.max())
+        if xmax - xmin < len(x):
+            return _lut_codes(x, bins, range, xmin, xmax, codes, work)
+    if range is None:
+        lo = x.min(axis=-1, keepdims=True).astype(np.float64)
+        hi = x.max(axis=-1, keepdims=True).astype(np.float64)
+        kind = "autodetected"
+    else:
+        lo = np.broadcast_to(np.asarray(range[0], dtype=np.float64), x.shape[:-1] + (1,))
+        hi = np.broadcast_to(np.asarray(range[1], dtype=np.float64), x.shape[:-1] + (1,))
+        kind = "supplied"
+    finite = np.isfinite(lo) & np.isfinite(hi)
+    if not finite.all():
+        # Same error as np.histogram (NaN/inf samples make the range non-finite).
+        bad = np.flatnonzero(~finite)[0]
+        raise ValueError(f"{kind} range of [{lo.flat[bad]}, {hi.flat[bad]}] is not finite")
+    flat = lo == hi
+    if flat.any():
+        lo = np.where(flat, lo - 0.5, lo)
+        hi = np.where(flat, hi + 0.5, hi)
+    edges = np.linspace(lo[..., 0], hi[..., 0], bins + 1, axis=-1)
+    width = hi - lo
+    lead = x.shape[:-1]
+    n, rows = x.shape[-1], int(np.prod(lead))
+    step = min(n, max(1, _CHUNK // max(rows, 1)))
+    bufs = [_scratch(work, name, (rows * step,), dtype)
+            for name, dtype in (("codes_f", np.float64), ("codes_m", np.bool_), ("codes_m2", np.bool_))]
+    for start in np.arange(0, n, step):
+        stop = min(start + step, n)
+        t, m, m2 = (b[:rows * (stop - start)].reshape(lead + (stop - start,)) for b in bufs)
+        _bin_chunk(x[..., start:stop], lo, width, edges, bins, codes[..., start:stop], t, m, m2)
+    return codes
+
+
+def _bin_chunk(x, lo, width, edges, bins, codes, t, m, m2):
+    np.subtract(x, lo, out=t)
+    np.divide(t, width, out=t)
+    np.multiply(t, bins, out=t)
+    np.copyto(codes, t, casting="unsafe")  # truncates like astype(intp)
+    np.clip(codes, 0, bins - 1, out=codes)
+    # Same ~1 ULP edge corrections as np.histogram.
+    _take_edges(edges, codes, t)
+    np.less(x, t, out=m)
+    m &= np.not_equal(codes, 0, out=m2)
+    np.subtract(codes, m, out=codes)
+    _take_edges(edges[..., 1:], codes, t)
+    np.greater_equal(x, t, out=m)
+    m &= np.not_equal(codes, bins - 1, out=m2)
+    np.add(codes, m, out=codes)
+
+
+def _lut_codes(x, bins, range, xmin, xmax, codes, work):
+    # Bin every distinct value once, then index the table with the raw
+    # integers reinterpreted as unsigned offsets from xmin (wrapping
+    # subtraction in the input width, so no widening copy is made).
+    values = np.arange(xmin, xmax + 1, dtype=np.float64)
+    lut = hist_codes(values, bins, range=(xmin, xmax) if range is None else range)
+    u = np.dtype(f"u{x.dtype.itemsize}")
+    base = u.type(xmin % (1 << (8 * u.itemsize)))
+    buf = _scratch(work, "codes_u", (min(len(x), _CHUNK),), u)
+    xu = x.view(u)
+    for start in np.arange(0, len(x), _CHUNK):
+        stop = min(start + _CHUNK, len(x))
+        offset = np.subtract(xu[start:stop], base, out=buf[:stop - start])
+        np.take(lut, offset, out=codes[start:stop], mode="clip")
+    return codes
+
+
+def _take_edges(edges, codes, out):
+    if edges.ndim == 1:
+        np.take(edges, codes, out=out, mode="clip")  # codes are in range; "raise" would buffer
+    else:
+        out[...] = np.take_along_axis(edges, codes, axis=-1)
+
+
+def entropy_from_counts(counts, axis=-1, work=None, name="h") -> np.ndarray:
+    """
+    Plug-in entropy (nats) of count histograms along `axis`.
+
+    Parameters:
+        counts: array of non-negative counts
+        axis: axis (or tuple of axes) holding the histogram cells
+        work: optional Workspace supplying the probability/log temporaries
+        name: workspace key prefix (distinct per table shape in one call)
+
+    Returns:
+        entropy: array with `axis` reduced
+    """
+    counts = np.asarray(counts)
+    p = _scratch(work, name + "_p", counts.shape, np.float64)
+    np.copyto(p, counts)
+    total = p.sum(axis=axis, keepdims=True)
+    np.divide(p, total, out=p, where=total > 0)
+    positive = np.greater(p, 0, out=_scratch(work, name + "_m", counts.shape, np.bool_))
+    plogp = _scratch(work, name + "_plogp", counts.shape, np.float64)
+    plogp.fill(0.0)
+    np.log(p, out=plogp, where=positive)
+    np.multiply(p, plogp, out=plogp)
+    return -plogp.sum(axis=axis)
+
+
+def mi_from_codes(cx, cy, bins: int, work=None) -> np.ndarray:
+    """
+    Plug-in MI (nats) from paired bin codes, batched over leading axes.
+
+    All joint histograms are built with a single bincount, so evaluating
+    many (x, y) pairs of the same length costs one pass over the codes.
+
+    Parameters:
+        cx, cy: intp arrays (..., N) of codes in [0, bins)
+        bins: number of bins used to produce the codes
+        work: optional Workspace supplying the cell-index and entropy
+            temporaries (the bincount table itself is always fresh)
+
+    Returns:
+        mi: array of shape cx.shape[:-1] (0-d for 1D inputs)
+    """
+    cx, cy = np.broadcast_arrays(np.asarray(cx), np.asarray(cy))
+    lead = cx.shape[:-1]
+    n_rows = int(np.prod(lead, dtype=np.int64))
+    cells = bins * bins
+    flat = _scratch(work, "cells", (n_rows, cx.shape[-1]), np.intp)
+    np.multiply(cx.reshape(n_rows, -1), bins, out=flat)
+    flat += cy.reshape(n_rows, -1)
+    if n_rows > 1:
+        flat += (np.arange(n_rows, dtype=np.intp) * cells)[:, None]
+    joint = np.bincount(flat.ravel(), minlength=n_rows * cells).reshape(n_rows, bins, bins)
+    return mi_from_joint(joint, work=work).reshape(lead)
+
+
+def local_mi_from_codes(cx, cy, bins: int) -> np.ndarray:
+    """
+    Per-sample (local) plug-in MI log(p(x,y) / (p(x) p(y))) from bin codes.
+
+    Its mean equals mi_from_codes() on the same codes.
+
+    Parameters:
+        cx, cy: 1-D integer bin codes in [0, bins)
+        bins: number of bins per variable
+
+    Returns:
+        local_mi: array of len(cx), nats
+    """
+    cx = np.asarray(cx, dtype=np.intp)
+    cy = np.asarray(cy, dtype=np.intp)
+    n = len(cx)
+    joint = np.bincount(cx * bins + cy, minlength=bins * bins)
+    nx = np.bincount(cx, minlength=bins)
+    ny = np.bincount(cy, minlength=bins)
+    return np.log(joint[cx * bins + cy] * float(n)) - np.log(nx[cx] * ny[cy].astype(np.float64))
+
+
+def mi_from_joint(joint, work=None) -> np.ndarray:
+    """
+    Plug-in MI (nats) of joint count tables, batched over leading axes.
+
+    Parameters:
+        joint: array (..., bx, by) of non-negative counts
+        work: optional Workspace supplying the marginal and entropy buffers
+
+    Returns:
+        mi: array of shape joint.shape[:-2]
+    """
+    joint = np.asarray(joint)
+    lead = joint.shape[:-2]
+    bx, by = joint.shape[-2:]
+    nx = np.sum(joint, axis=-1, out=_scratch(work, "marg_x", lead + (bx,), joint.dtype))
+    ny = np.sum(joint, axis=-2, out=_scratch(work, "marg_y", lead + (by,), joint.dtype))
+    hx = entropy_from_counts(nx, work=work, name="hx")
+    hy = entropy_from_counts(ny, work=work, name="hy")
+    hxy = entropy_from_counts(joint.reshape(lead + (-1,)), work=work, name="hxy")
+    return hx + hy - hxy
+
+
+def update_counts(counts, xlogx, entering, leaving):
+    """
+    Add one count per entering cell and remove one per leaving cell, in place.
+
+    Parameters:
+        counts: flat int64 count array
+        xlogx: table of n*log(n) for every reachable count n
+        entering, leaving: flat cell indices (repeats allowed)
+
+    Returns:
+        touched: indices of cells whose count changed
+        d_xlogx: change of n*log(n) at each touched cell
+    """
+    n_touch = len(entering) + len(leaving)
+    if n_touch == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    if len(counts) <= 8 * n_touch:
+        # Small cell domain: dense bincounts beat sorting the touched cells.
+        delta = np.bincount(entering, minlength=len(counts))
+        delta -= np.bincount(leaving, minlength=len(counts))
+        touched = np.flatnonzero(delta)
+        delta = delta[touched]
+    else:
+        cells = np.concatenate([entering, leaving])
+        weights = np.ones(n_touch, dtype=np.int64)
+        weights[len(entering):] = -1
+        touched, inverse = np.unique(cells, return_inverse=True)
+        delta = np.bincount(inverse, weights=weights, minlength=len(touched)).astype(np.int64)
+    old = counts[touched]
+    new = old + delta
+    counts[touched] = new
+    return touched, xlogx[new] - xlogx[old]
+
+
+class SlidingHistogramMI:
+    """
+    Sliding-window histogram MI updated in O(hop) per step.
+
+    Keeps the joint and marginal counts of the most recent `window_size`
+    samples (fixed bin edges) together with running sums S = sum(n log n)
+    over their cells, so that
+
+        MI = log W - (Sx + Sy - Sxy) / W
+
+    changes only through the cells touched by entering and leaving samples.
+    Bin codes of the window are held in a ring buffer, so callers only push
+    new samples. S is recomputed exactly from the counts every
+    `resync_every` pushes to bound floating-point drift.
+
+    Parameters:
+        window_size: number of samples in the window (W)
+        bins: number of equal-width bins per variable
+        x_range, y_range: fixed (lo, hi) bin edges; out-of-range samples
+            are clipped into the edge bins (see hist_codes)
+        resync_every: pushes between exact recomputations of S
+    """
+
+    def __init__(self, window_size: int, bins: int, x_range, y_range, resync_every: int = 1024):
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        self.window_size = int(window_size)
+        self.bins = int(bins)
+        self.x_range = tuple(float(v) for v in x_range)
+        self.y_range = tuple(float(v) for v in y_range)
+        self.resync_every = int(resync_every)
+        n = np.arange(self.window_size + 1, dtype=np.float64)
+        self._xlogx = n * np.log(np.where(n > 0, n, 1.0))
+        self.reset()
+
+    def reset(self) -> None:
+        """Empty the window."""
+        self._joint = np.zeros(self.bins * self.bins, dtype=np.int64)
+        self._hx = np.zeros(self.bins, dtype=np.int64)
+        self._hy = np.zeros(self.bins, dtype=np.int64)
+        self._s = np.zeros(3)  # Sx, Sy, Sxy
+        self._ring = np.zeros(self.window_size, dtype=np.intp)
+        self._pos = 0
+        self.count = 0
+        self._pushes = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.window_size
+
+    @property
+    def mi(self) -> float:
+        """MI (nats) of the samples currently in the window."""
+        if self.count == 0:
+            return 0.0
+        sx, sy, sxy = self._s
+        return float(np.log(self.count) - (sx + sy - sxy) / self.count)
+
+    def push(self, x, y) -> float:
+        """Append samples (oldest ones leave once the window is full); returns mi."""
+        cx = hist_codes(np.asarray(x, dtype=np.float64).ravel(), self.bins, range=self.x_range)
+        cy = hist_codes(np.asarray(y, dtype=np.float64).ravel(), self.bins, range=self.y_range)
+        if cx.shape != cy.shape:
+            raise ValueError("x and y must have same length")
+        self.push_codes(cx, cy)
+        return self.mi
+
+    def push_codes(self, cx, cy) -> None:
+        """Append samples already binned with this engine's edges."""
+        W = self.window_size
+        cells = np.asarray(cx, dtype=np.intp) * self.bins + np.asarray(cy, dtype=np.intp)
+        if len(cells) >= W:
+            self.reset()
+            cells = cells[-W:]
+        m = len(cells)
+        slots = (self._pos + np.arange(m)) % W
+        n_leave = max(0, m - (W - self.count))
+        leaving = self._ring[slots[m - n_leave:]]
+        self._ring[slots] = cells
+        self._pos = (self._pos + m) % W
+        self.count = min(W, self.count + m)
+
+        self._s[2] += update_counts(self._joint, self._xlogx, cells, leaving)[1].sum()
+        b = self.bins
+        self._s[0] += update_counts(self._hx, self._xlogx, cells // b, leaving // b)[1].sum()
+        self._s[1] += update_counts(self._hy, self._xlogx, cells % b, leaving % b)[1].sum()
+        self._pushes += 1
+        if self._pushes % self.resync_every == 0:
+            self._s[:] = [self._xlogx[self._hx].sum(), self._xlogx[self._hy].sum(),
+                          self._xlogx[self._joint].sum()]
+
+
+def sliding_windowed_mi(
+    x, y,
+    window_size: int = 1000,
+    hop_size: int = 200,
+    bins: int = 32,
+    x_range=None,
+    y_range=None,
+):
+    """
+    Sliding-window histogram MI with fixed edges in O(hop) per window.
+
+    Every window is binned with the same edges (default: the global
+    [min, max] of x and y), so consecutive windows differ only by the hop
+    samples entering and leaving; SlidingHistogramMI updates the counts and
+    entropies from those alone. Results equal a per-window recomputation
+    with the same edges (mi_from_codes) to floating-point precision.
+
+    Returns:
+        starts: array of window start indices
+        mi_vals: array of MI values (nats)
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.shape != y.shape:
+        raise ValueError("x and y must have same length")
+    if window_size <= 0 or hop_size <= 0:
+        raise ValueError("window_size and hop_size must be positive integers")
+    x_range = (x.min(), x.max()) if x_range is None else x_range
+    y_range = (y.min(), y.max()) if y_range is None else y_range
+    cx = hist_codes(x, bins, range=x_range)
+    cy = hist_codes(y, bins, range=y_range)
+
+    starts = np.arange(0, max(0, len(x) - window_size + 1), hop_size)
+    mi_vals = np.empty(len(starts))
+    engine = SlidingHistogramMI(window_size, bins, x_range, y_range)
+    if len(starts):
+        engine.push_codes(cx[:window_size], cy[:window_size])
+        mi_vals[0] = engine.mi
+    for i in range(1, len(starts)):
+        a = starts[i - 1] + window_size
+        b = starts[i] + window_size
+        if hop_size >= window_size:
+            a = starts[i]
+        engine.push_codes(cx[a:b], cy[a:b])
+        mi_vals[i] = engine.mi
+    return starts, mi_vals
+
+
+class EWMAHistogramMI:
+    """
+    Exponentially weighted histogram MI and entropies with constant memory.
+
+    The sample t steps in the past carries weight decay**t, i.e. an effective
+    window of 1 / (1 - decay) samples. Rather than multiplying every cell by
+    `decay` per sample, counts are stored in raw units against a global
+    scale: each new sample adds its raw weight (which grows by 1/decay per
+    sample) to its own joint cell only. Probabilities are scale-free, so
+    reads normalise the raw table directly; the table is renormalised before
+    the raw weight can overflow.
+
+    Parameters:
+        decay: per-sample decay factor in (0, 1)
+        bins: number of equal-width bins per variable
+        x_range, y_range: fixed (lo, hi) bin edges; out-of-range samples
+            are clipped into the edge bins (see hist_codes)
+    """
+
+    _RENORM_AT = 1e100
+
+    def __init__(self, decay: float, bins: int, x_range, y_range):
+        if not 0.0 < decay < 1.0:
+            raise ValueError("decay must be in (0, 1)")
+        self.decay = float(decay)
+        self.bins = int(bins)
+        self.x_range = tuple(float(v) for v in x_range)
+        self.y_range = tuple(float(v) for v in y_range)
+        # Longest run of samples whose raw weights stay below _RENORM_AT.
+        self._max_run = max(1, int(np.log(self._RENORM_AT) / -np.log(self.decay)))
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._raw = np.zeros(self.bins * self.bins, dtype=np.float64)
+        self._inc = 1.0  # raw weight of the next sample
+        self.n_seen = 0
+
+    @property
+    def effective_n(self) -> float:
+        """Total weight in the histogram (tends to 1 / (1 - decay))."""
+        return float(self._raw.sum() / (self._inc * self.decay))
+
+    @property
+    def joint(self) -> np.ndarray:
+        """Weighted joint counts, newest sample = 1, shape (bins, bins)."""
+        return (self._raw / (self._inc * self.decay)).reshape(self.bins, self.bins)
+
+    @property
+    def mi(self) -> float:
+        """Weighted plug-in MI (nats)."""
+        return float(mi_from_joint(self._raw.reshape(self.bins, self.bins)))
+
+    def entropies(self) -> tuple[float, float, float]:
+        """Weighted plug-in entropies (H(X), H(Y), H(X,Y)) in nats."""
+        joint = self._raw.reshape(self.bins, self.bins)
+        return (
+            float(entropy_from_counts(joint.sum(axis=1))),
+            float(entropy_from_counts(joint.sum(axis=0))),
+            float(entropy_from_counts(self._raw)),
+        )
+
+    def push(self, x, y) -> float:
+        """Add samples in time order; returns mi."""
+        cx = hist_codes(np.asarray(x, dtype=np.float64).ravel(), self.bins, range=self.x_range)
+        cy = hist_codes(np.asarray(y, dtype=np.float64).ravel(), self.bins, range=self.y_range)
+        if cx.shape != cy.shape:
+            raise ValueError("x and y must have same length")
+        self.push_codes(cx, cy)
+        return self.mi
+
+    def push_codes(self, cx, cy) -> None:
+        """Add samples already binned with this estimator's edges."""
+        cells = np.asarray(cx, dtype=np.intp) * self.bins + np.asarray(cy, dtype=np.intp)
+        growth = 1.0 / self.decay
+        for a in range(0, len(cells), self._max_run):
+            run = cells[a:a + self._max_run]
+            if self._inc * growth ** len(run) > self._RENORM_AT:
+                self._raw /= self._inc
+                self._inc = 1.0
+            weights = self._inc * growth ** np.arange(len(run), dtype=np.float64)
+            np.add.at(self._raw, run, weights)  # touches only the samples' own cells
+            self._inc = weights[-1] * growth
+        self.n_seen += len(cells)
+
+
+def ewma_mi_series(
+    x, y,
+    decay: float,
+    hop_size: int = 1,
+    bins: int = 32,
+    x_range=None,
+    y_range=None,
+):
+    """
+    EWMA histogram MI read out every `hop_size` samples.
+
+    Returns:
+        t_idx: index of the last sample included in each readout
+        mi_vals: array of MI values (nats)
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if x.shape != y.shape:
+        raise ValueError("x and y must have same length")
+    if hop_size <= 0:
+        raise ValueError("hop_size must be a positive integer")
+    x_range = (x.min(), x.max()) if x_range is None else x_range
+    y_range = (y.min(), y.max()) if y_range is None else y_range
+    cx = hist_codes(x, bins, range=x_range)
+    cy = hist_codes(y, bins, range=y_range)
+
+    est = EWMAHistogramMI(decay, bins, x_range, y_range)
+    t_idx = np.arange(hop_size - 1, len(x), hop_size)
+    mi_vals = np.empty(len(t_idx))
+    for i, t in enumerate(t_idx):
+        est.push_codes(cx[t + 1 - hop_size:t + 1], cy[t + 1 - hop_size:t + 1])
+        mi_vals[i] = est.mi
+    return t_idx, mi_vals
+
+
 def mutual_info_hist(
     x, y, 
     bins: int = 64,
@@ -63,11 +586,17 @@ def windowed_mi(
     window_size: int = 1000,
     hop_size: int = 200,
     bins: int = 32,
-    base: float = np.e
+    base: float = np.e,
+    edges: str = "window",
 ):
     """
     Sliding window mutual information.
-    
+
+    edges="window" bins each window on its own range; edges="global" uses
+    the global range of x and y and the shared block-prefix engine
+    (kernels_sw.streaming.multiscale_windowed_mi) when hop_size divides
+    window_size, otherwise the O(hop) sliding histogram (sliding_windowed_mi).
+
     Returns:
         starts: array of window start indices
         mi_vals: array of MI values
@@ -77,6 +606,20 @@ def windowed_mi(
     y = np.asarray(y).flatten()
     n = min(len(x), len(y))
     
+    extras = {"window_size": window_size, "hop_size": hop_size, "bins": bins, "edges": edges}
+    if edges == "global":
+        if window_size % hop_size and not (np.isnan(x[:n]).any() or np.isnan(y[:n]).any()):
+            starts, mi_vals = sliding_windowed_mi(x[:n], y[:n], window_size, hop_size, bins=bins)
+            return starts, mi_vals / np.log(base), extras
+        from .streaming import multiscale_windowed_mi
+
+        starts, mi_vals = multiscale_windowed_mi(
+            x[:n], y[:n], [window_size], hop_size, bins=bins
+        )[window_size]
+        return starts, mi_vals / np.log(base), extras
+    if edges != "window":
+        raise ValueError(f"edges must be 'window' or 'global', got {edges!r}")
+
     starts = np.arange(0, max(0, n - window_size + 1), hop_size)
     mi_vals = np.zeros(len(starts))
     
@@ -87,5 +630,4 @@ def windowed_mi(
             bins=bins, base=base
         )
     
-    extras = {"window_size": window_size, "hop_size": hop_size, "bins": bins}
     return starts, mi_vals, extras
@@ -4,21 +4,35 @@ import numpy as np
 from scipy.spatial import cKDTree
 from scipy.special import digamma
 
+from itpu.ingest import as_array, record_copy
+
 _EPS = 1e-12
-__all__ = ["ksg_mi_estimate", "windowed_ksg_mi"]
+__all__ = ["ksg_mi_estimate", "ksg_local_mi", "windowed_ksg_mi", "SlidingKSG"]
 
 def _as_1d(a):
-    a = np.asarray(a)
+    a = as_array(a)
     if a.ndim != 1:
         raise ValueError("Expected 1D array")
     return a
 
 def ksg_mi_estimate(
-    x, y, k: int = 5, metric: str = "chebyshev", clip_zero: bool = True
+    x, y, k: int = 5, metric: str = "chebyshev", clip_zero: bool = True, work=None
 ) -> tuple[float, dict]:
     """
     Kraskov–Stögbauer–Grassberger MI estimator (variant I).
     Returns (mi_nats, stats).
+
+    work: optional Workspace for the joint-sample, radius, count and digamma
+    buffers (cKDTree still allocates its tree and query results).
+
+    float32 inputs (both x and y) take a float32 path: the joint k-NN radii
+    come from cKDTree as before (exact for float32 values), and the marginal
+    counts from binary searches in float32 sorted copies of x and y instead
+    of two float64 trees. Search bounds v_i -/+ r_i are rounded outward to
+    float32, which keeps the counts exact; the result can differ from the
+    float64 path only through its 1e-12 radius shrink, i.e. when a marginal
+    distance lies within 1e-12 of r_i (error bound: 1 / (N * n_i) nats per
+    such sample; none occur at the validation operating points).
     """
     x = _as_1d(x); y = _as_1d(y)
     if len(x) != len(y):
@@ -27,12 +41,51 @@ def ksg_mi_estimate(
     if N <= k:
         return 0.0, dict(N=N, k=k, method="ksg", note="too few samples")
 
-    z = np.column_stack((x, y))
+    nx, ny = _ksg_neighbour_counts(x, y, k, metric, work)
+    if work is None:
+        mi = digamma(k) + digamma(N) - np.mean(digamma(nx + 1) + digamma(ny + 1))
+    else:
+        psi_x = np.add(nx, 1, out=work.get("psi_x", (N,), np.float64))
+        psi_y = np.add(ny, 1, out=work.get("psi_y", (N,), np.float64))
+        digamma(psi_x, out=psi_x)
+        psi_x += digamma(psi_y, out=psi_y)
+        mi = digamma(k) + digamma(N) - np.mean(psi_x)
+    if clip_zero:
+        mi = max(mi, 0.0)
+    mi = float(mi)
+    stats = dict(N=N, k=k, metric=metric, method="ksg")
+    return mi, stats
+
+
+def ksg_local_mi(x, y, k: int = 5, metric: str = "chebyshev") -> np.ndarray:
+    """
+    Per-sample (local) KSG MI: psi(k) + psi(N) - psi(nx_i + 1) - psi(ny_i + 1).
+
+    Its mean is the unclipped ksg_mi_estimate(); individual values may be
+    negative. Returns zeros when N <= k.
+    """
+    x = _as_1d(x); y = _as_1d(y)
+    if len(x) != len(y):
+        raise ValueError("x and y must have the same length")
+    N = len(x)
+    if N <= k:
+        return np.zeros(N)
+    nx, ny = _ksg_neighbour_counts(x, y, k, metric)
+    return digamma(k) + digamma(N) - (digamma(nx + 1) + digamma(ny + 1))
+
+
+def _ksg_neighbour_counts(x, y, k, metric, work=None):
+    """Marginal neighbour counts (nx, ny) within each sample's joint k-NN radius."""
+    N = len(x)
+    z = np.empty((N, 2)) if work is None else work.get("ksg_z", (N, 2), np.float64)
+    z[:, 0] = x
+    z[:, 1] = y
+    record_copy("ksg_pack", z.nbytes)  # cKDTree needs contiguous float64 points
     d = z.shape[1]  # joint dimension, derived from data
     if N < 10 ** d:
         warnings.warn(
             f"KSG: Sample count may be insufficient for reliable {d}D KSG estimation.",
-            stacklevel=2,
+            stacklevel=3,
         )
     p = np.inf if metric == "chebyshev" else 2
     tree_z = cKDTree(z)
@@ -43,30 +96,381 @@ def ksg_mi_estimate(
     if n_tiny > 0:
         warnings.warn(
             f"KSG: {n_tiny} samples have near-zero radius (possible duplicate or zero-variance data). MI estimate unreliable.",
-            stacklevel=2,
+            stacklevel=3,
         )
 
-    tiny = 1e-12
-    tree_x = cKDTree(x[:, None])
-    tree_y = cKDTree(y[:, None])
-    nx = np.array(tree_x.query_ball_point(x[:, None], radii - tiny, return_length=True)) - 1
-    ny = np.array(tree_y.query_ball_point(y[:, None], radii - tiny, return_length=True)) - 1
+    if x.dtype == np.float32 and y.dtype == np.float32:
+        nx = _count_within_f32(x, radii)
+        ny = _count_within_f32(y, radii)
+    else:
+        tiny = 1e-12
+        rho = np.subtract(radii, tiny, out=None if work is None else work.get("ksg_rho", (N,), np.float64))
+        tree_x = cKDTree(z[:, :1])
+        tree_y = cKDTree(z[:, 1:])
+        nx = tree_x.query_ball_point(z[:, :1], rho, return_length=True)
+        ny = tree_y.query_ball_point(z[:, 1:], rho, return_length=True)
+        nx -= 1
+        ny -= 1
 
     n_zero = int(np.sum((nx < 0) | (ny < 0)))
     if n_zero > 0:
         warnings.warn(
             f"KSG: {n_zero} samples have zero marginal neighbors within joint radius. High-dimensional density collapse likely. MI estimate may be unreliable.",
-            stacklevel=2,
+            stacklevel=3,
         )
 
-    nx = np.maximum(nx, 0); ny = np.maximum(ny, 0)
+    return np.maximum(nx, 0, out=nx), np.maximum(ny, 0, out=ny)
+
+
+def _count_within_f32(v, radii):
+    """Marginal counts #{j != i : |v_j - v_i| < r_i} searched in float32."""
+    s = np.sort(v)
+    # v_j < v_i + r_i holds for float32 v_j exactly when v_j is below the
+    # bound rounded up to float32 (and v_j > v_i - r_i when above it rounded
+    # down), so the float32 search reproduces exact-arithmetic counts.
+    hi = _round_f32(v + radii, np.inf)
+    lo = _round_f32(v - radii, -np.inf)
+    counts = np.searchsorted(s, hi, side="left") - np.searchsorted(s, lo, side="right") - 1
+    zero = radii == 0
+    if zero.any():  # duplicates: count them, as the float64 path does
+        counts[zero] = np.searchsorted(s, v[zero], side="right") - np.searchsorted(s, v[zero], side="left") - 1
+    return counts
+
+
+def _round_f32(b, direction):
+    """Float32 nearest to float64 bounds b, moved outward where it rounded inward."""
+    out = b.astype(np.float32)
+    inward = out < b if direction > 0 else out > b
+    out[inward] = np.nextafter(out[inward], np.float32(direction))
+    return out
+
+
+def _sorted_update(vals, slots, gone, new, new_slots):
+    """Drop the entries whose slot is flagged in `gone`, insert (new, new_slots)."""
+    if gone is not None:
+        keep = ~gone[slots]
+        vals, slots = vals[keep], slots[keep]
+    order = np.argsort(new, kind="stable")
+    at = np.searchsorted(vals, new[order])
+    return np.insert(vals, at, new[order]), np.insert(slots, at, new_slots[order])
+
+
+def _ragged(lo, hi):
+    """Group ids and positions covering the index ranges [lo[g], hi[g])."""
+    lens = hi - lo
+    g = np.repeat(np.arange(len(lo)), lens)
+    pos = np.arange(int(lens.sum())) + np.repeat(lo - np.cumsum(lens) + lens, lens)
+    return g, pos
+
+
+def _count_in(sorted_vals, lo, hi):
+    return np.searchsorted(sorted_vals, hi, "right") - np.searchsorted(sorted_vals, lo, "left")
+
+
+class SlidingKSG:
+    """
+    Sliding-window KSG MI (variant I, Chebyshev) with incremental neighbours.
+
+    Keeps, for every sample in the window, its joint k-NN radius and its
+    marginal neighbour counts, the x and y marginals sorted by value (with
+    the ring slot of each entry), and a grid index of the joint samples
+    (sorted cell keys, cell size about the median radius), all maintained
+    by insert/delete. When a hop enters and leaves:
+
+    - radii are recomputed only for points that had a leaving sample inside
+      their radius, or that receive an entering sample strictly inside it,
+      and for the entering samples themselves (about (2k + 1) * hop points),
+      from box queries on the grid;
+    - those points recount their marginal neighbours by binary search; every
+      other point only shifts its counts by the hop samples inside its
+      marginal interval, found around each hop sample in the sorted
+      marginals.
+
+    The search work is O(hop * (k + n_T) + hop * log W), n_T being the
+    marginal count within the 95th-percentile radius, on top of O(W) memory
+    moves for the sorted arrays and the mean in mi. When a push touches
+    enough points that O(W log W) is cheaper (small windows, large hops),
+    radii come from a tree over the window and counts from a full recount.
+    Results equal ksg_mi_estimate() on the same window. Pushes longer than
+    a quarter window rebuild the state with a tree.
+    """
+
+    def __init__(self, window_size: int, k: int = 5, clip_zero: bool = True):
+        if window_size <= k:
+            raise ValueError("window_size must exceed k")
+        self.window_size = int(window_size)
+        self.k = int(k)
+        self.clip_zero = clip_zero
+        if self.window_size < 100:
+            warnings.warn(
+                "KSG: Sample count may be insufficient for reliable 2D KSG estimation.",
+                stacklevel=2,
+            )
+        self._psi = digamma(np.arange(1, self.window_size + 1, dtype=np.float64))
+        self.n_recomputed = 0  # radii recomputed, for diagnostics
+        self.reset()
+
+    def reset(self) -> None:
+        W = self.window_size
+        self._x = np.zeros(W)
+        self._y = np.zeros(W)
+        self._r = np.full(W, np.nan)
+        self._nx = np.zeros(W, dtype=np.intp)
+        self._ny = np.zeros(W, dtype=np.intp)
+        self._sx = np.empty(0)
+        self._sy = np.empty(0)
+        self._sx_slot = np.empty(0, dtype=np.intp)
+        self._sy_slot = np.empty(0, dtype=np.intp)
+        self._pos = 0
+        self.count = 0
+        self._grid(1.0)
+
+    @property
+    def mi(self) -> float:
+        """KSG MI (nats) of the samples currently in the window."""
+        N = self.count
+        if N <= self.k:
+            return 0.0
+        occ = self._occupied()
+        radii = self._r[occ]
+        n_tiny = int(np.sum(radii < _EPS))
+        if n_tiny > 0:
+            warnings.warn(
+                f"KSG: {n_tiny} samples have near-zero radius (possible duplicate or zero-variance data). MI estimate unreliable.",
+                stacklevel=2,
+            )
+        nx, ny = self._nx[occ], self._ny[occ]
+        n_zero = int(np.sum((nx < 0) | (ny < 0)))
+        if n_zero > 0:
+            warnings.warn(
+                f"KSG: {n_zero} samples have zero marginal neighbors within joint radius. High-dimensional density collapse likely. MI estimate may be unreliable.",
+                stacklevel=2,
+            )
+        nx = np.maximum(nx, 0); ny = np.maximum(ny, 0)
+        mi = digamma(self.k) + self._psi[N - 1] - np.mean(self._psi[nx] + self._psi[ny])
+        if self.clip_zero:
+            mi = max(mi, 0.0)
+        return float(mi)
+
+    def push(self, x, y) -> None:
+        """Append samples; the oldest leave once the window is full."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length")
+        if not (np.isfinite(x).all() and np.isfinite(y).all()):
+            raise ValueError("x and y must be finite")
+        W, m = self.window_size, len(x)
+        if m == 0:
+            return
+        if m > W // 4 or self.count + m <= W // 4:
+            keep = min(W, self.count + m)
+            occ = self._occupied()
+            xs = np.concatenate([self._x[occ], x])[-keep:]
+            ys = np.concatenate([self._y[occ], y])[-keep:]
+            self._rebuild(xs, ys)
+            return
+
+        slots = (self._pos + np.arange(m)) % W
+        n_leave = max(0, m - (W - self.count))
+        leave = slots[m - n_leave:]
+        lx, ly = self._x[leave].copy(), self._y[leave].copy()
+        remain = self._occupied()[n_leave:]  # the oldest samples leave first
+        gone = None
+        if n_leave:
+            gone = np.zeros(W, dtype=bool)
+            gone[leave] = True
+        self._sx, self._sx_slot = _sorted_update(self._sx, self._sx_slot, gone, x, slots)
+        self._sy, self._sy_slot = _sorted_update(self._sy, self._sy_slot, gone, y, slots)
+        self._cell_key, self._cell_slot = _sorted_update(
+            self._cell_key, self._cell_slot, gone, self._keys(x, y), slots)
+
+        self._x[slots] = x
+        self._y[slots] = y
+        self._pos = (self._pos + m) % W
+        self.count = min(W, self.count + m)
+        if self.count <= self.k:
+            return
+        r = self._r[remain]
+        r = np.where(np.isnan(r), np.inf, r)
+        finite = r[np.isfinite(r)]
+        median, T = np.percentile(finite, [50, 95]) if len(finite) else (np.nan, 0.0)
+        hit = self._affected(remain, r, T, x, y, lx, ly)
+
+        idx = np.concatenate([remain[hit], slots])
+        stale = np.zeros(W, dtype=bool)
+        stale[remain[~hit]] = True
+        rho = np.maximum(self._r - 1e-12, 0.0)  # radii before this push
+        if len(idx) * 1000 > W * np.log2(W):
+            # Too many points for box queries to beat a tree over the window.
+            occ = self._occupied()
+            dists, _ = cKDTree(np.column_stack((self._x[occ], self._y[occ])),
+                               balanced_tree=False, compact_nodes=False).query(
+                np.column_stack((self._x[idx], self._y[idx])), k=self.k + 1, p=np.inf)
+            self._r[idx] = dists[:, self.k]
+        else:
+            self._r[idx] = self._knn_radius(idx, np.concatenate([r[hit], np.full(m, T)]))
+        self.n_recomputed += len(idx)
+
+        # Unaffected points keep their radius; only hop samples inside their
+        # marginal intervals change their counts.
+        for counts, v, srt, srt_slot, new, old in ((self._nx, self._x, self._sx, self._sx_slot, x, lx),
+                                                   (self._ny, self._y, self._sy, self._sy_slot, y, ly)):
+            if self._shift_counts(counts, v, srt, srt_slot, stale, rho, T, new, old):
+                self._recount(counts, v, srt, idx)
+            else:
+                self._recount(counts, v, srt, self._occupied())
+        if len(finite) and not self._h / 4 <= median <= 4 * self._h:
+            self._grid(median)  # the scale drifted; re-grid
+
+    def _affected(self, remain, r, T, x, y, lx, ly) -> np.ndarray:
+        """Mask of remaining points whose k-NN set the hop may have changed.
+
+        A point is affected if an entering sample lies strictly inside its
+        radius or a leaving sample lies within it. Points with radius up to
+        the 95th percentile T are found by box queries of half-width T around
+        the hop samples; the few with larger radii are tested directly.
+        """
+        hit = np.zeros(len(remain), dtype=bool)
+        qx = np.concatenate([x, lx])
+        qy = np.concatenate([y, ly])
+        entering = np.arange(len(qx)) < len(x)
+
+        big = np.flatnonzero(r > T)
+        if len(big):
+            d = np.maximum(np.abs(self._x[remain[big], None] - qx), np.abs(self._y[remain[big], None] - qy))
+            rb = r[big, None]
+            hit[big] = (np.where(entering, d < rb, d <= rb)).any(axis=1)
+
+        q, slot = self._box(qx, qy, np.full(len(qx), T))
+        rank = np.full(self.window_size, -1, dtype=np.intp)
+        rank[remain] = np.arange(len(remain))
+        ri = rank[slot]
+        keep = ri >= 0
+        ri, q, slot = ri[keep], q[keep], slot[keep]
+        d = np.maximum(np.abs(self._x[slot] - qx[q]), np.abs(self._y[slot] - qy[q]))
+        hit[ri[np.where(entering[q], d < r[ri], d <= r[ri])]] = True
+        return hit
+
+    def _shift_counts(self, counts, v, s, s_slot, stale, rho, T, new, old) -> bool:
+        """Add (subtract) entering (leaving) samples inside the marginal
+        intervals [v_i - rho_i, v_i + rho_i] of the stale points.
+
+        Returns False, leaving counts untouched, when the hop samples have
+        so many marginal neighbours that recounting the window is cheaper.
+        """
+        q = np.concatenate([new, old])
+        pad = T + 4 * np.spacing(np.abs(q) + T)
+        lo, hi = np.searchsorted(s, q - pad, "left"), np.searchsorted(s, q + pad, "right")
+        if np.sum(hi - lo) > 8 * len(s):
+            return False
+        g, pos = _ragged(lo, hi)
+        slot = s_slot[pos]
+        keep = stale[slot] & (rho[slot] <= T)
+        g, slot = g[keep], slot[keep]
+        vs, rs, qg = v[slot], rho[slot], q[g]
+        inside = (vs - rs <= qg) & (qg <= vs + rs)
+        entering = g < len(new)
+        counts += np.bincount(slot[inside & entering], minlength=len(counts))
+        counts -= np.bincount(slot[inside & ~entering], minlength=len(counts))
+
+        big = np.flatnonzero(stale & (rho > T))  # wider intervals: test directly
+        if len(big):
+            vb, rb = v[big, None], rho[big, None]
+            inside = (vb - rb <= q) & (q <= vb + rb)
+            counts[big] += inside[:, :len(new)].sum(axis=1) - inside[:, len(new):].sum(axis=1)
+        return True
+
+    def _knn_radius(self, idx, hint) -> np.ndarray:
+        """Chebyshev distance to the k-th neighbour of each point in idx.
+
+        Box queries of half-width b start from hint; once k + 1 candidates
+        (self included) lie within b, the k-th smallest distance is exact.
+        Otherwise b doubles, up to a box covering the whole window.
+        """
+        k = self.k
+        qx, qy = self._x[idx], self._y[idx]
+        cap = 2 * max(self._sx[-1] - self._sx[0], self._sy[-1] - self._sy[0])
+        b = np.where(np.isfinite(hint) & (hint > 0), hint, self._h)
+        b = np.minimum(b, cap)
+        out = np.empty(len(idx))
+        todo = np.arange(len(idx))
+        while len(todo):
+            bt = b[todo]
+            g, slot = self._box(qx[todo], qy[todo], bt)
+            d = np.maximum(np.abs(self._x[slot] - qx[todo][g]), np.abs(self._y[slot] - qy[todo][g]))
+            within = d <= bt[g]
+            enough = np.bincount(g[within], minlength=len(todo)) > k
+            sel = within & enough[g]  # the k-th neighbour lies within b
+            gs, ds = g[sel], d[sel]
+            order = np.lexsort((ds, gs))
+            first = np.searchsorted(gs[order], np.flatnonzero(enough))
+            out[todo[enough]] = ds[order][first + k]
+            todo = todo[~enough]
+            b[todo] = np.minimum(2 * b[todo], cap)
+        return out
+
+    # Grid index: cell (i, j) = floor((x, y) / h), stored as i << 32 | j.
+    _CELL_LIM = 2**30
+
+    def _grid(self, h) -> None:
+        """(Re)build the grid index with cell size h."""
+        self._h = float(h) if np.isfinite(h) and h > 0 else 1.0
+        occ = self._occupied()
+        keys = self._keys(self._x[occ], self._y[occ])
+        order = np.argsort(keys, kind="stable")
+        self._cell_key, self._cell_slot = keys[order], occ[order]
+
+    def _cells(self, v) -> np.ndarray:
+        return np.clip(np.floor(v / self._h), -self._CELL_LIM, self._CELL_LIM).astype(np.int64)
+
+    def _keys(self, x, y) -> np.ndarray:
+        return (self._cells(x) << 32) + self._cells(y)
+
+    def _box(self, qx, qy, b):
+        """Candidate (query, slot) pairs covering the boxes |x - qx|, |y - qy| <= b."""
+        # Pad by a few ulps so rounding of qx -/+ b cannot drop a point at
+        # distance b; callers filter the candidates exactly.
+        pad = b + 4 * np.spacing(np.maximum(np.abs(qx), np.abs(qy)) + b)
+        i_lo, i_hi = self._cells(qx - pad), self._cells(qx + pad)
+        j_lo, j_hi = self._cells(qy - pad), self._cells(qy + pad)
+        g, col = _ragged(i_lo, i_hi + 1)  # one range of keys per grid column
+        g2, pos = _ragged(np.searchsorted(self._cell_key, (col << 32) + j_lo[g], "left"),
+                          np.searchsorted(self._cell_key, (col << 32) + j_hi[g], "right"))
+        return g[g2], self._cell_slot[pos]
+
+    def _recount(self, counts, v, s, idx) -> None:
+        """Marginal counts by binary search in the sorted marginal s (same
+        counts as query_ball_point(radius=r - 1e-12), which treats a
+        negative radius as 0, i.e. exact duplicates only)."""
+        rho = np.maximum(self._r[idx] - 1e-12, 0.0)
+        v = v[idx]
+        counts[idx] = _count_in(s, v - rho, v + rho) - 1
+
+    def _occupied(self) -> np.ndarray:
+        return (self._pos - self.count + np.arange(self.count)) % self.window_size
+
+    def _rebuild(self, x, y) -> None:
+        self.reset()
+        n = len(x)
+        self._x[:n] = x
+        self._y[:n] = y
+        self._pos = n % self.window_size
+        self.count = n
+        self._sx_slot = np.argsort(x, kind="stable")
+        self._sy_slot = np.argsort(y, kind="stable")
+        self._sx, self._sy = x[self._sx_slot], y[self._sy_slot]
+        h = np.nan
+        if n > self.k:
+            z = np.column_stack((x, y))
+            dists, _ = cKDTree(z).query(z, k=self.k + 1, p=np.inf)
+            self._r[:n] = dists[:, self.k]
+            self._recount(self._nx, self._x, self._sx, np.arange(n))
+            self._recount(self._ny, self._y, self._sy, np.arange(n))
+            self.n_recomputed += n
+            h = np.median(self._r[:n])
+        self._grid(h)
 
-    mi = digamma(k) + digamma(N) - np.mean(digamma(nx + 1) + digamma(ny + 1))
-    if clip_zero:
-        mi = max(mi, 0.0)
-    mi = float(mi)
-    stats = dict(N=N, k=k, metric=metric, method="ksg")
-    return mi, stats
 
 def windowed_ksg_mi(
     x, y,
@@ -74,9 +478,14 @@ def windowed_ksg_mi(
     hop_size: int = 200,
     k: int = 5,
     metric: str = "chebyshev",
+    incremental: bool = True,
 ):
     """
-    Sliding-window KSG MI by recomputing per window.
+    Sliding-window KSG MI.
+
+    With incremental=True (Chebyshev metric only) consecutive windows share
+    neighbour state through SlidingKSG; otherwise each window is recomputed.
+    Both give the same values.
     Returns: starts (idx), mi_vals (nats), extras (params).
     """
     x = _as_1d(x); y = _as_1d(y)
@@ -86,10 +495,22 @@ def windowed_ksg_mi(
 
     starts = np.arange(0, max(0, n - window_size + 1), hop_size, dtype=np.int64)
     mi_vals = np.zeros(len(starts), dtype=float)
+    incremental = incremental and metric == "chebyshev" and window_size > k
+    extras = dict(window_size=window_size, hop_size=hop_size, k=k, metric=metric,
+                  incremental=incremental)
+    if incremental and len(starts):
+        engine = SlidingKSG(window_size, k=k)
+        engine.push(x[:window_size], y[:window_size])
+        mi_vals[0] = engine.mi
+        for i in range(1, len(starts)):
+            a = max(starts[i - 1] + window_size, starts[i])
+            b = starts[i] + window_size
+            engine.push(x[a:b], y[a:b])
+            mi_vals[i] = engine.mi
+        return starts, mi_vals, extras
     for i, s in enumerate(starts):
         seg_x = x[s:s+window_size]
         seg_y = y[s:s+window_size]
         mi, _ = ksg_mi_estimate(seg_x, seg_y, k=k, metric=metric)
         mi_vals[i] = mi
-    extras = dict(window_size=window_size, hop_size=hop_size, k=k, metric=metric)
     return starts, mi_vals, extras
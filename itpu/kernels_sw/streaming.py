@@ -1,19 +1,142 @@
+import math
+
 import numpy as np
-from .hist import mi_hist
 
-def windowed_mi(x, y, window_size: int, hop_size: int, bins: int = 128, mask=None):
-    """Sliding-window histogram MI. Returns (t_idx, mi_vals)."""
-    x = np.asarray(x, dtype=np.float64); y = np.asarray(y, dtype=np.float64)
+from itpu.ingest import as_1d
+
+from .hist import hist_codes, mi_from_joint, sliding_windowed_mi
+
+# Windows per mi_from_joint call; bounds the float working set to
+# _MI_BATCH * bins**2 values.
+_MI_BATCH = 512
+
+
+def multiscale_windowed_mi(
+    x, y,
+    window_sizes,
+    hop_size: int,
+    bins: int = 128,
+    mask=None,
+    x_range=None,
+    y_range=None,
+):
+    """
+    Sliding-window histogram MI at several window sizes in one pass.
+
+    Samples are binned once on fixed edges (default: the global range of the
+    valid samples) and cut into blocks of g = gcd(hop_size, *window_sizes)
+    samples. One joint histogram is counted per block, and a cumulative sum
+    over blocks turns every window of every scale into a difference of two
+    prefix rows, so adding a window size costs O(bins^2) per window instead
+    of another pass over the data.
+
+    Parameters:
+        x, y: 1-D signals of equal length
+        window_sizes: int or sequence of window lengths in samples
+        hop_size: step between window starts, shared by all scales
+        bins: number of equal-width bins per variable
+        mask: optional boolean array; False samples (and NaNs) are not counted
+        x_range, y_range: fixed (lo, hi) edges; out-of-range samples are
+            clipped into the edge bins
+
+    Inputs are read in place in their own dtype (memmaps and strided views
+    included); no float64 copy of either signal is made.
+
+    Returns:
+        dict mapping each window size to (starts, mi_vals); windows cover
+        x[start:start + window_size]. Only a rolling span of prefix rows is
+        kept, so memory is O((max(window_sizes) / g + 512) * bins^2) and time
+        O((n / g) * bins^2); keep window sizes multiples of hop_size
+        (g == hop_size).
+    """
+    x = as_1d(x)
+    y = as_1d(y)
     if x.shape != y.shape:
         raise ValueError("x and y must have same shape")
+    sizes = [int(w) for w in np.atleast_1d(window_sizes)]
+    if hop_size <= 0 or not sizes or min(sizes) <= 0:
+        raise ValueError("window sizes and hop_size must be positive integers")
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if mask is not None:
+        valid &= np.asarray(mask, dtype=bool).ravel()
+    if x_range is None:
+        x_range = _valid_range(x, valid)
+    if y_range is None:
+        y_range = _valid_range(y, valid)
+    # Invalid samples get arbitrary in-range codes and are never counted.
+    with np.errstate(invalid="ignore"):
+        cells = hist_codes(x, bins, range=x_range) * bins
+        cells += hist_codes(y, bins, range=y_range)
+
+    n = len(x)
+    block = math.gcd(int(hop_size), *sizes)
+    n_blocks = n // block
+    n_cells = bins * bins
+    spans = {w: w // block for w in sizes}
+    starts = {w: np.arange(0, max(n - w + 1, 0), hop_size, dtype=int) for w in sizes}
+    firsts = {w: s // block for w, s in starts.items()}
+    mi_vals = {w: np.empty(len(s), dtype=np.float64) for w, s in starts.items()}
+
+    # Rolling span of prefix rows: windows whose first block lies in
+    # [b0, b0 + _MI_BATCH) need rows b0 .. b0 + _MI_BATCH - 1 + max span.
+    rows = min(n_blocks, _MI_BATCH + max(spans.values())) + 1
+    prefix = np.zeros((rows, n_cells), dtype=np.int32 if n < 2**31 else np.int64)
+    base, filled = 0, 1  # prefix[r] holds prefix row base + r; row 0 is empty
+    for b0 in range(0, n_blocks, _MI_BATCH):
+        pending = [(w, np.searchsorted(f, [b0, b0 + _MI_BATCH])) for w, f in firsts.items()]
+        pending = [(w, a, b) for w, (a, b) in pending if a < b]
+        if not pending:
+            break
+        kept = filled - (b0 - base)
+        prefix[:kept] = prefix[b0 - base:filled]
+        base, filled = b0, kept
+        need = min(b0 + rows - 1, n_blocks) - base + 1
+        while filled < need:
+            # Count blocks base + filled - 1 onwards, at most _MI_BATCH at a time.
+            k = min(need - filled, _MI_BATCH)
+            lo = (base + filled - 1) * block
+            hi = lo + k * block
+            keep_s = valid[lo:hi]
+            flat = (np.arange(hi - lo) // block)[keep_s] * n_cells + cells[lo:hi][keep_s]
+            counts = np.bincount(flat, minlength=k * n_cells).reshape(k, n_cells)
+            np.cumsum(counts, axis=0, out=counts)
+            counts += prefix[filled - 1]
+            prefix[filled:filled + k] = counts
+            filled += k
+        for w, a, b in pending:
+            i = firsts[w][a:b] - base
+            joint = (prefix[i + spans[w]] - prefix[i]).reshape(-1, bins, bins)
+            mi_vals[w][a:b] = mi_from_joint(joint)
+    return {w: (starts[w], mi_vals[w]) for w in sizes}
+
+
+def _valid_range(x, valid):
+    if not valid.any():
+        return (0.0, 1.0)
+    if valid.all():
+        return (float(x.min()), float(x.max()))
+    info = np.finfo(x.dtype) if x.dtype.kind == "f" else np.iinfo(x.dtype)
+    return (float(x.min(where=valid, initial=info.max)), float(x.max(where=valid, initial=info.min)))
+
+
+def windowed_mi(x, y, window_size: int, hop_size: int, bins: int = 128, mask=None):
+    """Sliding-window histogram MI on global edges. Returns (t_idx, mi_vals).
+
+    Single-scale view of multiscale_windowed_mi(); t_idx is the last sample
+    index of each window. When hop_size does not divide window_size and no
+    sample is masked or NaN, the O(hop) sliding histogram
+    (sliding_windowed_mi) is used instead of sample-sized blocks.
+    """
     if window_size <= 0 or hop_size <= 0 or hop_size > window_size:
         raise ValueError("window_size>0, hop_size>0, hop_size<=window_size")
-    n = x.size
-    starts = np.arange(0, max(n - window_size + 1, 0), hop_size, dtype=int)
-    t_idx = starts + window_size - 1
-    mi_vals = np.empty_like(t_idx, dtype=np.float64)
-    for i, s in enumerate(starts):
-        e = s + window_size
-        valid = slice(s, e) if mask is None else (mask[s:e] & ~(np.isnan(x[s:e]) | np.isnan(y[s:e])))
-        mi_vals[i] = mi_hist(x[s:e][valid], y[s:e][valid], bins=bins)
-    return t_idx, mi_vals
+    if window_size % hop_size and mask is None:
+        x = as_1d(x)
+        y = as_1d(y)
+        if x.shape == y.shape and not (np.isnan(x).any() or np.isnan(y).any()):
+            starts, mi_vals = sliding_windowed_mi(x, y, window_size, hop_size, bins=bins)
+            return starts + window_size - 1, mi_vals
+    starts, mi_vals = multiscale_windowed_mi(
+        x, y, [window_size], hop_size, bins=bins, mask=mask
+    )[window_size]
+    return starts + window_size - 1, mi_vals
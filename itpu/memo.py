@@ -0,0 +1,203 @@
+# itpu/memo.py
+"""
+Content-addressed memoisation of MI results.
+
+A result is keyed by fingerprints of its input arrays — a hash of the
+buffer contents plus shape, dtype and strides — together with the
+estimator, its parameter, pointwise-ness and the backend that computed it.
+Hashing uses xxhash (XXH3-128) when installed
+(`pip install itpu[performance]`) and falls back to blake2b.
+
+MemoCache holds results in memory under a byte budget with LRU eviction,
+optionally writing them through to a directory of .npy files that outlives
+the process and is consulted on memory misses.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:  # optional dependency
+    xxhash = None
+
+# Elements hashed per block when an input is not contiguous; bounds the
+# scratch copy instead of materialising the whole array.
+_HASH_BLOCK = 1 << 16
+# Accounting charge for a scalar entry (key, float, OrderedDict node).
+_SCALAR_BYTES = 128
+
+
+def _hasher():
+    return xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+
+
+def _update(h, a: np.ndarray) -> None:
+    if a.flags.c_contiguous:
+        h.update(a.reshape(-1).view(np.uint8))
+    elif a.ndim > 1:
+        for sub in a:
+            _update(h, sub)
+    else:
+        for start in range(0, a.size, _HASH_BLOCK):
+            h.update(np.ascontiguousarray(a[start:start + _HASH_BLOCK]).view(np.uint8))
+
+
+def fingerprint(a: np.ndarray) -> bytes:
+    """16-byte digest of an array's contents, shape, dtype and strides."""
+    h = _hasher()
+    h.update(repr((a.shape, a.dtype.str, a.strides)).encode())
+    _update(h, a)
+    return h.digest()
+
+
+class MemoCache:
+    """
+    LRU cache of MI results with a byte budget.
+
+    Parameters
+    ----------
+    max_bytes:
+        Budget for results held in memory (pointwise arrays count their
+        nbytes, scalars a fixed small charge). Least recently used entries
+        are evicted beyond it.
+    disk_dir:
+        Optional directory for an on-disk tier: every stored result is also
+        written there, and memory misses are looked up there before
+        recomputing. Entries are never evicted from disk.
+
+    Attributes
+    ----------
+    hits, misses:
+        Lookups answered from memory or disk / not found at all.
+    disk_hits:
+        The subset of hits answered from the disk tier.
+    evictions:
+        Entries dropped from memory to stay within max_bytes.
+    nbytes:
+        Bytes currently charged to the memory tier.
+
+    Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20, disk_dir: str | None = None) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, charge)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(x: np.ndarray, y: np.ndarray, method: str, param, pointwise: bool, backend: str) -> str:
+        """Cache key of one mutual_info() call."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(fingerprint(x))
+        h.update(fingerprint(y))
+        h.update(repr((method, param, bool(pointwise), backend)).encode())
+        return h.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str):
+        """Cached value (float or read-only array) or None; updates the counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, value)
+        return value
+
+    def put(self, key: str, value) -> None:
+        """Store a float or ndarray result (arrays are stored read-only)."""
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+        else:
+            value = float(value)
+        with self._lock:
+            self._insert(key, value)
+        self._save(key, value)
+
+    def clear(self) -> None:
+        """Empty the memory tier (the disk tier is kept) and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "hit_rate": self.hits / total if total else float("nan"),
+            }
+
+    # ------------------------------------------------------------------ #
+    def _insert(self, key: str, value) -> None:
+        charge = value.nbytes + _SCALAR_BYTES if isinstance(value, np.ndarray) else _SCALAR_BYTES
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        if charge > self.max_bytes:
+            return
+        self._entries[key] = (value, charge)
+        self.nbytes += charge
+        while self.nbytes > self.max_bytes:
+            _, (_, dropped) = self._entries.popitem(last=False)
+            self.nbytes -= dropped
+            self.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.npy")
+
+    def _save(self, key: str, value) -> None:
+        if self.disk_dir is None:
+            return
+        tmp = self._path(key) + f".{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(value))
+        os.replace(tmp, self._path(key))
+
+    def _load(self, key: str):
+        if self.disk_dir is None:
+            return None
+        try:
+            value = np.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+        if value.ndim == 0:
+            return float(value)
+        value.flags.writeable = False
+        return value
@@ -1,71 +1,222 @@
+import threading
+import warnings
+from contextlib import contextmanager
+
 import numpy as np
 
-from itpu.kernels_sw.ksg import ksg_mi_estimate
+from itpu.backends import KERNELS, Backend, get_backend, list_backends
+from itpu.command_queue import CommandQueue
+from itpu.ingest import as_1d, as_array
+from itpu.memo import MemoCache
 from itpu.types import EstimatorValue
+from itpu.workspace import Workspace
 
 __all__ = ["ITPU"]
 
 
 class ITPU:
     """
-    Device-agnostic API. device="software" supported now; future targets will
-    preserve this interface.
+    Device-agnostic API.
+
+    device selects the compute backend (see itpu.backends): "software" is
+    the reference implementation, "auto" routes every kernel to the fastest
+    capable registered backend, and any other registered name (e.g.
+    "threaded", "numba") is used for the kernels it implements, falling back
+    to "software" per kernel for the rest. A Backend instance (e.g. an
+    FPGASimBackend with a custom config) may be passed instead of a name.
+    Results agree across backends within each backend's declared tolerance.
+
+    max_batch and max_latency_ms configure the command queue behind
+    submit() (see itpu.command_queue).
+
+    memo opts in to result memoisation for mutual_info() (see itpu.memo):
+    True for a default MemoCache, or a MemoCache to use (and possibly share
+    between instances). Repeated calls on identical inputs and parameters
+    then return the cached value, tagged exactly as a fresh one.
     """
 
-    def __init__(self, device="software"):
-        if device != "software":
-            raise NotImplementedError("Only device='software' is supported today.")
+    def __init__(self, device="software", max_batch=256, max_latency_ms=2.0, memo=None):
+        if device == "auto":
+            chain = list_backends()
+        else:
+            backend = device if isinstance(device, Backend) else get_backend(device)
+            device = backend.name
+            if not backend.available():
+                raise RuntimeError(f"Device {device!r} is registered but not available here")
+            chain = [backend] + ([get_backend("software")] if device != "software" else [])
         self.device = device
+        self._chain = chain
+        self._routes = {}
+        self._local = threading.local()  # per-thread active workspace
+        self.memo = MemoCache() if memo is True else (memo if isinstance(memo, MemoCache) else None)
+        self.queue = CommandQueue(self._launch, max_batch=max_batch, max_latency_ms=max_latency_ms)
 
     # ---------- Public API ----------
-    def mutual_info(self, x, y, method="hist", **kwargs):
+    def capabilities(self):
+        """
+        Describe the backends this instance can use and where each kernel runs.
+
+        Returns a dict with "device", "backends" (name -> declared kernels,
+        dtypes, batch limit, priority) and "routing" (kernel -> backend name
+        for float64 inputs; None if no backend implements it).
+        """
+        routing = {}
+        for kernel in KERNELS:
+            backend = self._route(kernel, np.float64, required=False)
+            routing[kernel] = None if backend is None else backend.name
+        return {
+            "device": self.device,
+            "backends": {b.name: b.capabilities() for b in self._chain},
+            "routing": routing,
+        }
+
+    def mutual_info(self, x, y, method="hist", pointwise=False, **kwargs):
         """
         Mutual information between 1D arrays x,y (nats).
 
+        x and y may be ndarrays, np.memmap, strided views (e.g. X[:, i]),
+        DLPack or buffer-protocol objects, in any real dtype; they are read
+        in place (see itpu.ingest for the copy accounting).
+
         method: "hist" (discrete/histogram) or "ksg" (continuous kNN).
 
+        pointwise=True returns the local MI of every sample as an ndarray
+        (hist: log p(x,y)/(p(x)p(y)); ksg: psi(k)+psi(N)-psi(nx+1)-psi(ny+1))
+        whose mean is the usual estimate. Windowed means of it
+        (utils.windowed.windowed_mean) give a cheap approximate
+        time-resolved MI from one global estimation.
+
         Warning — histogram bias: method="hist" has an uncorrected plug-in
         positive bias of approximately (bins-1)^2 / (2*N) nats. At bins=64
         and N=5000 this is ~0.40 nats, larger than many real effects. Use
         method="ksg" for quantitative accuracy, or keep bins low and N large
         (rule of thumb: (bins-1)^2 / (2*N) < 0.01).
         """
-        x = np.asarray(x).ravel()
-        y = np.asarray(y).ravel()
+        x = as_1d(x)
+        y = as_1d(y)
         if x.shape != y.shape:
             raise ValueError("x and y must have same length.")
-
-        if method == "hist":
-            bins = int(kwargs.get("bins", 64))
-            return EstimatorValue(_mi_hist(x, y, bins=bins), "hist")
-        elif method == "ksg":
-            k = int(kwargs.get("k", 5))
-            mi, _ = ksg_mi_estimate(x, y, k=k, clip_zero=False)
-            return EstimatorValue(mi, "ksg")
+        param = _estimator_param(method, kwargs)
+        kernel = f"{method}_local_mi" if pointwise else f"{method}_mi"
+        backend = self._route(kernel, np.result_type(x, y))
+        memo = self.memo
+        if memo is not None:
+            key = memo.key(x, y, method, param, pointwise, backend.name)
+            value = memo.get(key)
+            if value is not None:
+                return value.copy() if pointwise else EstimatorValue(value, method)
+        work = getattr(self._local, "workspace", None)
+        if work is not None and not pointwise and backend.workspace:
+            value = getattr(backend, kernel)(x, y, param, work=work)
+            work.end_call()
         else:
-            raise ValueError(f"Unknown method: {method}")
+            value = getattr(backend, kernel)(x, y, param)
+        if memo is not None:
+            memo.put(key, value)
+        return value if pointwise else EstimatorValue(value, method)
+
+    @contextmanager
+    def workspace(self, n, bins=None, k=None):
+        """
+        Reuse scratch buffers across mutual_info() calls of length n.
+
+        Inside the context, scalar hist/KSG calls on backends that support
+        it (software) draw their code, table, probability, radius and
+        digamma temporaries from one Workspace. Buffers for the requested
+        estimators (bins for hist, k for KSG) are reserved on entry, so
+        steady-state calls report ws.last_allocations == 0. NumPy's
+        bincount table and cKDTree's tree and query results remain per-call
+        allocations. The workspace applies only to the thread that entered
+        the context; other threads (including the submit() dispatcher)
+        keep allocating per call, so each thread needs its own context.
+
+        Yields the Workspace, whose counters report allocations per call.
+        """
+        ws = Workspace()
+        ramp = np.linspace(0.0, 1.0, int(n))
+        software = get_backend("software")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if bins is not None:
+                software.hist_mi(ramp, ramp, int(bins), work=ws)
+            if k is not None:
+                software.ksg_mi(ramp, ramp[::-1], int(k), work=ws)
+        ws.reset_counters()
+        previous = getattr(self._local, "workspace", None)
+        self._local.workspace = ws
+        try:
+            yield ws
+        finally:
+            self._local.workspace = previous
+
+    def mutual_info_batch(self, X, Y, method="hist", **kwargs):
+        """
+        MI of each row pair of X, Y shaped (B, N), as a float64 array (B,).
+
+        Same estimator semantics as mutual_info() per row (hist rows are
+        binned over their own range). Batches larger than the backend's
+        max_batch are split into several launches.
+        """
+        X = as_array(X)
+        Y = as_array(Y)
+        if X.ndim != 2 or X.shape != Y.shape:
+            raise ValueError("X and Y must be 2D arrays of the same shape (B, N).")
+        param = _estimator_param(method, kwargs)
+        kernel = f"{method}_mi_batch"
+        backend = self._route(kernel, np.result_type(X, Y))
+        step = backend.max_batch or max(len(X), 1)
+        fn = getattr(backend, kernel)
+        parts = [fn(X[a:a + step], Y[a:a + step], param) for a in range(0, len(X), step)]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def submit(self, x, y, method="hist", **kwargs):
+        """
+        Asynchronous mutual_info(): returns a concurrent.futures.Future.
+
+        Pending commands with the same method, estimator parameter, length
+        and dtype are coalesced into one mutual_info_batch() launch, issued
+        when max_batch commands have gathered or the oldest has waited
+        max_latency_ms. Future results are identical to mutual_info().
+        Thread-safe.
+        """
+        x = as_1d(x)
+        y = as_1d(y)
+        if x.shape != y.shape:
+            raise ValueError("x and y must have same length.")
+        param = _estimator_param(method, kwargs)
+        descriptor = (method, param, x.shape[0], np.result_type(x, y).str)
+        return self.queue.submit(descriptor, x, y)
 
+    def flush(self):
+        """Launch all pending submit() commands and wait for them."""
+        self.queue.flush()
 
-# ---------- Histogram-based MI (nats) ----------
-def _entropy_from_hist(counts):
-    p = counts.astype(float)
-    total = p.sum()
-    if total <= 0:
-        return 0.0
-    p /= total
-    p = p[p > 0]
-    return float(-(p * np.log(p)).sum())
+    def close(self):
+        """Flush and stop the submit() dispatcher thread."""
+        self.queue.close()
 
+    def _launch(self, descriptor, xs, ys):
+        method, param = descriptor[:2]
+        kwargs = {"bins" if method == "hist" else "k": param}
+        if len(xs) == 1:
+            return [self.mutual_info(xs[0], ys[0], method=method, **kwargs)]
+        values = self.mutual_info_batch(np.stack(xs), np.stack(ys), method=method, **kwargs)
+        return [EstimatorValue(v, method) for v in values]
 
-def _mi_hist(x, y, bins=64):
-    """Plug-in histogram MI estimator (nats). Has uncorrected positive bias
-    of ~(bins-1)^2 / (2*N). Use method='ksg' for quantitative accuracy."""
-    hx, _ = np.histogram(x, bins=bins)
-    hy, _ = np.histogram(y, bins=bins)
-    hxy, _, _ = np.histogram2d(x, y, bins=bins)
+    # ---------- Routing ----------
+    def _route(self, kernel, dtype, required=True):
+        key = (kernel, np.dtype(dtype).name)
+        if key not in self._routes:
+            self._routes[key] = next((b for b in self._chain if b.supports(kernel, dtype)), None)
+        backend = self._routes[key]
+        if backend is None and required:
+            raise NotImplementedError(f"No backend for kernel {kernel!r} with dtype {key[1]} on device {self.device!r}")
+        return backend
 
-    Hx = _entropy_from_hist(hx)
-    Hy = _entropy_from_hist(hy)
-    Hxy = _entropy_from_hist(hxy)
 
-    return Hx + Hy - Hxy
+def _estimator_param(method, kwargs):
+    if method == "hist":
+        return int(kwargs.get("bins", 64))
+    if method == "ksg":
+        return int(kwargs.get("k", 5))
+    raise ValueError(f"Unknown method: {method}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
-from .surrogate_test import surrogate_test
+from .null_registry import NullRegistry, rank_transform
+from .surrogate_test import surrogate_test, surrogate_test_matrix
 
-__all__ = ["surrogate_test"]
+__all__ = ["surrogate_test", "surrogate_test_matrix", "NullRegistry", "rank_transform"]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from itpu.sdk import ITPU
+
+# Only this combination makes the shuffle null independent of the data: ranks
+# of tie-broken samples are always a permutation of 0..N-1, and shuffling
+# permutes them uniformly, so MI(rank x, shuffled rank y) has the same law as
+# MI(arange(N), random permutation of arange(N)) for every input pair.
+SHAREABLE_TRANSFORMS = ("rank",)
+SHAREABLE_SURROGATES = ("shuffle",)
+
+
+def rank_transform(x, rng=None) -> np.ndarray:
+    """Map x to ordinal ranks 0..N-1 (ties broken at random), as float64.
+
+    After this transform every input of length N has the same marginal, which
+    is what makes its surrogate null distribution shareable across pairs.
+
+    Tied samples get their ranks in a random order drawn from rng (seed or
+    numpy Generator). Breaking ties by position instead would make ranks rise
+    with the time index inside every tie group of both x and y — a spurious
+    dependence on quantized data such as int16 EEG.
+    """
+    x = np.asarray(x).ravel()
+    ranks = np.empty(len(x), dtype=np.float64)
+    order = np.lexsort((np.random.default_rng(rng).random(len(x)), x))
+    ranks[order] = np.arange(len(x), dtype=np.float64)
+    return ranks
+
+
+def check_shareable(transform: str | None, surrogate_type: str) -> None:
+    """Raise ValueError unless the null for this setup is data-independent."""
+    if transform not in SHAREABLE_TRANSFORMS:
+        raise ValueError(
+            f"Cannot share null distributions with transform={transform!r}: without a "
+            f"rank transform the null depends on each variable's marginal distribution. "
+            f"Use transform='rank'."
+        )
+    if surrogate_type not in SHAREABLE_SURROGATES:
+        raise ValueError(
+            f"Cannot share null distributions with surrogate_type={surrogate_type!r}: "
+            f"only 'shuffle' surrogates are exchangeable independently of the data "
+            f"('block' and 'iaaft' preserve each signal's autocorrelation)."
+        )
+
+
+class NullRegistry:
+    """Shared store of data-independent MI null distributions.
+
+    Nulls are keyed by (estimator, N, bins or k, surrogate type), computed
+    once on canonical rank data, kept in memory and, when cache_dir is set,
+    persisted as .npy files so later processes reuse them. A request for more
+    surrogates than stored extends the stored null rather than recomputing it.
+
+    Only valid for rank-transformed data with shuffle surrogates; every entry
+    point calls check_shareable() and refuses anything else.
+
+    Parameters
+    ----------
+    cache_dir:
+        Directory for persisted nulls. None keeps them in memory only.
+    rng:
+        Seed or numpy Generator used to draw canonical surrogates.
+    """
+
+    def __init__(self, cache_dir: str | None = None, rng=None) -> None:
+        self.cache_dir = cache_dir
+        self.rng = np.random.default_rng(rng)
+        self.n_computed = 0
+        self._nulls: dict = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(estimator: str, n: int, surrogate_type: str = "shuffle", **kwargs) -> tuple:
+        """Registry key; kwargs carry the estimator parameter (bins or k)."""
+        if estimator == "hist":
+            param = ("bins", int(kwargs.get("bins", 64)))
+        elif estimator == "ksg":
+            param = ("k", int(kwargs.get("k", 5)))
+        else:
+            raise ValueError(f"Unknown method: {estimator}")
+        return (estimator, int(n), param, surrogate_type)
+
+    def get(
+        self,
+        estimator: str,
+        n: int,
+        n_surrogates: int,
+        surrogate_type: str = "shuffle",
+        transform: str | None = "rank",
+        **kwargs,
+    ) -> np.ndarray:
+        """Return n_surrogates null MI values for rank data of length n.
+
+        Parameters
+        ----------
+        estimator:
+            "hist" or "ksg".
+        n:
+            Sample count of the tested pairs.
+        n_surrogates:
+            Number of null values required.
+        surrogate_type, transform:
+            Must describe an exchangeable setup (see check_shareable()).
+        **kwargs:
+            bins (hist) or k (ksg), as passed to ITPU.mutual_info().
+
+        Returns
+        -------
+        np.ndarray, shape (n_surrogates,). The same stored values are returned
+        to every caller with the same key.
+        """
+        check_shareable(transform, surrogate_type)
+        key = self.key(estimator, n, surrogate_type, **kwargs)
+        null = self._nulls.get(key)
+        if null is None:
+            null = self._load(key)
+        if len(null) < n_surrogates:
+            extra = self._compute(key, n_surrogates - len(null))
+            null = np.concatenate([null, extra])
+            self._save(key, null)
+        self._nulls[key] = null
+        return null[:n_surrogates]
+
+    def _compute(self, key: tuple, count: int) -> np.ndarray:
+        estimator, n, (param_name, param), _ = key
+        sdk = ITPU(device="software")
+        ranks = np.arange(n, dtype=np.float64)
+        out = np.empty(count, dtype=np.float64)
+        for i in range(count):
+            out[i] = sdk.mutual_info(
+                ranks, self.rng.permutation(ranks), method=estimator, **{param_name: param}
+            )
+        self.n_computed += count
+        return out
+
+    def _path(self, key: tuple) -> str | None:
+        if self.cache_dir is None:
+            return None
+        estimator, n, (param_name, param), surrogate_type = key
+        name = f"null_{estimator}_n{n}_{param_name}{param}_{surrogate_type}.npy"
+        return os.path.join(self.cache_dir, name)
+
+    def _load(self, key: tuple) -> np.ndarray:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return np.empty(0, dtype=np.float64)
+        return np.load(path)
+
+    def _save(self, key: tuple, null: np.ndarray) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        tmp = path + ".tmp.npy"
+        np.save(tmp, null)
+        os.replace(tmp, path)
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import math
+import warnings
+
 import numpy as np
+from scipy import stats
 
+from itpu.kernels_sw.hist import hist_codes, mi_from_codes, mi_from_joint
+from itpu.kernels_sw.ksg import ksg_mi_estimate
 from itpu.sdk import ITPU
-from itpu.stats.surrogates import block_bootstrap_surrogate, iaaft_surrogate, shuffle_surrogate
-from itpu.types import SurrogateResult
+from itpu.stats.multiple_testing import benjamini_hochberg
+from itpu.stats.null_registry import NullRegistry, check_shareable, rank_transform
+from itpu.stats.surrogates import (
+    block_bootstrap_surrogate,
+    iaaft_surrogate,
+    shuffle_surrogate,
+    table_surrogate,
+)
+from itpu.types import EstimatorValue, SurrogateMatrixResult, SurrogateResult
+from itpu.workspace import Workspace
 
 
 def surrogate_test(
@@ -15,6 +29,17 @@ def surrogate_test(
     surrogate_type: str = "shuffle",
     fdr_alpha: float = 0.05,
     rng=None,
+    stopping: str = "fixed",
+    h: int = 10,
+    alpha: float = 0.05,
+    transform: str | None = None,
+    null_registry: NullRegistry | None = None,
+    null: str = "permutation",
+    min_expected: float = 5.0,
+    tail: str | None = None,
+    keep_null: str = "full",
+    sketch_size: int = 1024,
+    **kwargs,
 ) -> SurrogateResult:
     """Test for statistical dependence between x and y using surrogate resampling.
 
@@ -33,19 +58,85 @@ def surrogate_test(
         MI estimator to use. One of: "ksg", "hist".
     n_surrogates:
         Number of surrogate samples used to build the null distribution.
+        With stopping="sequential" this is the maximum number drawn.
     surrogate_type:
         Resampling strategy for generating surrogates. One of:
         "shuffle" (independent permutation), "block" (block bootstrap),
-        or "iaaft" (preserves power spectrum and amplitude distribution;
-        use for stationary autocorrelated data such as EEG/LFP).
+        "iaaft" (preserves power spectrum and amplitude distribution;
+        use for stationary autocorrelated data such as EEG/LFP), or "table"
+        (method="hist" only: draws null joint tables directly from the
+        observed row/column bin counts — the same null as "shuffle" at
+        O(bins^2) per surrogate instead of O(N); see table_surrogate()).
     fdr_alpha:
         FDR level for downstream Benjamini-Hochberg correction. This parameter
-        is accepted for API compatibility with future batch usage but is NOT
-        applied internally — p_value is always the raw permutation p-value.
-        Batch FDR correction is a follow-on feature, not implemented here.
+        is accepted for API compatibility but is NOT applied internally —
+        p_value is always the raw permutation p-value. Use
+        surrogate_test_matrix() to test a channel montage with BH applied
+        across the family.
     rng:
         Seed or numpy Generator for reproducibility. Passed to the surrogate
         generator. Default None produces non-deterministic results.
+    stopping:
+        "fixed" (default) always draws n_surrogates. "sequential" applies the
+        Besag-Clifford (1991) rule: surrogates are drawn one at a time and
+        sampling stops as soon as h null exceedances (null >= observed) have
+        been seen, or as soon as the decision at level alpha can no longer
+        change.
+    h:
+        Exceedance count at which sequential sampling stops. Only used when
+        stopping="sequential".
+    alpha:
+        Significance level whose decision the sequential rule preserves. Only
+        used when stopping="sequential".
+    transform:
+        None (default) tests the raw data. "rank" replaces x and y by their
+        ordinal ranks before estimation (a copula transform), which leaves
+        the dependence structure unchanged and makes the shuffle null
+        independent of the data. Ties are broken at random using rng.
+    null_registry:
+        Optional NullRegistry. When given, the null distribution is taken
+        from the registry (computed once per (method, N, bins or k,
+        surrogate_type) and reused by every compatible test) instead of
+        being resampled. Requires transform="rank" and
+        surrogate_type="shuffle"; raises ValueError otherwise.
+    null:
+        "permutation" (default) resamples surrogates. "asymptotic" (hist
+        only) skips surrogates: under independence the G statistic
+        2*N*MI is asymptotically chi-squared with (bx-1)(by-1) degrees of
+        freedom over the occupied bins; Williams' correction is applied.
+        "auto" uses the asymptotic null when every expected cell count
+        R_i*C_j/N is at least min_expected, and permutations otherwise.
+        stopping, tail and keep_null configure permutations only: setting
+        them with "asymptotic" raises ValueError, and under "auto" they
+        take effect only if permutations are used.
+    min_expected:
+        Smallest expected cell count for which null="auto" trusts the
+        asymptotic null. The default 5 is Cochran's rule; see
+        tests/test_asymptotic_null_validation.py for where it holds.
+    tail:
+        None (default) or "gpd". With "gpd", when fewer than 10 null values
+        reach the observed MI, a generalized Pareto distribution is fitted
+        to the upper tail of the permutation null and the p-value is
+        extrapolated from it (Knijnenburg et al. 2009), giving p-values far
+        below 1 / (n_surrogates + 1). The tail size starts at
+        min(250, n_surrogates // 4) and shrinks by 10 until a KS
+        goodness-of-fit test accepts the fit (p >= 0.05); the diagnostic is
+        reported in warnings. Negative (bounded-tail) shapes are replaced by
+        the exponential fit so no p-value is extrapolated to exactly 0. If
+        no fit is accepted the empirical p-value is kept.
+    keep_null:
+        How much of the null distribution to retain. "full" (default) keeps
+        every null value. "sketch" keeps a uniform reservoir sample of at most
+        sketch_size values. "none" keeps nothing. Every mode tracks the
+        running exceedance count, the count below the observed MI and the
+        running mean/variance, so p_value and power_estimate are identical
+        across modes; only null_distribution differs. tail="gpd" needs
+        "full" or "sketch" (the sketch fit is noted in warnings).
+    sketch_size:
+        Reservoir size for keep_null="sketch".
+    **kwargs:
+        Estimator parameters passed to ITPU.mutual_info() (bins=64 for
+        "hist", k=5 for "ksg").
 
     Returns
     -------
@@ -56,46 +147,165 @@ def surrogate_test(
             Empirical permutation p-value:
             (sum(null >= mi_observed) + 1) / (n_surrogates + 1).
             This formula is locked — do not substitute an alternative.
+            Under stopping="sequential" the Besag-Clifford p-value is used
+            instead when sampling stops early: h / n_used after h
+            exceedances, or the conservative bound
+            (exceedances + remaining + 1) / (n_surrogates + 1) when the
+            result is already significant. Both are valid under the
+            stopping rule; a run that reaches n_surrogates uses the locked
+            formula unchanged.
         n_surrogates : int
-            Number of surrogates used.
+            Number of surrogates actually used.
         estimator : str
             The MI estimator used ("hist" or "ksg").
         null_distribution : np.ndarray, shape (n_surrogates,)
-            MI values computed under the null (x vs resampled y).
+            MI values computed under the null (x vs resampled y). A
+            reservoir sample with keep_null="sketch", empty with "none".
         power_estimate : float
             Proxy for power: proportion of null distribution below mi, i.e.
             mean(null < mi). This is not a formal power analysis.
         warnings : list[str]
             Diagnostic messages. Non-empty if mi is below the null mean.
+        stopping : str
+            The stopping rule applied, e.g. "fixed" or
+            "sequential(h=10, alpha=0.05)".
+        null : str
+            "permutation" or "asymptotic" — the null actually used. With
+            "asymptotic", null_distribution is empty, n_surrogates is 0 and
+            power_estimate is the chi-squared CDF at the observed G.
+        null_mean, null_std : float
+            Running mean and standard deviation of all null values drawn.
     """
     x = np.asarray(x).ravel()
     y = np.asarray(y).ravel()
+    if stopping not in ("fixed", "sequential"):
+        raise ValueError(f"Unknown stopping: {stopping!r}. Use 'fixed' or 'sequential'.")
+    if surrogate_type not in ("shuffle", "block", "iaaft", "table"):
+        raise ValueError(
+            f"Unknown surrogate_type: {surrogate_type!r}. "
+            f"Use 'shuffle', 'block', 'iaaft', or 'table'."
+        )
+    if surrogate_type == "table" and method != "hist":
+        raise ValueError("surrogate_type='table' is only available for method='hist'.")
+    if transform not in (None, "rank"):
+        raise ValueError(f"Unknown transform: {transform!r}. Use None or 'rank'.")
+    if tail not in (None, "gpd"):
+        raise ValueError(f"Unknown tail: {tail!r}. Use None or 'gpd'.")
+    if keep_null not in ("full", "sketch", "none"):
+        raise ValueError(f"Unknown keep_null: {keep_null!r}. Use 'full', 'sketch', or 'none'.")
+    if tail == "gpd" and keep_null == "none":
+        raise ValueError("tail='gpd' needs null values; use keep_null='full' or 'sketch'.")
+    if null not in ("permutation", "asymptotic", "auto"):
+        raise ValueError(f"Unknown null: {null!r}. Use 'permutation', 'asymptotic', or 'auto'.")
+    if null != "permutation" and method != "hist":
+        raise ValueError(f"null={null!r} is only available for method='hist'.")
+    if null == "asymptotic":
+        ignored = [
+            name for name, used in (
+                ("stopping", stopping != "fixed"),
+                ("tail", tail is not None),
+                ("keep_null", keep_null != "full"),
+            ) if used
+        ]
+        if ignored:
+            raise ValueError(
+                f"{', '.join(ignored)} only apply to permutation nulls; "
+                f"null='asymptotic' draws no surrogates."
+            )
+    if stopping == "sequential" and h < 1:
+        raise ValueError("h must be a positive integer.")
+    if null_registry is not None:
+        check_shareable(transform, surrogate_type)
+    if transform == "rank":
+        rng = np.random.default_rng(rng)  # also breaks ties in the ranks
+        x = rank_transform(x, rng)
+        y = rank_transform(y, rng)
 
     sdk = ITPU(device="software")
-    mi_observed = sdk.mutual_info(x, y, method=method)
+    if surrogate_type == "table":
+        # Observed MI from the same (occupied-cell) table the null is drawn for.
+        joint = _occupied_joint(x, y, int(kwargs.get("bins", 64)))
+        mi_observed = EstimatorValue(float(mi_from_joint(joint)), "hist")
+    else:
+        mi_observed = sdk.mutual_info(x, y, method=method, **kwargs)
 
-    if surrogate_type == "shuffle":
-        surrogates = shuffle_surrogate(y, n_surrogates=n_surrogates, rng=rng)
-    elif surrogate_type == "block":
-        block_size = max(1, len(x) // 20)
-        surrogates = block_bootstrap_surrogate(
-            y, block_size=block_size, n_surrogates=n_surrogates, rng=rng
+    warning_messages = []
+    if null != "permutation":
+        bins = int(kwargs.get("bins", 64))
+        g_stat, df, smallest = _g_test(x, y, bins)
+        if null == "asymptotic" or smallest >= min_expected:
+            return SurrogateResult(
+                mi=mi_observed,
+                p_value=float(stats.chi2.sf(g_stat, df)) if df > 0 else 1.0,
+                n_surrogates=0,
+                estimator=method,
+                power_estimate=float(stats.chi2.cdf(g_stat, df)) if df > 0 else 0.0,
+                null="asymptotic",
+            )
+        warning_messages.append(
+            f"Asymptotic null not used: smallest expected cell count {smallest:.2f} "
+            f"< min_expected={min_expected}; fell back to permutations."
         )
-    elif surrogate_type == "iaaft":
-        surrogates = iaaft_surrogate(y, n_surrogates=n_surrogates, rng=rng)
+
+    rng = np.random.default_rng(rng)
+    # Spawning leaves rng's stream untouched, so sketching never changes the null.
+    # Generator.spawn needs numpy >= 1.25; spawning the seed sequence gives the
+    # same child stream on every supported numpy.
+    sketch_rng = (
+        np.random.default_rng(rng.bit_generator._seed_seq.spawn(1)[0])
+        if keep_null == "sketch" else None
+    )
+    if null_registry is not None:
+        shared = null_registry.get(
+            method, len(x), n_surrogates, surrogate_type, transform, **kwargs
+        )
+        null_stream = iter(shared.tolist())
+    elif surrogate_type == "table":
+        null_stream = _table_null_stream(joint, n_surrogates, rng)
     else:
-        raise ValueError(f"Unknown surrogate_type: {surrogate_type!r}. Use 'shuffle', 'block', or 'iaaft'.")
+        null_stream = _null_stream(x, y, method, surrogate_type, n_surrogates, rng, kwargs)
 
-    null_distribution = np.array([
-        sdk.mutual_info(x, surrogates[i], method=method)
-        for i in range(n_surrogates)
-    ])
+    observed = float(mi_observed)
+    summary = _NullSummary(observed, keep_null, n_surrogates, sketch_size, sketch_rng)
+    p_value = None
+    if stopping == "fixed":
+        for value in null_stream:
+            summary.add(value)
+        stopping_rule = "fixed"
+    else:
+        # Exceedance count at which p can no longer fall to alpha or below:
+        # (g + 1) / (n_surrogates + 1) > alpha  <=>  g >= h_alpha.
+        h_alpha = math.floor(alpha * (n_surrogates + 1)) + 1
+        h_stop = min(h, h_alpha)
+        for value in null_stream:
+            summary.add(value)
+            remaining = n_surrogates - summary.n
+            if not remaining:
+                break
+            if summary.n_exceed >= h_stop:
+                p_value = summary.n_exceed / summary.n
+                break
+            if (summary.n_exceed + remaining + 1) <= alpha * (n_surrogates + 1):
+                p_value = (summary.n_exceed + remaining + 1) / (n_surrogates + 1)
+                break
+        stopping_rule = f"sequential(h={h}, alpha={alpha})"
+    if p_value is None:
+        p_value = (summary.n_exceed + 1) / (n_surrogates + 1)
+    p_value = float(p_value)
+    n_surrogates = summary.n
+    null_distribution = summary.values()
 
-    p_value = float((np.sum(null_distribution >= mi_observed) + 1) / (n_surrogates + 1))
-    power_estimate = float(np.mean(null_distribution < mi_observed))
+    if tail == "gpd" and summary.n_exceed < _GPD_MAX_EXCEEDANCES:
+        tail_p, message = _gpd_tail_p(null_distribution, observed)
+        if tail_p is not None and keep_null == "sketch":
+            message += f" Fitted on a {len(null_distribution)}-value reservoir sketch."
+        warning_messages.append(message)
+        if tail_p is not None:
+            p_value = tail_p
 
-    warning_messages = []
-    if mi_observed < np.mean(null_distribution):
+    power_estimate = summary.n_below / summary.n if summary.n else 0.0
+
+    if observed < summary.mean:
         warning_messages.append(
             "Observed MI below null mean — possible estimator bias or insufficient sample size."
         )
@@ -108,4 +318,322 @@ def surrogate_test(
         null_distribution=null_distribution,
         power_estimate=power_estimate,
         warnings=warning_messages,
+        stopping=stopping_rule,
+        null_mean=summary.mean,
+        null_std=summary.std,
     )
+
+
+def surrogate_test_matrix(
+    X,
+    method: str = "hist",
+    n_surrogates: int = 1000,
+    surrogate_type: str = "shuffle",
+    fdr_alpha: float = 0.05,
+    rng=None,
+    transform: str | None = None,
+    null_registry: NullRegistry | None = None,
+    **kwargs,
+) -> SurrogateMatrixResult:
+    """Surrogate-test every channel pair of a montage with BH-FDR control.
+
+    Equivalent to calling surrogate_test(X[:, i], X[:, j]) for every pair
+    i < j, but with shared work: each surrogate is drawn once per channel
+    (surrogate s of channel j is reused against every channel i < j), and
+    for method="hist" every channel is binned once and all pairs sharing a
+    surrogate are evaluated with a single batched joint-histogram pass.
+    Benjamini-Hochberg correction is applied across the C*(C-1)/2 pairs.
+
+    Parameters
+    ----------
+    X:
+        2D array, shape (n_samples, n_channels).
+    method:
+        MI estimator to use. One of: "hist", "ksg".
+    n_surrogates:
+        Number of surrogates per channel.
+    surrogate_type:
+        "shuffle", "block", or "iaaft", as in surrogate_test().
+    fdr_alpha:
+        FDR level for the Benjamini-Hochberg correction across pairs.
+    rng:
+        Seed or numpy Generator for reproducibility.
+    transform:
+        None or "rank", as in surrogate_test(); applied per channel.
+    null_registry:
+        Optional NullRegistry. After a rank transform every pair has the same
+        shuffle null, so one registry null is compared against all pairs and
+        no per-channel surrogates are drawn. Requires transform="rank" and
+        surrogate_type="shuffle".
+    **kwargs:
+        Estimator parameters (bins=64 for "hist", k=5 for "ksg").
+
+    Returns
+    -------
+    SurrogateMatrixResult with (C, C) matrices of MI values, raw p-values
+    (locked formula (sum(null >= mi) + 1) / (n_surrogates + 1)), BH-corrected
+    p-values and rejections at fdr_alpha.
+    """
+    X = np.asarray(X)
+    if X.ndim != 2:
+        raise ValueError("X must be 2D with shape (n_samples, n_channels).")
+    if method not in ("hist", "ksg"):
+        raise ValueError(f"Unknown method: {method}")
+    if surrogate_type not in ("shuffle", "block", "iaaft"):
+        raise ValueError(f"Unknown surrogate_type: {surrogate_type!r}. Use 'shuffle', 'block', or 'iaaft'.")
+    if transform not in (None, "rank"):
+        raise ValueError(f"Unknown transform: {transform!r}. Use None or 'rank'.")
+    if null_registry is not None:
+        check_shareable(transform, surrogate_type)
+    channels = np.ascontiguousarray(X.T, dtype=np.float64)
+    rng = np.random.default_rng(rng)
+    if transform == "rank":
+        channels = np.array([rank_transform(c, rng) for c in channels])
+    n_channels = channels.shape[0]
+
+    if method == "hist":
+        bins = int(kwargs.get("bins", 64))
+        codes = hist_codes(channels, bins)
+
+        def pair_mi(j, y_surrogate):
+            cy = codes[j] if y_surrogate is None else hist_codes(y_surrogate, bins)
+            return mi_from_codes(codes[:j], cy, bins)
+    else:
+        k = int(kwargs.get("k", 5))
+
+        def pair_mi(j, y_surrogate):
+            y = channels[j] if y_surrogate is None else y_surrogate
+            return np.array([
+                ksg_mi_estimate(channels[i], y, k=k, clip_zero=False)[0]
+                for i in range(j)
+            ])
+
+    # Column j of the upper triangle holds pairs (i, j) for i < j; y = channel j.
+    mi = np.full((n_channels, n_channels), np.nan)
+    n_exceed = np.zeros((n_channels, n_channels), dtype=np.int64)
+    for j in range(1, n_channels):
+        mi[:j, j] = pair_mi(j, None)
+    if null_registry is not None:
+        null = np.sort(null_registry.get(
+            method, channels.shape[1], n_surrogates, surrogate_type, transform, **kwargs
+        ))
+        for j in range(1, n_channels):
+            n_exceed[:j, j] = n_surrogates - np.searchsorted(null, mi[:j, j], side="left")
+        n_surrogates_to_draw = 0
+    else:
+        n_surrogates_to_draw = n_surrogates
+    # A shuffled channel has the same range, so its codes are the shuffled codes.
+    shuffle_codes = method == "hist" and surrogate_type == "shuffle"
+    for _ in range(n_surrogates_to_draw):
+        for j in range(1, n_channels):
+            if shuffle_codes:
+                null = mi_from_codes(codes[:j], rng.permutation(codes[j]), bins)
+            else:
+                null = pair_mi(j, _make_surrogates(channels[j], surrogate_type, 1, rng)[0])
+            n_exceed[:j, j] += null >= mi[:j, j]
+
+    iu = np.triu_indices(n_channels, k=1)
+    p_upper = (n_exceed[iu] + 1) / (n_surrogates + 1)
+    bh = benjamini_hochberg(p_upper, alpha=fdr_alpha)
+
+    def symmetric(values, fill):
+        out = np.full((n_channels, n_channels), fill, dtype=np.asarray(values).dtype)
+        out[iu] = values
+        out.T[iu] = values
+        return out
+
+    return SurrogateMatrixResult(
+        mi=symmetric(mi[iu], np.nan),
+        p_values=symmetric(p_upper, np.nan),
+        corrected_p_values=symmetric(bh["corrected_p_values"], np.nan),
+        rejected=symmetric(bh["rejected"], False),
+        n_surrogates=n_surrogates,
+        estimator=method,
+        fdr_alpha=fdr_alpha,
+    )
+
+
+def _g_test(x, y, bins):
+    """Williams-corrected G statistic, its df, and the smallest expected count.
+
+    Uses the occupied rows and columns of the same joint table as the hist
+    estimator, so G = 2 * N * MI exactly before the correction.
+    """
+    cx = hist_codes(x, bins)
+    cy = hist_codes(y, bins)
+    n = len(cx)
+    rows = np.bincount(cx, minlength=bins)
+    cols = np.bincount(cy, minlength=bins)
+    rows = rows[rows > 0]
+    cols = cols[cols > 0]
+    df = (len(rows) - 1) * (len(cols) - 1)
+    if df == 0:
+        return 0.0, 0, float(n)
+    g_stat = 2.0 * n * float(mi_from_codes(cx, cy, bins))
+    q = 1.0 + (n * np.sum(1.0 / rows) - 1.0) * (n * np.sum(1.0 / cols) - 1.0) / (6.0 * n * df)
+    smallest = float(rows.min()) * float(cols.min()) / n
+    return g_stat / q, df, smallest
+
+
+class _NullSummary:
+    """Streaming summary of null MI values against one observed value.
+
+    Counts exceedances (null >= observed) and values below it, tracks the
+    mean and variance with Welford's update, and retains values according
+    to keep_null: all of them in a preallocated array ("full"), a uniform
+    reservoir sample (Algorithm R, "sketch"), or none.
+    """
+
+    def __init__(self, observed, keep_null, capacity, sketch_size, rng=None):
+        self.observed = observed
+        self.keep_null = keep_null
+        self.n = 0
+        self.n_exceed = 0
+        self.n_below = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        if keep_null == "full":
+            self._values = np.empty(capacity, dtype=float)
+        elif keep_null == "sketch":
+            self._values = np.empty(min(capacity, sketch_size), dtype=float)
+            self._rng = np.random.default_rng(rng)
+        else:
+            self._values = np.empty(0, dtype=float)
+
+    def add(self, value):
+        self.n += 1
+        self.n_exceed += value >= self.observed
+        self.n_below += value < self.observed
+        delta = value - self._mean
+        self._mean += delta / self.n
+        self._m2 += delta * (value - self._mean)
+        if self.keep_null == "full":
+            self._values[self.n - 1] = value
+        elif self.keep_null == "sketch":
+            size = len(self._values)
+            if self.n <= size:
+                self._values[self.n - 1] = value
+            else:
+                slot = self._rng.integers(0, self.n)
+                if slot < size:
+                    self._values[slot] = value
+
+    @property
+    def mean(self):
+        return self._mean if self.n else float("nan")
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / (self.n - 1))) if self.n > 1 else float("nan")
+
+    def values(self):
+        return self._values[: min(self.n, len(self._values))]
+
+
+_GPD_MAX_EXCEEDANCES = 10
+_GPD_MIN_TAIL = 10
+
+
+def _gpd_tail_p(null_distribution, observed):
+    """Generalized-Pareto tail extrapolation of P(null >= observed).
+
+    Returns (p_value or None, diagnostic message). The threshold sits midway
+    between the n_tail-th and (n_tail+1)-th largest null values; the fit
+    uses the excesses over it with location fixed at 0 and shape >= 0.
+    """
+    null_sorted = np.sort(np.asarray(null_distribution, dtype=float))[::-1]
+    n = len(null_sorted)
+    n_tail = min(250, n // 4)
+    n_exceed = int(np.sum(null_sorted >= observed))
+    best_gof = None
+    while n_tail >= max(_GPD_MIN_TAIL, n_exceed + 1):
+        threshold = 0.5 * (null_sorted[n_tail - 1] + null_sorted[n_tail])
+        excesses = null_sorted[:n_tail] - threshold
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            shape, _, scale = stats.genpareto.fit(excesses, floc=0.0)
+            if shape < 0.0:
+                # A bounded tail would assign p = 0 beyond its endpoint; use
+                # the exponential (shape 0) fit instead, which is conservative.
+                shape, scale = 0.0, float(np.mean(excesses))
+            gof = stats.kstest(excesses, stats.genpareto(shape, 0.0, scale).cdf).pvalue
+        best_gof = gof if best_gof is None else max(best_gof, gof)
+        if gof >= 0.05:
+            sf = stats.genpareto.sf(observed - threshold, shape, 0.0, scale)
+            p_value = float(n_tail / n * sf)
+            return p_value, (
+                f"GPD tail fit: p={p_value:.3g} from {n_tail} exceedances over "
+                f"threshold {threshold:.4g} (shape={shape:.3f}, scale={scale:.3g}, "
+                f"KS goodness-of-fit p={gof:.3f})."
+            )
+        n_tail -= 10
+    if best_gof is None:
+        return None, (
+            f"GPD tail fit skipped: {n} surrogates are too few for a "
+            f"{_GPD_MIN_TAIL}-point tail; empirical p-value kept."
+        )
+    return None, (
+        f"GPD tail fit rejected at every tail size (best KS goodness-of-fit "
+        f"p={best_gof:.3f}); empirical p-value kept."
+    )
+
+
+def _null_stream(x, y, method, surrogate_type, n_surrogates, rng, kwargs):
+    """Yield null MI values as plain floats, one surrogate at a time.
+
+    Calls the estimator kernels directly (no EstimatorValue per surrogate).
+    For method="hist" x is binned once; shuffle surrogates permute y's codes
+    instead of re-binning, which draws the same permutations as
+    shuffle_surrogate(). Kernel temporaries come from one Workspace.
+    """
+    rng = np.random.default_rng(rng)
+    work = Workspace()
+    if method == "hist":
+        bins = int(kwargs.get("bins", 64))
+        cx = hist_codes(x, bins)
+        if surrogate_type == "shuffle":
+            cy = hist_codes(y, bins)
+            for _ in range(n_surrogates):
+                yield float(mi_from_codes(cx, rng.permutation(cy), bins, work=work))
+            return
+        cy = np.empty(len(y), dtype=np.intp)
+        for _ in range(n_surrogates):
+            surrogate = _make_surrogates(y, surrogate_type, 1, rng)[0]
+            hist_codes(surrogate, bins, out=cy, work=work)
+            yield float(mi_from_codes(cx, cy, bins, work=work))
+    elif method == "ksg":
+        k = int(kwargs.get("k", 5))
+        for _ in range(n_surrogates):
+            surrogate = _make_surrogates(y, surrogate_type, 1, rng)[0]
+            yield ksg_mi_estimate(x, surrogate, k=k, clip_zero=False, work=work)[0]
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+
+def _occupied_joint(x, y, bins):
+    """Joint bin counts of (x, y) restricted to occupied rows and columns."""
+    cx = hist_codes(x, bins)
+    cy = hist_codes(y, bins)
+    joint = np.bincount(cx * bins + cy, minlength=bins * bins).reshape(bins, bins)
+    return joint[joint.sum(axis=1) > 0][:, joint.sum(axis=0) > 0]
+
+
+def _table_null_stream(joint, n_surrogates, rng, batch_size=1024):
+    """Yield null MI values of random tables with the marginals of joint."""
+    rng = np.random.default_rng(rng)
+    rows, cols = joint.sum(axis=1), joint.sum(axis=0)
+    for start in range(0, n_surrogates, batch_size):
+        count = min(batch_size, n_surrogates - start)
+        yield from mi_from_joint(table_surrogate(rows, cols, count, rng)).tolist()
+
+
+def _make_surrogates(y, surrogate_type, n_surrogates, rng):
+    """Draw n_surrogates resampled copies of y, shape (n_surrogates, len(y))."""
+    if surrogate_type == "shuffle":
+        return shuffle_surrogate(y, n_surrogates=n_surrogates, rng=rng)
+    if surrogate_type == "block":
+        block_size = max(1, len(y) // 20)
+        return block_bootstrap_surrogate(
+            y, block_size=block_size, n_surrogates=n_surrogates, rng=rng
+        )
+    return iaaft_surrogate(y, n_surrogates=n_surrogates, rng=rng)
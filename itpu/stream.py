@@ -0,0 +1,357 @@
+# itpu/stream.py
+"""
+asyncio streaming pipeline: sources -> windowed MI -> sinks.
+
+Acquisition code (amplifier drivers, socket readers) is usually async, while
+the MI kernels are blocking NumPy calls. This module connects the two:
+
+- source adapters turn iterables, async iterables or a simulated EEG
+  amplifier into async iterators of Chunk objects;
+- stages (StreamingMIStage) run their compute in an executor so the event
+  loop keeps serving I/O;
+- every hop between steps goes through a BoundedQueue whose policy decides
+  what a slow consumer costs: "block" applies backpressure to the producer,
+  "drop_oldest"/"drop_newest" discard chunks, "coalesce" merges them;
+- sinks implement the Sink protocol (an async send()).
+
+run_pipeline() wires these together and returns PipelineStats with
+throughput, drop counts and end-to-end latency percentiles.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional, Protocol
+
+import numpy as np
+
+from itpu.data import EEGSimulator
+from itpu.utils.streaming import StreamingMI
+
+POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+
+@dataclass
+class Chunk:
+    """A block of multichannel samples moving through the pipeline."""
+
+    data: np.ndarray  # (channels, n_samples)
+    start: int  # index of the first sample in the stream
+    created: float = field(default_factory=time.perf_counter)
+
+    @property
+    def n_samples(self) -> int:
+        return self.data.shape[1]
+
+    def merge(self, other: "Chunk") -> "Chunk":
+        """Concatenate a later chunk onto this one (keeps the older timestamp)."""
+        return Chunk(np.concatenate([self.data, other.data], axis=1), self.start, self.created)
+
+
+@dataclass
+class MIUpdate:
+    """MI of one completed window, as emitted by StreamingMIStage."""
+
+    end: int  # index one past the last sample of the window
+    values: np.ndarray  # (n_pairs,) MI in nats
+    created: float  # creation time of the oldest chunk that fed this update
+
+
+@dataclass
+class PipelineStats:
+    """Counters and latencies collected by run_pipeline()."""
+
+    n_chunks: int = 0
+    n_samples: int = 0
+    n_outputs: int = 0
+    n_dropped: int = 0
+    n_coalesced: int = 0
+    wall_time_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Source samples per second of wall time."""
+        return self.n_samples / self.wall_time_s if self.wall_time_s > 0 else float("nan")
+
+    @property
+    def latency_p50(self) -> float:
+        return float(np.percentile(self.latencies_ms, 50)) if self.latencies_ms else float("nan")
+
+    @property
+    def latency_p99(self) -> float:
+        return float(np.percentile(self.latencies_ms, 99)) if self.latencies_ms else float("nan")
+
+
+class Sink(Protocol):
+    """Anything with an async send(item); close() is optional."""
+
+    async def send(self, item: Any) -> None: ...
+
+
+class ListSink:
+    """Sink that collects items in a list (optionally after a fixed delay)."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.items: list = []
+        self.delay_s = delay_s
+
+    async def send(self, item: Any) -> None:
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        self.items.append(item)
+
+
+class BoundedQueue:
+    """
+    asyncio queue with a fixed capacity and an overflow policy.
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of queued items.
+    policy:
+        What put() does when the queue is full:
+        "block" waits for space (backpressure), "drop_oldest" discards the
+        head, "drop_newest" discards the incoming item, "coalesce" merges
+        the incoming item into the newest queued one (Chunk.merge, or
+        latest-value replacement for items without merge()).
+    max_merge_samples:
+        With "coalesce", a merged Chunk longer than this keeps only its most
+        recent samples (the rest count as dropped). None = no limit.
+    """
+
+    def __init__(self, maxsize: int = 8, policy: str = "block", max_merge_samples: Optional[int] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_merge_samples = max_merge_samples
+        self.n_dropped = 0
+        self.n_coalesced = 0
+        self._items: deque = deque()
+        self._changed = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: Any) -> None:
+        while len(self._items) >= self.maxsize:
+            if self.policy == "block":
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            if self.policy == "drop_oldest":
+                self._items.popleft()
+                self.n_dropped += 1
+            elif self.policy == "drop_newest":
+                self.n_dropped += 1
+                return
+            else:
+                self._items[-1] = self._coalesce(self._items[-1], item)
+                self.n_coalesced += 1
+                self._notify()
+                return
+        self._items.append(item)
+        self._notify()
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._changed.clear()
+            await self._changed.wait()
+        item = self._items.popleft()
+        self._notify()
+        return item
+
+    def _notify(self) -> None:
+        self._changed.set()
+
+    def _coalesce(self, old: Any, new: Any) -> Any:
+        if not hasattr(old, "merge"):
+            return new
+        merged = old.merge(new)
+        limit = self.max_merge_samples
+        if isinstance(merged, Chunk) and limit is not None and merged.n_samples > limit:
+            cut = merged.n_samples - limit
+            merged = Chunk(merged.data[:, cut:], merged.start + cut, merged.created)
+            self.n_dropped += 1
+        return merged
+
+
+class StreamingMIStage:
+    """
+    Windowing + MI stage: feeds chunks to a StreamingMI session in an executor.
+
+    Parameters
+    ----------
+    channels, window, hop, bins, k, ranges:
+        As for StreamingMI.
+    executor:
+        concurrent.futures executor for the compute; None uses the loop's
+        default thread pool.
+    """
+
+    def __init__(self, channels: int, window: int, hop: int, bins: Optional[int] = None,
+                 k: Optional[int] = None, ranges=None, executor=None) -> None:
+        self.session = StreamingMI(channels, window, hop, bins=bins, k=k, ranges=ranges)
+        self.executor = executor
+
+    async def process(self, chunk: Chunk) -> List[MIUpdate]:
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self.executor, self.session.push, chunk.data)
+        if not len(rows):
+            return []
+        # Window ends in session coordinates, shifted to stream indices (they
+        # differ once upstream queues have dropped chunks).
+        n_seen = self.session.n_seen
+        last_end = n_seen - (n_seen - self.session.window) % self.session.hop
+        ends = last_end - self.session.hop * np.arange(len(rows))[::-1]
+        ends += chunk.start + chunk.n_samples - n_seen
+        return [MIUpdate(int(e), row, chunk.created) for e, row in zip(ends, rows)]
+
+
+# --------------------------------------------------------------------------- #
+# Sources
+# --------------------------------------------------------------------------- #
+async def aiter_source(iterable) -> AsyncIterator[Chunk]:
+    """
+    Adapt a sync or async iterable of (channels, n_samples) arrays or Chunks.
+
+    Sync iterables are advanced in the default executor so a blocking driver
+    read does not stall the event loop.
+    """
+    start = 0
+    if hasattr(iterable, "__aiter__"):
+        async for item in iterable:
+            chunk = item if isinstance(item, Chunk) else Chunk(np.asarray(item), start)
+            start = chunk.start + chunk.n_samples
+            yield chunk
+        return
+    loop = asyncio.get_running_loop()
+    it = iter(iterable)
+    end = object()
+    while True:
+        item = await loop.run_in_executor(None, next, it, end)
+        if item is end:
+            return
+        chunk = item if isinstance(item, Chunk) else Chunk(np.asarray(item), start)
+        start = chunk.start + chunk.n_samples
+        yield chunk
+
+
+async def simulated_source(
+    n_chunks: int,
+    chunk_s: float = 0.04,
+    n_channels: int = 8,
+    sample_rate: int = 250,
+    realtime: bool = True,
+    sim: Optional[EEGSimulator] = None,
+) -> AsyncIterator[Chunk]:
+    """
+    Local stand-in for an amplifier driver, backed by EEGSimulator.
+
+    Yields n_chunks chunks of chunk_s seconds; with realtime=True each chunk
+    is released at its wall-clock due time, otherwise as fast as possible.
+    """
+    sim = sim or EEGSimulator(n_channels=n_channels, sample_rate=sample_rate)
+    t0 = time.perf_counter()
+    start = 0
+    for i in range(n_chunks):
+        if realtime:
+            await asyncio.sleep(max(0.0, t0 + (i + 1) * chunk_s - time.perf_counter()))
+        else:
+            await asyncio.sleep(0)
+        data = sim.generate_sample(chunk_s)
+        yield Chunk(data, start)
+        start += data.shape[1]
+
+
+# --------------------------------------------------------------------------- #
+# Pipeline
+# --------------------------------------------------------------------------- #
+_END = object()
+
+
+async def run_pipeline(
+    source,
+    stages,
+    sink: Sink,
+    maxsize: int = 8,
+    policy: str = "block",
+    max_merge_samples: Optional[int] = None,
+) -> PipelineStats:
+    """
+    Run source -> stages -> sink with a BoundedQueue in front of each step.
+
+    Parameters
+    ----------
+    source:
+        Async iterator of Chunks (see aiter_source, simulated_source).
+    stages:
+        Sequence of objects with `async process(item) -> list of outputs`.
+    sink:
+        Receives every output of the last stage.
+    maxsize, policy, max_merge_samples:
+        Configuration of every inter-step queue (see BoundedQueue).
+
+    Returns
+    -------
+    PipelineStats; latencies are measured from chunk creation at the source
+    to delivery at the sink.
+    """
+    stages = list(stages)
+    queues = [BoundedQueue(maxsize, policy, max_merge_samples) for _ in range(len(stages) + 1)]
+    stats = PipelineStats()
+    t_start = time.perf_counter()
+
+    async def produce():
+        async for chunk in source:
+            stats.n_chunks += 1
+            stats.n_samples += chunk.n_samples
+            await queues[0].put(chunk)
+        await _put_end(queues[0])
+
+    async def run_stage(stage, q_in, q_out):
+        while True:
+            item = await q_in.get()
+            if item is _END:
+                await _put_end(q_out)
+                return
+            for out in await stage.process(item):
+                await q_out.put(out)
+
+    async def consume():
+        while True:
+            item = await queues[-1].get()
+            if item is _END:
+                return
+            await sink.send(item)
+            stats.n_outputs += 1
+            created = getattr(item, "created", None)
+            if created is not None:
+                stats.latencies_ms.append((time.perf_counter() - created) * 1e3)
+
+    tasks = [produce(), consume()]
+    tasks += [run_stage(st, queues[i], queues[i + 1]) for i, st in enumerate(stages)]
+    await asyncio.gather(*tasks)
+    close = getattr(sink, "close", None)
+    if close is not None:
+        await close()
+
+    stats.wall_time_s = time.perf_counter() - t_start
+    stats.n_dropped = sum(q.n_dropped for q in queues)
+    stats.n_coalesced = sum(q.n_coalesced for q in queues)
+    return stats
+
+
+async def _put_end(queue: BoundedQueue) -> None:
+    # The end marker must never be dropped or merged away.
+    while queue.qsize() >= queue.maxsize:
+        queue._changed.clear()
+        await queue._changed.wait()
+    queue._items.append(_END)
+    queue._notify()
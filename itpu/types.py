@@ -81,6 +81,14 @@ class SurrogateResult:
     warnings: list = field(default_factory=list)
     # Populated by external calibration routines; nan when not computed.
     ks_stat: float = float("nan")
+    # Stopping rule used to draw the null, e.g. "sequential(h=10, alpha=0.05)".
+    stopping: str = "fixed"
+    # Null used for the p-value: "permutation" or "asymptotic" (chi-squared).
+    null: str = "permutation"
+    # Running moments of every null value drawn, kept even when
+    # null_distribution is a sketch or empty (keep_null="sketch"/"none").
+    null_mean: float = float("nan")
+    null_std: float = float("nan")
 
     def __post_init__(self) -> None:
         if self.mi.estimator != self.estimator:
@@ -88,3 +96,27 @@ class SurrogateResult:
                 f"SurrogateResult estimator mismatch: mi was computed with "
                 f"'{self.mi.estimator}' but result claims '{self.estimator}'"
             )
+
+
+@dataclass
+class SurrogateMatrixResult:
+    """Return type of surrogate_test_matrix().
+
+    All matrices are (C, C), symmetric, and indexed by channel. Diagonal
+    entries are not tested: mi and p-value diagonals are nan and rejected
+    diagonals are False. corrected_p_values are Benjamini-Hochberg adjusted
+    across the C*(C-1)/2 off-diagonal pairs.
+    """
+
+    mi: np.ndarray
+    p_values: np.ndarray
+    corrected_p_values: np.ndarray
+    rejected: np.ndarray
+    n_surrogates: int
+    estimator: Literal["hist", "ksg"]
+    fdr_alpha: float = 0.05
+
+    @property
+    def n_rejected(self) -> int:
+        """Number of rejected pairs (each unordered pair counted once)."""
+        return int(np.triu(self.rejected, k=1).sum())
@@ -0,0 +1,204 @@
+# itpu/utils/changepoint.py
+"""
+Streaming MI derivative and change-point alarms (WITNESS_FLUX_DERIV in software).
+
+MIChangeDetector consumes MI readouts one update at a time — a scalar, or a
+(n_pairs,) row from StreamingMI.push() — and keeps O(1) state per series:
+a smoothed dMI/dt ("flux") and two-sided CUSUM or Page–Hinkley statistics.
+Thresholds are expressed in units of the null standard deviation, taken
+from a precomputed null via MIChangeDetector.from_null().
+"""
+from __future__ import annotations
+
+import numpy as np
+
+METHODS = ("cusum", "page-hinkley")
+
+
+class MIChangeDetector:
+    """
+    Online two-sided change detector for MI streams.
+
+    Each update standardises the MI value against the null,
+    z = (mi - mu0) / sigma0, and accumulates
+
+    - "cusum": g+ = max(0, g+ + z - k), g- = max(0, g- - z - k);
+    - "page-hinkley": cumulative deviations of z from its running mean
+      (minus k), compared with their running extremum.
+
+    An alarm fires when a statistic exceeds h; the series' statistics are
+    then reset. With i.i.d. null updates, k=0.5 and h=5 give an in-control
+    average run length of about 465 updates for CUSUM. Overlapping windows
+    make successive MI values correlated, which shortens that run length;
+    from_null(..., series=True) scales h by the null series' integrated
+    autocorrelation time to compensate.
+
+    Parameters
+    ----------
+    mu0, sigma0:
+        Null mean and standard deviation of the MI values (scalars or
+        per-series arrays).
+    k:
+        Drift allowance in sigma0 units (half the smallest shift to detect).
+    h:
+        Alarm threshold in sigma0 units (scalar or per series).
+    method:
+        "cusum" or "page-hinkley".
+    smoothing:
+        EWMA weight of the newest value in the smoothed MI level used for
+        the flux (1.0 = no smoothing).
+    dt:
+        Time between updates (e.g. hop / fs seconds); flux is in nats per
+        unit of dt.
+    """
+
+    def __init__(
+        self,
+        mu0,
+        sigma0,
+        k: float = 0.5,
+        h: float = 5.0,
+        method: str = "cusum",
+        smoothing: float = 0.2,
+        dt: float = 1.0,
+    ) -> None:
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        sigma0 = np.asarray(sigma0, dtype=np.float64)
+        if np.any(sigma0 <= 0):
+            raise ValueError("sigma0 must be positive")
+        if not 0.0 < smoothing <= 1.0:
+            raise ValueError("smoothing must be in (0, 1]")
+        self.mu0 = np.asarray(mu0, dtype=np.float64)
+        self.sigma0 = sigma0
+        self.k = float(k)
+        self.h = np.asarray(h, dtype=np.float64)
+        self.method = method
+        self.smoothing = float(smoothing)
+        self.dt = float(dt)
+        self.n_updates = 0
+        self.alarms: list[tuple[int, int, int]] = []
+        self.flux = None  # smoothed dMI/dt of the latest update; None before the first
+        self._level = None
+
+    @classmethod
+    def from_null(cls, null, series: bool = False, h: float = 5.0, **kwargs) -> "MIChangeDetector":
+        """
+        Build a detector whose mu0/sigma0 come from a precomputed null.
+
+        Parameters
+        ----------
+        null:
+            MI values under the no-change hypothesis, shape (n_null,) or
+            (n_null, n_series): e.g. SurrogateResult.null_distribution,
+            NullRegistry.get(...), or windowed MI of a baseline segment.
+        series:
+            True when null is an ordered MI series with the same window/hop
+            as the monitored stream (e.g. a baseline recording). h is then
+            multiplied by the integrated autocorrelation time tau of the
+            null, which keeps the CUSUM in-control run length of i.i.d.
+            updates (the random walk's variance grows by tau).
+        h:
+            Alarm threshold in sigma0 units before the series correction.
+        **kwargs:
+            Passed to MIChangeDetector (k, method, smoothing, dt).
+        """
+        null = np.asarray(null, dtype=np.float64)
+        if null.shape[0] < 2:
+            raise ValueError("null must contain at least 2 values")
+        h = np.asarray(h, dtype=np.float64)
+        if series:
+            h = h * integrated_autocorr(null)
+        return cls(null.mean(axis=0), null.std(axis=0, ddof=1), h=h, **kwargs)
+
+    def update(self, mi) -> np.ndarray:
+        """
+        Consume one MI readout (scalar or one value per series).
+
+        Returns
+        -------
+        np.ndarray of int8 with the shape of mi: +1 where an increase in MI
+        was detected, -1 for a decrease, 0 otherwise.
+        """
+        mi = np.asarray(mi, dtype=np.float64)
+        if self._level is None:
+            self._init_state(mi.shape)
+        z = (mi - self.mu0) / self.sigma0
+
+        prev = self._level
+        self._level = np.where(np.isnan(prev), mi, prev + self.smoothing * (mi - prev))
+        self.flux = np.where(np.isnan(prev), 0.0, (self._level - prev) / self.dt)
+
+        if self.method == "cusum":
+            self._g_pos = np.maximum(0.0, self._g_pos + z - self.k)
+            self._g_neg = np.maximum(0.0, self._g_neg - z - self.k)
+            up, down = self._g_pos, self._g_neg
+        else:
+            self._n += 1
+            self._mean += (z - self._mean) / self._n
+            self._m_pos += z - self._mean - self.k
+            self._m_neg += z - self._mean + self.k
+            self._min_pos = np.minimum(self._min_pos, self._m_pos)
+            self._max_neg = np.maximum(self._max_neg, self._m_neg)
+            up = self._m_pos - self._min_pos
+            down = self._max_neg - self._m_neg
+
+        alarm = np.where(up > self.h, 1, np.where(down > self.h, -1, 0)).astype(np.int8)
+        if alarm.any():
+            for idx in np.flatnonzero(alarm):
+                self.alarms.append((self.n_updates, int(idx), int(alarm.flat[idx])))
+            self._reset(alarm != 0)
+        self.n_updates += 1
+        return alarm
+
+    @property
+    def statistic(self) -> tuple[np.ndarray, np.ndarray]:
+        """Current (increase, decrease) detection statistics in sigma0 units."""
+        if self.method == "cusum":
+            return self._g_pos.copy(), self._g_neg.copy()
+        return self._m_pos - self._min_pos, self._max_neg - self._m_neg
+
+    def run(self, values) -> np.ndarray:
+        """Feed a (n_updates, ...) array of readouts; returns the stacked alarms."""
+        return np.stack([self.update(v) for v in np.asarray(values, dtype=np.float64)])
+
+    # ------------------------------------------------------------------ #
+    def _init_state(self, shape) -> None:
+        zeros = np.zeros(np.broadcast_shapes(shape, self.mu0.shape, self.sigma0.shape))
+        self._level = np.full_like(zeros, np.nan)
+        self.flux = zeros.copy()
+        self._g_pos = zeros.copy()
+        self._g_neg = zeros.copy()
+        self._n = zeros.copy()
+        self._mean = zeros.copy()
+        self._m_pos = zeros.copy()
+        self._m_neg = zeros.copy()
+        self._min_pos = zeros.copy()
+        self._max_neg = zeros.copy()
+
+    def _reset(self, where) -> None:
+        for name in ("_g_pos", "_g_neg", "_n", "_mean", "_m_pos", "_m_neg", "_min_pos", "_max_neg"):
+            setattr(self, name, np.where(where, 0.0, getattr(self, name)))
+
+
+def integrated_autocorr(values) -> np.ndarray:
+    """
+    Integrated autocorrelation time tau = 1 + 2 * sum(rho_lag) along axis 0.
+
+    The sum runs over lags up to n // 4 and stops at the first non-positive
+    autocorrelation (tau = 1 for uncorrelated values).
+    """
+    v = np.asarray(values, dtype=np.float64)
+    v = v - v.mean(axis=0)
+    n = v.shape[0]
+    var = (v * v).sum(axis=0)
+    tau = np.ones(v.shape[1:])
+    active = var > 0
+    for lag in range(1, n // 4 + 1):
+        rho = np.divide((v[lag:] * v[:-lag]).sum(axis=0), var,
+                        out=np.zeros_like(var), where=var > 0)
+        active = active & (rho > 0)
+        if not np.any(active):
+            break
+        tau = tau + 2.0 * np.where(active, rho, 0.0)
+    return tau
@@ -0,0 +1,226 @@
+# itpu/utils/streaming.py
+"""
+Stateful sliding-window MI for real-time use.
+
+StreamingMI owns a preallocated ring buffer of the most recent `window`
+samples of every channel. Each push() advances the buffer and returns MI
+only for the windows completed by that chunk (one every `hop` samples), so
+callers never concatenate or reslice their history.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+
+import numpy as np
+
+from itpu.kernels_sw.hist import hist_codes, update_counts
+from itpu.kernels_sw.ksg import SlidingKSG
+
+
+class StreamingMI:
+    """
+    Real-time all-pairs MI over a sliding window.
+
+    Histogram mode (bins=...) keeps, per channel pair, the joint counts of the
+    current window and running sums S = sum(n log n); a push updates them from
+    the entering and leaving samples only, and a completed window costs
+    O(n_pairs) to read out. Edges are fixed: pass `ranges`, or they are frozen
+    from the first complete window (later out-of-range samples are clipped
+    into the edge bins).
+
+    KSG mode (k=...) keeps one SlidingKSG per pair, so neighbour radii are
+    only recomputed around the samples that entered or left.
+
+    Parameters
+    ----------
+    channels:
+        Number of channels C; chunks are shaped (C, n_samples).
+    window:
+        Window length in samples.
+    hop:
+        Samples between consecutive windows.
+    bins, k:
+        Exactly one of histogram bin count or KSG neighbour count.
+    ranges:
+        (lo, hi) for all channels or a (C, 2) array of per-channel edges.
+    budget_ms:
+        Per-push latency budget; pushes exceeding it are counted in
+        `n_over_budget`. None disables the check.
+    latency_history:
+        Number of recent pushes kept for latency percentiles.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        window: int,
+        hop: int,
+        bins: int | None = None,
+        k: int | None = None,
+        ranges=None,
+        budget_ms: float | None = None,
+        latency_history: int = 1000,
+        resync_every: int = 1024,
+    ) -> None:
+        if channels < 2:
+            raise ValueError("channels must be at least 2")
+        if window <= 0 or hop <= 0:
+            raise ValueError("window and hop must be positive integers")
+        if (bins is None) == (k is None):
+            raise ValueError("Pass exactly one of bins (histogram) or k (KSG)")
+        self.channels = int(channels)
+        self.window = int(window)
+        self.hop = int(hop)
+        self.bins = bins
+        self.k = k
+        self.method = "hist" if bins is not None else "ksg"
+        self.budget_ms = budget_ms
+        self.resync_every = int(resync_every)
+        self.pairs = np.triu_indices(self.channels, 1)
+        self.n_pairs = len(self.pairs[0])
+
+        self._buf = np.zeros((self.channels, self.window), dtype=np.float64)
+        self._pos = 0
+        self.count = 0
+        self.n_seen = 0
+        self.n_over_budget = 0
+        self._latency = deque(maxlen=latency_history)
+        self._last = np.full(self.n_pairs, np.nan)
+        self._ranges = None if ranges is None else self._as_ranges(ranges)
+        self._codes = None
+        if self.method == "hist" and self._ranges is not None:
+            self._init_counts()
+        if self.method == "ksg":
+            self._ksg = [SlidingKSG(self.window, k=k) for _ in range(self.n_pairs)]
+
+    # ------------------------------------------------------------------ #
+    def push(self, chunk) -> np.ndarray:
+        """
+        Append a (C, n_samples) chunk.
+
+        Returns
+        -------
+        np.ndarray, shape (n_completed, n_pairs): MI (nats) of each window
+        completed by this chunk, oldest first, pairs ordered as `pairs`.
+        """
+        t0 = time.perf_counter()
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim != 2 or chunk.shape[0] != self.channels:
+            raise ValueError(f"chunk must have shape ({self.channels}, n_samples)")
+        out = []
+        start = 0
+        while start < chunk.shape[1]:
+            # Advance to the next window end (or the end of the chunk).
+            if self.n_seen < self.window:
+                to_end = self.window - self.n_seen
+            else:
+                to_end = self.hop - (self.n_seen - self.window) % self.hop
+            stop = min(chunk.shape[1], start + min(to_end, self.window))
+            self._append(chunk[:, start:stop])
+            start = stop
+            if self.n_seen >= self.window and (self.n_seen - self.window) % self.hop == 0:
+                out.append(self._readout())
+        elapsed_ms = (time.perf_counter() - t0) * 1e3
+        self._latency.append(elapsed_ms)
+        if self.budget_ms is not None and elapsed_ms > self.budget_ms:
+            self.n_over_budget += 1
+        if not out:
+            return np.empty((0, self.n_pairs))
+        self._last = out[-1]
+        return np.vstack(out)
+
+    def matrix(self, values=None) -> np.ndarray:
+        """Symmetric (C, C) matrix of `values` (default: latest window), NaN diagonal."""
+        values = self._last if values is None else np.asarray(values)
+        M = np.full((self.channels, self.channels), np.nan)
+        M[self.pairs] = values
+        M[self.pairs[1], self.pairs[0]] = values
+        return M
+
+    @property
+    def latency_p50(self) -> float:
+        """Median per-push latency (ms) over the recent history."""
+        return float(np.percentile(self._latency, 50)) if self._latency else float("nan")
+
+    @property
+    def latency_p99(self) -> float:
+        """99th-percentile per-push latency (ms) over the recent history."""
+        return float(np.percentile(self._latency, 99)) if self._latency else float("nan")
+
+    # ------------------------------------------------------------------ #
+    def _as_ranges(self, ranges) -> np.ndarray:
+        ranges = np.asarray(ranges, dtype=np.float64)
+        if ranges.shape == (2,):
+            ranges = np.tile(ranges, (self.channels, 1))
+        if ranges.shape != (self.channels, 2):
+            raise ValueError("ranges must be (lo, hi) or shaped (channels, 2)")
+        return ranges
+
+    def _bin(self, x) -> np.ndarray:
+        return np.stack([
+            hist_codes(x[c], self.bins, range=self._ranges[c]) for c in range(self.channels)
+        ])
+
+    def _init_counts(self) -> None:
+        b = self.bins
+        n = np.arange(self.window + 1, dtype=np.float64)
+        self._xlogx = n * np.log(np.where(n > 0, n, 1.0))
+        self._joint = np.zeros(self.n_pairs * b * b, dtype=np.int64)
+        self._marg = np.zeros(self.channels * b, dtype=np.int64)
+        self._s_joint = np.zeros(self.n_pairs)
+        self._s_marg = np.zeros(self.channels)
+        self._codes = np.zeros((self.channels, self.window), dtype=np.intp)
+        self._pair_offset = (np.arange(self.n_pairs) * b * b)[:, None]
+        self._chan_offset = (np.arange(self.channels) * b)[:, None]
+        self._n_updates = 0
+        if self.count:
+            # Edges were just frozen: bin the buffered window in one go.
+            order = (self._pos - self.count + np.arange(self.count)) % self.window
+            self._update_hist(self._buf[:, order], order, np.empty((self.channels, 0), np.intp))
+
+    def _append(self, x) -> None:
+        m = x.shape[1]
+        slots = (self._pos + np.arange(m)) % self.window
+        n_leave = max(0, m - (self.window - self.count))
+        if self._codes is not None:
+            leaving = self._codes[:, slots[m - n_leave:]]
+            self._update_hist(x, slots, leaving)
+        if self.method == "ksg":
+            for engine, i, j in zip(self._ksg, *self.pairs):
+                engine.push(x[i], x[j])
+        self._buf[:, slots] = x
+        self._pos = (self._pos + m) % self.window
+        self.count = min(self.window, self.count + m)
+        self.n_seen += m
+        if self.method == "hist" and self._codes is None and self.count == self.window:
+            self._ranges = np.column_stack([self._buf.min(axis=1), self._buf.max(axis=1)])
+            self._init_counts()
+
+    def _update_hist(self, x, slots, leaving) -> None:
+        b = self.bins
+        codes = self._bin(x)
+        self._codes[:, slots] = codes
+        i, j = self.pairs
+        t, d = update_counts(
+            self._marg, self._xlogx,
+            (codes + self._chan_offset).ravel(), (leaving + self._chan_offset).ravel(),
+        )
+        self._s_marg += np.bincount(t // b, weights=d, minlength=self.channels)
+        t, d = update_counts(
+            self._joint, self._xlogx,
+            (codes[i] * b + codes[j] + self._pair_offset).ravel(),
+            (leaving[i] * b + leaving[j] + self._pair_offset).ravel(),
+        )
+        self._s_joint += np.bincount(t // (b * b), weights=d, minlength=self.n_pairs)
+        self._n_updates += 1
+        if self._n_updates % self.resync_every == 0:
+            self._s_marg = self._xlogx[self._marg].reshape(self.channels, b).sum(axis=1)
+            self._s_joint = self._xlogx[self._joint].reshape(self.n_pairs, -1).sum(axis=1)
+
+    def _readout(self) -> np.ndarray:
+        if self.method == "ksg":
+            return np.array([engine.mi for engine in self._ksg])
+        n = self.count
+        i, j = self.pairs
+        return np.log(n) - (self._s_marg[i] + self._s_marg[j] - self._s_joint) / n
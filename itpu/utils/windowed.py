@@ -1,11 +1,19 @@
 # itpu/utils/windowed.py
 import numpy as np
 from itpu.sdk import ITPU
+from itpu.kernels_sw.hist import sliding_windowed_mi
+from itpu.kernels_sw.streaming import multiscale_windowed_mi
 
-def windowed_mi(x, y, window_size=2000, hop_size=400, bins=64, method="hist", **kwargs):
+def windowed_mi(x, y, window_size=2000, hop_size=400, bins=64, method="hist", edges="window", **kwargs):
     """
     Compute sliding-window MI across x,y.
     Returns (starts, mi_vals) where 'starts' are window start indices.
+
+    edges="window" (default) bins every window on its own [min, max];
+    edges="global" (hist only) bins all windows on the global [min, max] of
+    x and y: block-prefix histograms when hop_size divides window_size,
+    otherwise the incremental O(hop) sliding histogram. For several window
+    sizes at once use multiscale_windowed_mi().
     """
     x = np.asarray(x)
     y = np.asarray(y)
@@ -15,6 +23,14 @@ def windowed_mi(x, y, window_size=2000, hop_size=400, bins=64, method="hist", **
         raise ValueError("window_size and hop_size must be positive integers")
     if window_size > n:
         raise ValueError("window_size cannot exceed signal length")
+    if edges not in ("window", "global"):
+        raise ValueError(f"edges must be 'window' or 'global', got {edges!r}")
+    if edges == "global":
+        if method != "hist":
+            raise ValueError("edges='global' requires method='hist'")
+        if window_size % hop_size == 0:
+            return multiscale_windowed_mi(x, y, [window_size], hop_size, bins=bins)[window_size]
+        return sliding_windowed_mi(x, y, window_size=window_size, hop_size=hop_size, bins=bins)
 
     itpu = ITPU(device="software")
     starts = list(range(0, n - window_size + 1, hop_size))
@@ -25,3 +41,24 @@ def windowed_mi(x, y, window_size=2000, hop_size=400, bins=64, method="hist", **
         mi_vals[i] = itpu.mutual_info(x[s:e], y[s:e], method=method, bins=bins, **kwargs)
 
     return np.array(starts, dtype=int), mi_vals
+
+
+def windowed_mean(values, window_size=2000, hop_size=400):
+    """
+    Means of `values` over sliding windows via one prefix sum, O(1) per window.
+
+    Applied to local MI (ITPU.mutual_info(..., pointwise=True)) this gives an
+    approximate time-resolved MI from a single global estimation: densities
+    and neighbour counts come from the whole series rather than from each
+    window, so it tracks where dependence sits, not what a per-window
+    estimator would report.
+    Returns (starts, means) with the same window layout as windowed_mi().
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if window_size <= 0 or hop_size <= 0:
+        raise ValueError("window_size and hop_size must be positive integers")
+    if window_size > len(values):
+        raise ValueError("window_size cannot exceed signal length")
+    prefix = np.concatenate([[0.0], np.cumsum(values)])
+    starts = np.arange(0, len(values) - window_size + 1, hop_size)
+    return starts, (prefix[starts + window_size] - prefix[starts]) / window_size
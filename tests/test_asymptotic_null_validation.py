@@ -0,0 +1,78 @@
+# LOCKED THRESHOLDS — same KS gate (pvalue > 0.05, 400 trials) as
+# tests/test_surrogate_validation.py.
+"""Validity tests for surrogate_test(method="hist", null="asymptotic").
+
+Under independence the Williams-corrected G statistic 2*N*MI of the plug-in
+histogram estimator is asymptotically chi-squared with (bx-1)(by-1) degrees
+of freedom. These tests pin down where that approximation can replace
+permutations:
+
+- test_asymptotic_calibration_holds: with every expected cell count >= 5
+  (rank-transformed data, N=2000, bins=8: expected count 31.25), p-values
+  under H0 are uniform.
+
+- test_asymptotic_calibration_fails_below_threshold: with expected counts
+  ~1.9 (N=500, bins=16) the chi-squared approximation is visibly
+  miscalibrated. This is why null="auto" falls back to permutations below
+  min_expected.
+
+The KS threshold and trial count mirror the locked surrogate calibration
+gate and must not be adjusted post-hoc.
+"""
+from __future__ import annotations
+
+import numpy as np
+from scipy import stats
+
+from itpu.stats.surrogate_test import surrogate_test
+
+
+def _h0_p_values(n, bins, null, n_trials=400):
+    p_values = np.empty(n_trials)
+    for i in range(n_trials):
+        rng = np.random.default_rng(i)
+        x = rng.standard_normal(n)
+        y = rng.standard_normal(n)
+        result = surrogate_test(
+            x, y, method="hist", transform="rank", null=null, bins=bins
+        )
+        assert result.null == "asymptotic"
+        p_values[i] = result.p_value
+    return p_values
+
+
+def test_asymptotic_calibration_holds():
+    """Expected counts >= 5: p-values under H0 are Uniform[0, 1]."""
+    p_values = _h0_p_values(n=2000, bins=8, null="auto")
+    ks_result = stats.kstest(p_values, "uniform")
+    assert ks_result.pvalue > 0.05, (
+        f"Asymptotic p-values under H0 are not uniform (KS pvalue={ks_result.pvalue:.4f})."
+    )
+
+
+def test_asymptotic_calibration_fails_below_threshold():
+    """Expected counts ~1.9: the chi-squared approximation is miscalibrated."""
+    p_values = _h0_p_values(n=500, bins=16, null="asymptotic")
+    assert stats.kstest(p_values, "uniform").pvalue < 0.05
+
+
+def test_auto_falls_back_to_permutations_for_sparse_tables():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(500)
+    y = rng.standard_normal(500)
+    result = surrogate_test(
+        x, y, method="hist", n_surrogates=19, null="auto", rng=0, bins=16
+    )
+    assert result.null == "permutation"
+    assert result.n_surrogates == 19
+    assert any("fell back to permutations" in w for w in result.warnings)
+
+
+def test_asymptotic_detects_correlation():
+    rng = np.random.default_rng(42)
+    x = rng.standard_normal(500)
+    y = 0.6 * x + 0.4 * rng.standard_normal(500)
+    result = surrogate_test(x, y, method="hist", null="asymptotic", bins=8)
+    assert result.p_value < 0.05
+    assert result.n_surrogates == 0
+    assert len(result.null_distribution) == 0
@@ -0,0 +1,174 @@
+# tests/test_backends.py
+"""
+Backend conformance suite.
+
+Every registered, available backend must reproduce the software reference
+for each kernel it declares. A new backend passes by being registered
+before this module is collected.
+"""
+import numpy as np
+import pytest
+
+from itpu.backends import KERNELS, Backend, get_backend, list_backends
+from itpu.backends import base as backend_base
+from itpu.sdk import ITPU
+from itpu.types import EstimatorValue
+
+BACKENDS = [b.name for b in list_backends()]
+REF = get_backend("software")
+RTOL = 1e-9
+
+
+def _pairs(dtype, n=1500, batch=5, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(batch, n))
+    y = 0.6 * x + rng.normal(size=(batch, n))
+    y[1] = np.round(y[1])  # ties
+    x[2] = 1.0  # constant row
+    return x.astype(dtype), y.astype(dtype)
+
+
+def _cases(backend):
+    for kernel in backend.kernels:
+        for dtype in (np.float64, np.float32):
+            if backend.supports(kernel, dtype):
+                yield kernel, dtype
+
+
+@pytest.mark.filterwarnings("ignore:KSG")
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_matches_reference(name):
+    backend = get_backend(name)
+    param = {"hist": 32, "ksg": 4}
+    for kernel, dtype in _cases(backend):
+        X, Y = _pairs(dtype)
+        p = param[kernel.split("_")[0]]
+        if kernel.endswith("_batch"):
+            got = getattr(backend, kernel)(X, Y, p)
+            want = getattr(REF, kernel)(X, Y, p)
+            assert got.shape == (len(X),)
+        else:
+            got = getattr(backend, kernel)(X[0], Y[0], p)
+            want = getattr(REF, kernel)(X[0], Y[0], p)
+        atol = max(1e-12, backend.tolerance)
+        np.testing.assert_allclose(got, want, rtol=RTOL, atol=atol, err_msg=f"{name}:{kernel}:{dtype}")
+
+
+@pytest.mark.filterwarnings("ignore:KSG")
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_rejects_non_finite_input(name):
+    backend = get_backend(name)
+    param = {"hist": 32, "ksg": 4}
+    for kernel, dtype in _cases(backend):
+        X, Y = _pairs(dtype)
+        X[0, 7] = np.nan
+        p = param[kernel.split("_")[0]]
+        args = (X, Y, p) if kernel.endswith("_batch") else (X[0], Y[0], p)
+        with pytest.raises(ValueError):
+            getattr(backend, kernel)(*args)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_declarations(name):
+    backend = get_backend(name)
+    caps = backend.capabilities()
+    assert caps["available"] and set(caps["kernels"]) <= set(KERNELS)
+    assert backend.max_batch is None or backend.max_batch >= 1
+
+
+@pytest.mark.parametrize("device", BACKENDS + ["auto"])
+def test_itpu_results_agree_across_devices(device):
+    X, Y = _pairs(np.float64)
+    sdk, ref = ITPU(device=device), ITPU()
+    atol = max([1e-12] + [b.tolerance for b in sdk._chain])
+    for method, kw in [("hist", {"bins": 16}), ("ksg", {"k": 5})]:
+        mi = sdk.mutual_info(X[0], Y[0], method=method, **kw)
+        assert isinstance(mi, EstimatorValue) and mi.estimator == method
+        assert mi == pytest.approx(ref.mutual_info(X[0], Y[0], method=method, **kw), rel=RTOL, abs=atol)
+        np.testing.assert_allclose(
+            sdk.mutual_info_batch(X, Y, method=method, **kw),
+            [ref.mutual_info(x, y, method=method, **kw) for x, y in zip(X, Y)],
+            rtol=RTOL, atol=atol,
+        )
+
+
+class _HistOnly(Backend):
+    name = "hist-only"
+    priority = 100
+    kernels = ("hist_mi", "hist_mi_batch")
+    dtypes = ("float64",)
+    max_batch = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def hist_mi(self, x, y, bins):
+        self.calls.append("hist_mi")
+        return REF.hist_mi(x, y, bins)
+
+    def hist_mi_batch(self, X, Y, bins):
+        assert len(X) <= self.max_batch
+        self.calls.append("hist_mi_batch")
+        return REF.hist_mi_batch(X, Y, bins)
+
+
+def test_routing_falls_back_per_kernel(monkeypatch):
+    dummy = _HistOnly()
+    monkeypatch.setitem(backend_base._REGISTRY, dummy.name, dummy)
+    sdk = ITPU(device="hist-only")
+    x, y = _pairs(np.float64, batch=5)
+
+    caps = sdk.capabilities()
+    assert caps["routing"]["hist_mi"] == "hist-only"
+    assert caps["routing"]["ksg_mi"] == "software"
+
+    sdk.mutual_info(x[0], y[0], method="hist", bins=8)
+    sdk.mutual_info(x[0], y[0], method="ksg")  # not implemented -> software
+    sdk.mutual_info(x[0].astype(np.float32), y[0].astype(np.float32), method="hist", bins=8)  # dtype -> software
+    assert sdk.mutual_info_batch(x, y, method="hist", bins=8).shape == (5,)
+    assert dummy.calls == ["hist_mi", "hist_mi_batch", "hist_mi_batch", "hist_mi_batch"]
+
+    # "auto" prefers the highest-priority capable backend.
+    assert ITPU(device="auto").capabilities()["routing"]["hist_mi"] == "hist-only"
+
+
+def test_unknown_device_and_registration_errors():
+    with pytest.raises(NotImplementedError, match="Unknown device"):
+        ITPU(device="fpga")
+
+    class Bad(Backend):
+        name = "bad"
+        kernels = ("hist_mi", "fft")
+
+    with pytest.raises(ValueError, match="unknown kernels"):
+        backend_base.register_backend(Bad())
+    with pytest.raises(ValueError, match="already registered"):
+        backend_base.register_backend(get_backend("software").__class__())
+
+
+def test_fpga_sim_counts_exactly_and_reports_counters():
+    from itpu.backends import FPGASimBackend, FPGASimConfig
+
+    x, y = _pairs(np.float64, n=5000, batch=3)
+    x, y = x[:1], y[:1]
+    ref = REF.hist_mi(x[0], y[0], 64)
+
+    # 4-bit counters force many partial-histogram segments; counts stay exact.
+    sim = FPGASimBackend(FPGASimConfig(counter_bits=4, tile=32, sram_tiles=2))
+    mi = ITPU(device=sim).mutual_info(x[0], y[0], method="hist", bins=64)
+    assert abs(mi - ref) <= sim.tolerance
+    c = sim.last
+    assert c.segments == int(np.ceil(5000 / 15)) and c.passes == 2
+    assert c.n_samples == 5000 and c.bytes_in == 2 * 5000 * 2 * 4
+    assert c.total_cycles >= c.cycles["hist_build"] + c.cycles["hist_reduce"] + c.cycles["reduce_mi"]
+    assert 0 < c.occupancy <= 1 and c.samples_per_s > 0
+
+    # A slow link makes the pass DMA-bound.
+    slow = FPGASimBackend(FPGASimConfig(dma_gbps=0.1))
+    slow.hist_mi_batch(x, y, 64)
+    slow.hist_mi_batch(x, y, 64)
+    assert slow.last.stalls["dma"] > 0 and slow.last.gbps == pytest.approx(0.1, rel=0.05)
+    assert slow.counters.n_calls == 2 and slow.counters.total_cycles == 2 * slow.last.total_cycles
+
+    with pytest.raises(ValueError, match="lanes"):
+        FPGASimConfig(lanes=0)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from itpu.utils.changepoint import MIChangeDetector, integrated_autocorr
+from itpu.utils.streaming import StreamingMI
+from itpu.utils.windowed import windowed_mi
+
+
+def _coupling_switch(n=30000, switch=15000, rho1=0.2, rho2=0.8, seed=0):
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal(n)
+    noise = rng.standard_normal((2, n))
+    X = np.empty((2, n))
+    X[:, :switch] = rho1 * z[:switch] + np.sqrt(1 - rho1**2) * noise[:, :switch]
+    X[:, switch:] = rho2 * z[switch:] + np.sqrt(1 - rho2**2) * noise[:, switch:]
+    return X
+
+
+@pytest.mark.parametrize("method", ["cusum", "page-hinkley"])
+def test_detects_coupling_increase_within_one_window(method):
+    X = _coupling_switch()
+    starts, mi = windowed_mi(X[0], X[1], window_size=500, hop_size=50, bins=16, edges="global")
+    ends = starts + 500
+    det = MIChangeDetector.from_null(mi[ends <= 12000], series=True, method=method)
+    alarms = det.run(mi)
+    first = np.flatnonzero(alarms)[0]
+    assert 15000 < ends[first] <= 15500
+    assert alarms[first] == 1
+
+
+def test_streaming_rows_and_flux():
+    X = _coupling_switch()
+    session = StreamingMI(2, window=500, hop=50, bins=16, ranges=(-4, 4))
+    baseline, det, fired_at = [], None, None
+    for a in range(0, X.shape[1], 50):
+        for row in session.push(X[:, a:a + 50]):
+            if det is None:
+                baseline.append(row)
+                if len(baseline) == 200:
+                    det = MIChangeDetector.from_null(np.array(baseline), series=True, dt=0.2)
+            elif det.update(row)[0] == 1 and fired_at is None:
+                fired_at = session.n_seen
+                assert det.flux[0] > 0
+    assert 15000 < fired_at <= 15500
+
+
+def test_null_series_rarely_alarms():
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=(2, 200000))
+    _, mi = windowed_mi(x, y, window_size=500, hop_size=50, bins=16, edges="global")
+    det = MIChangeDetector.from_null(mi[:200], series=True)
+    det.run(mi)
+    assert len(det.alarms) <= 10  # ~4000 correlated updates
+    assert integrated_autocorr(rng.normal(size=5000)) == pytest.approx(1.0, abs=0.2)
+
+
+def test_scalar_updates_and_validation():
+    det = MIChangeDetector(0.0, 1.0, k=0.5, h=5.0)
+    assert det.flux is None  # readable before the first update
+    assert [int(det.update(3.0)) for _ in range(3)] == [0, 0, 1]
+    assert det.flux == 0.0
+    assert det.alarms == [(2, 0, 1)]
+    assert det.statistic[0] == 0.0  # reset after alarm
+    with pytest.raises(ValueError):
+        MIChangeDetector(0.0, 0.0)
+    with pytest.raises(ValueError):
+        MIChangeDetector(0.0, 1.0, method="ewma")
@@ -0,0 +1,84 @@
+# tests/test_command_queue.py
+import threading
+
+import numpy as np
+import pytest
+
+from itpu.command_queue import CommandQueue
+from itpu.sdk import ITPU
+from itpu.types import EstimatorValue
+
+
+def _data(m=12, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(m, n))
+    return x, 0.5 * x + rng.normal(size=(m, n))
+
+
+def test_submit_matches_mutual_info_and_coalesces():
+    X, Y = _data()
+    sdk = ITPU(max_batch=5, max_latency_ms=10_000)
+    futures = [sdk.submit(x, y, method="hist", bins=16) for x, y in zip(X, Y)]
+    futures.append(sdk.submit(X[0][:200], Y[0][:200], method="hist", bins=16))  # other length
+    futures.append(sdk.submit(X[0], Y[0], method="ksg", k=4))
+    sdk.flush()
+    assert all(f.done() for f in futures)
+
+    for f, x, y in zip(futures, X, Y):
+        value = f.result()
+        assert isinstance(value, EstimatorValue) and value.estimator == "hist"
+        assert value == pytest.approx(sdk.mutual_info(x, y, method="hist", bins=16), abs=1e-12)
+    assert futures[-1].result() == pytest.approx(sdk.mutual_info(X[0], Y[0], method="ksg", k=4), abs=1e-12)
+    # 12 same-shape hist commands in batches of at most 5, plus two singletons.
+    assert sorted(sdk.queue.batch_sizes) == [1, 1, 2, 5, 5]
+    assert sdk.queue.n_submitted == 14
+    sdk.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        sdk.submit(X[0], Y[0])
+
+
+def test_latency_bound_flushes_without_flush_call():
+    X, Y = _data(m=3)
+    sdk = ITPU(max_latency_ms=5)
+    futures = [sdk.submit(x, y, bins=8) for x, y in zip(X, Y)]
+    for f in futures:
+        assert np.isfinite(f.result(timeout=5))
+    assert sdk.queue.n_launches >= 1
+
+
+def test_concurrent_submitters():
+    X, Y = _data(m=200, n=256)
+    sdk = ITPU(max_latency_ms=1)
+    results = [None] * len(X)
+
+    def worker(rows):
+        for i in rows:
+            results[i] = sdk.submit(X[i], Y[i], bins=16).result(timeout=10)
+
+    threads = [threading.Thread(target=worker, args=(range(t, len(X), 8),)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    expected = [sdk.mutual_info(x, y, bins=16) for x, y in zip(X, Y)]
+    np.testing.assert_allclose(results, expected, atol=1e-12)
+    assert sdk.queue.n_launches < len(X)
+    sdk.close()
+
+
+def test_launch_errors_reach_every_future():
+    def launch(descriptor, xs, ys):
+        raise FloatingPointError("device fault")
+
+    queue = CommandQueue(launch, max_latency_ms=10_000)
+    futures = [queue.submit("d", i, i) for i in range(3)]
+    queue.flush()
+    for f in futures:
+        with pytest.raises(FloatingPointError, match="device fault"):
+            f.result()
+    queue.close()
+
+    with pytest.raises(ValueError):
+        CommandQueue(launch, max_batch=0)
+    with pytest.raises(ValueError, match="Unknown method"):
+        ITPU().submit(np.zeros(4), np.zeros(4), method="bogus")
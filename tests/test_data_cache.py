@@ -0,0 +1,63 @@
+# tests/test_data_cache.py
+import os
+
+import numpy as np
+import pytest
+
+from itpu.data import CachedDataset, build_csv_cache, load_eeg_eye_state, open_csv_cached
+
+
+def _write_csv(path, data, header=None):
+    np.savetxt(path, data, delimiter=",", fmt="%.6f", header=header or "", comments="")
+
+
+def test_cache_roundtrip_and_slicing(tmp_path):
+    rng = np.random.default_rng(0)
+    data = np.round(rng.normal(size=(1000, 5)), 6)
+    path = tmp_path / "rec.csv"
+    _write_csv(path, data, header="a,b,c,d,label")
+
+    cache = tmp_path / "cache"
+    build_csv_cache(str(path), str(cache), chunk_rows=97)  # chunks don't divide n_rows
+    ds = CachedDataset(str(cache))
+    assert ds.columns == ["a", "b", "c", "d", "label"] and len(ds) == 1000
+    np.testing.assert_array_equal(ds.read(), data)
+    np.testing.assert_array_equal(ds.read(["c", 0], start=10, stop=20), data[10:20, [2, 0]])
+    col = ds.column("b")
+    assert isinstance(col, np.memmap) and not col.flags.writeable
+    assert ds.read([1]).flags.f_contiguous
+    with pytest.raises(KeyError):
+        ds.column("missing")
+    with pytest.raises(IndexError):
+        ds.column(5)
+
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    path = tmp_path / "rec.csv"
+    _write_csv(path, np.arange(12.0).reshape(4, 3))
+    ds = open_csv_cached(str(path))
+    assert ds.columns == ["col0", "col1", "col2"]
+    built = os.path.getmtime(os.path.join(ds.cache_dir, "meta.json"))
+
+    assert open_csv_cached(str(path)).meta == ds.meta  # fresh: reused
+    assert os.path.getmtime(os.path.join(ds.cache_dir, "meta.json")) == built
+
+    _write_csv(path, np.arange(18.0).reshape(6, 3))
+    ds = open_csv_cached(str(path))
+    assert len(ds) == 6 and ds.read()[-1, -1] == 17.0
+    assert open_csv_cached(str(path), dtype=np.float32).dtype == np.float32
+
+
+def test_load_eeg_eye_state_uses_cache(tmp_path):
+    rng = np.random.default_rng(1)
+    data = np.column_stack([np.round(rng.normal(size=(50, 14)), 6), rng.integers(0, 2, 50)])
+    path = tmp_path / "eeg.csv"
+    _write_csv(path, data, header=",".join([f"ch{i}" for i in range(14)] + ["eyeDetection"]))
+    X, y, fallback = load_eeg_eye_state(str(path))
+    assert not fallback
+    np.testing.assert_array_equal(X, data[:, :14])
+    np.testing.assert_array_equal(y, data[:, 14])
+    assert os.path.exists(tmp_path / ".itpu_cache" / "eeg.csv" / "meta.json")
+
+    X, y, fallback = load_eeg_eye_state(str(tmp_path / "missing.csv"))
+    assert fallback and X.shape == (15_000, 14)
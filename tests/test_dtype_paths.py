@@ -0,0 +1,60 @@
+# tests/test_dtype_paths.py
+"""Gates for the native int16 (hist) and float32 (KSG) paths.
+
+Both must reproduce the float64 computation on the same values at the
+validation operating points (KSG: N=10000, k=4; hist: bins 32/64).
+"""
+import warnings
+
+import numpy as np
+import pytest
+
+from itpu.kernels_sw.hist import hist_codes
+from itpu.kernels_sw.ksg import ksg_mi_estimate
+from itpu.sdk import ITPU
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.uint8, np.int16, np.uint16])
+@pytest.mark.parametrize("rng_range", [None, (-100, 300)])
+def test_int_lut_codes_match_float_path(dtype, rng_range):
+    rng = np.random.default_rng(1)
+    info = np.iinfo(dtype)
+    full = rng.integers(info.min, info.max, 50_000, endpoint=True).astype(dtype)
+    narrow = np.clip(np.round(rng.normal(size=50_000) * 800), info.min, info.max).astype(dtype)
+    for x in (full, narrow, narrow[::3], narrow[:40]):
+        np.testing.assert_array_equal(
+            hist_codes(x, 64, range=rng_range), hist_codes(x.astype(np.float64), 64, range=rng_range)
+        )
+
+
+@pytest.mark.parametrize("bins", [32, 64])
+def test_int16_hist_mi_unchanged(bins):
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=20_000)
+    y = 0.6 * x + rng.normal(size=20_000)
+    xi = np.round(x * 2000).astype(np.int16)
+    yi = np.round(y * 2000).astype(np.int16)
+    sdk = ITPU()
+    assert sdk.mutual_info(xi, yi, bins=bins) == sdk.mutual_info(xi.astype(float), yi.astype(float), bins=bins)
+
+
+@pytest.mark.parametrize("rho", [0.0, 0.3, 0.6, 0.9])
+def test_float32_ksg_matches_float64(rho):
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=10_000)
+    y = rho * x + np.sqrt(1 - rho**2) * rng.normal(size=10_000)
+    x32, y32 = x.astype(np.float32), y.astype(np.float32)
+    mi32 = ksg_mi_estimate(x32, y32, k=4, clip_zero=False)[0]
+    mi64 = ksg_mi_estimate(x32.astype(np.float64), y32.astype(np.float64), k=4, clip_zero=False)[0]
+    assert mi32 == mi64
+
+
+def test_float32_ksg_with_ties():
+    rng = np.random.default_rng(4)
+    x = np.round(rng.normal(size=3000) * 20).astype(np.float32)
+    y = np.round(x + rng.normal(size=3000) * 20).astype(np.float32)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        mi32 = ksg_mi_estimate(x, y, k=4, clip_zero=False)[0]
+        mi64 = ksg_mi_estimate(x.astype(np.float64), y.astype(np.float64), k=4, clip_zero=False)[0]
+    assert mi32 == pytest.approx(mi64, abs=1e-12)
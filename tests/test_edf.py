@@ -0,0 +1,97 @@
+# tests/test_edf.py
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from itpu.data import EDFReader
+from itpu.utils.streaming import StreamingMI
+
+
+def _write_edf(path, digital, spr, pmin, pmax, dmin, dmax, labels, bdf=False, duration=1.0, n_records_field=None):
+    """Minimal EDF/BDF writer: digital is a list of (n_records * spr[i],) integer arrays."""
+    ns = len(digital)
+    n_records = len(digital[0]) // spr[0]
+    f = lambda v, w: str(v).ljust(w)[:w].encode("ascii")
+    head = (b"\xffBIOSEMI" if bdf else f("0", 8)) + f("X X X test", 80) + f("Startdate 01-JAN-2026", 80)
+    head += f("01.01.26", 8) + f("00.00.00", 8) + f(256 * (ns + 1), 8)
+    head += f("24BIT" if bdf else "", 44) + f(n_records if n_records_field is None else n_records_field, 8)
+    head += f(duration, 8) + f(ns, 4)
+    columns = [labels, ["AgAgCl"] * ns, ["uV"] * ns, pmin, pmax, dmin, dmax, [""] * ns, spr, [""] * ns]
+    for values, (_, width) in zip(columns, [(0, 16), (0, 80), (0, 8), (0, 8), (0, 8), (0, 8), (0, 8),
+                                             (0, 80), (0, 8), (0, 32)]):
+        head += b"".join(f(v, width) for v in values)
+    body = bytearray()
+    for r in range(n_records):
+        for d, n in zip(digital, spr):
+            block = np.asarray(d[r * n:(r + 1) * n], dtype="<i4")
+            if bdf:
+                body += block.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+            else:
+                body += block.astype("<i2").tobytes()
+    with open(path, "wb") as fh:
+        fh.write(head + bytes(body))
+
+
+def _signals(rng, n_records, spr, lo, hi):
+    return [rng.integers(lo, hi + 1, size=n_records * n) for n in spr]
+
+
+@pytest.mark.parametrize("bdf", [False, True])
+def test_header_scaling_and_slices(tmp_path, bdf):
+    rng = np.random.default_rng(0)
+    lo, hi = (-(2 ** 23), 2 ** 23 - 1) if bdf else (-32768, 32767)
+    spr = [256, 256, 128]
+    dig = _signals(rng, 5, spr, lo, hi)
+    path = tmp_path / ("rec.bdf" if bdf else "rec.edf")
+    _write_edf(path, dig, spr, [-3200, -100, 0], [3200, 100, 1], [lo] * 3, [hi] * 3, ["Fp1", "Fp2", "Resp"], bdf=bdf)
+
+    with EDFReader(str(path)) as edf:
+        assert edf.is_bdf == bdf and edf.n_records == 5 and edf.labels == ["Fp1", "Fp2", "Resp"]
+        np.testing.assert_array_equal(edf.sample_rate, [256, 256, 128])
+        assert edf.header["physical_dimension"] == ["uV"] * 3
+        assert edf.raw("Fp2").shape == ((5, 256, 3) if bdf else (5, 256))
+        np.testing.assert_array_equal(edf.digital(2), dig[2])
+        np.testing.assert_array_equal(edf.digital("Fp1", 250, 700), dig[0][250:700])
+
+        gain = np.array([6400.0, 200.0]) / (hi - lo)
+        expected = gain[:, None] * (np.stack(dig[:2])[:, 300:900] - lo) + np.array([-3200.0, -100.0])[:, None]
+        np.testing.assert_allclose(edf.read(["Fp1", 1], 300, 900), expected, rtol=1e-12)
+        assert edf.read([0], physical=False).dtype == np.int32
+        with pytest.raises(ValueError, match="sample rates"):
+            edf.read()
+        with pytest.raises(KeyError):
+            edf.raw("Cz")
+
+
+def test_chunks_feed_streaming_mi_with_bounded_memory(tmp_path):
+    rng = np.random.default_rng(1)
+    n_records, spr = 240, [256, 256, 256]
+    dig = _signals(rng, n_records, spr, -2000, 2000)
+    dig[1] = np.clip(dig[0] + rng.integers(-500, 500, size=dig[0].size), -32768, 32767)
+    path = tmp_path / "long.edf"
+    # n_records = -1: header written before the recording finished.
+    _write_edf(path, dig, spr, [-1000] * 3, [1000] * 3, [-32768] * 3, [32767] * 3,
+               ["C3", "C4", "EDF Annotations"], n_records_field=-1)
+
+    edf = EDFReader(str(path))
+    assert edf.n_records == n_records
+    whole = edf.read()  # annotations are skipped by default
+    assert whole.shape == (2, n_records * 256)
+
+    chunks = list(edf.iter_chunks(1000, dtype=np.float32))
+    assert all(c.shape[1] == 1000 for c in chunks[:-1]) and chunks[0].dtype == np.float32
+    np.testing.assert_allclose(np.concatenate(chunks, axis=1), whole, rtol=1e-6)
+
+    ranges = [(-1000, 1000)] * 2
+    ref, streamed = StreamingMI(2, 2048, 512, bins=16, ranges=ranges), StreamingMI(2, 2048, 512, bins=16, ranges=ranges)
+    expected = ref.push(whole)
+    got = np.concatenate([streamed.push(c) for c in edf.iter_chunks(777)])
+    np.testing.assert_allclose(got, expected, atol=1e-9)
+
+    tracemalloc.start()
+    for _ in edf.iter_chunks(4096):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 20 * 4096 * 8 < whole.nbytes
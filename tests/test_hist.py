@@ -1,4 +1,7 @@
 import numpy as np
+import pytest
+
+from itpu.kernels_sw.hist import hist_codes
 from itpu.sdk import ITPU
 
 def test_mi_independent_near_zero():
@@ -16,3 +19,36 @@ def test_mi_linear_positive():
     x = rng.normal(size=5000); y = 0.7*x + 0.3*rng.normal(size=5000)
     mi = ITPU(device="software").mutual_info(x, y, method="hist", bins=64)
     assert mi > 0.1
+
+
+@pytest.mark.parametrize("bad", [np.nan, np.inf, -np.inf])
+def test_non_finite_input_raises_like_np_histogram(bad):
+    x = np.random.default_rng(0).normal(size=100)
+    x[10] = bad
+    with pytest.raises(ValueError, match="range of .* is not finite"):
+        np.histogram(x, bins=8)
+    with pytest.raises(ValueError, match="autodetected range of .* is not finite"):
+        hist_codes(x, 8)
+    with pytest.raises(ValueError, match="is not finite"):
+        ITPU().mutual_info(x, np.arange(100.0), bins=8)
+    with pytest.raises(ValueError, match="supplied range"):
+        hist_codes(np.zeros(4), 8, range=(0.0, np.inf))
+
+
+@pytest.mark.parametrize("shape", [(300_001,), (3, 100_001)])
+def test_hist_codes_scratch_is_bounded(shape):
+    import tracemalloc
+
+    from itpu.kernels_sw.hist import _CHUNK
+
+    x = np.random.default_rng(1).normal(size=shape).astype(np.float32)
+    rows = x.reshape(-1, shape[-1]).astype(np.float64)
+    want = np.stack([np.clip(np.searchsorted(np.histogram_bin_edges(row, 32), row, "right") - 1, 0, 31)
+                     for row in rows]).reshape(shape)
+    tracemalloc.start()
+    codes = hist_codes(x, 32)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    np.testing.assert_array_equal(codes, want)
+    # codes plus about one chunk of float64/bool scratch, not 10 bytes per sample
+    assert peak < codes.nbytes + 24 * _CHUNK
@@ -0,0 +1,67 @@
+# tests/test_ingest.py
+import array
+
+import numpy as np
+import pytest
+
+from itpu.ingest import as_1d, copy_stats, reset_copy_stats
+from itpu.kernels_sw.streaming import multiscale_windowed_mi
+from itpu.sdk import ITPU
+
+
+@pytest.fixture
+def eeg():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(4000, 8))  # row-major (samples, channels)
+    X[:, 1] += 0.8 * X[:, 0]
+    return X
+
+
+def test_strided_columns_are_not_copied(eeg):
+    col = eeg[:, 1]
+    assert np.shares_memory(as_1d(col), eeg)
+    assert np.shares_memory(as_1d(eeg[:, 1:2]), eeg)
+
+    reset_copy_stats()
+    sdk = ITPU()
+    mi = sdk.mutual_info(eeg[:, 0], eeg[:, 1], method="hist", bins=32)
+    assert copy_stats()["bytes_copied"] == 0
+    assert mi == sdk.mutual_info(eeg[:, 0].copy(), eeg[:, 1].copy(), method="hist", bins=32)
+
+    # KSG must pack points for cKDTree; that copy is accounted for.
+    sdk.mutual_info(eeg[:, 0], eeg[:, 1], method="ksg")
+    assert copy_stats()["by_reason"] == {"ksg_pack": 4000 * 2 * 8}
+
+
+def test_memmap_and_foreign_buffers(tmp_path, eeg):
+    path = tmp_path / "rec.npy"
+    np.save(path, eeg.astype(np.float32))
+    mm = np.load(path, mmap_mode="r")
+    sdk = ITPU()
+    ref = sdk.mutual_info(mm[:, 0].astype(np.float64), mm[:, 1].astype(np.float64), bins=32)
+
+    reset_copy_stats()
+    assert sdk.mutual_info(mm[:, 0], mm[:, 1], bins=32) == ref
+    x = np.ascontiguousarray(mm[:, 0])
+    y = np.ascontiguousarray(mm[:, 1])
+    assert sdk.mutual_info(memoryview(x), memoryview(y), bins=32) == ref
+    assert sdk.mutual_info(array.array("f", x.tobytes()), y, bins=32) == ref
+    assert sdk.mutual_info(np.from_dlpack(x), y, bins=32) == ref
+    assert copy_stats()["n_copies"] == 0
+
+    sdk.mutual_info(x.tolist(), y, bins=32)  # Python lists must be converted
+    assert copy_stats()["by_reason"]["convert"] > 0
+
+
+def test_int16_and_float32_windowed_without_upcast(eeg):
+    x = np.round(eeg[:, 0] * 1000).astype(np.int16)
+    y = np.round(eeg[:, 1] * 1000).astype(np.int16)
+    x64, y64 = x.astype(np.float64), y.astype(np.float64)
+    mask = np.ones(len(x), dtype=bool)
+    mask[100:200] = False
+    for kw in ({}, {"mask": mask}):
+        got = multiscale_windowed_mi(x, y, [500, 1000], 250, bins=16, **kw)
+        want = multiscale_windowed_mi(x64, y64, [500, 1000], 250, bins=16, **kw)
+        for w in want:
+            np.testing.assert_array_equal(got[w][1], want[w][1])
+    assert ITPU().mutual_info(x, y, bins=16) == ITPU().mutual_info(x64, y64, bins=16)
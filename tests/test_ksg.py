@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from itpu.kernels_sw.ksg import ksg_mi_estimate
 
 def test_independent_gaussians():
@@ -44,3 +45,50 @@ def test_chebyshev_accuracy_vs_true_mi():
     true_mi = -0.5 * np.log(1 - rho**2)  # ≈ 0.223 nats
     mi, _ = ksg_mi_estimate(x, y, metric="chebyshev")
     assert abs(mi - true_mi) < 0.05
+
+
+def test_windowed_ksg_incremental_matches_per_window():
+    from itpu.kernels_sw.ksg import windowed_ksg_mi
+
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=4000)
+    y = 0.6 * x + rng.normal(size=4000)
+    for xs, ys in [(x, y), (np.round(x, 1), np.round(y, 1))]:  # with heavy ties
+        s_inc, mi_inc, ex = windowed_ksg_mi(xs, ys, window_size=500, hop_size=25, k=5)
+        s_ref, mi_ref, _ = windowed_ksg_mi(xs, ys, window_size=500, hop_size=25, k=5, incremental=False)
+        assert ex["incremental"]
+        np.testing.assert_array_equal(s_inc, s_ref)
+        np.testing.assert_array_equal(mi_inc, mi_ref)
+
+
+def test_sliding_ksg_recomputes_only_near_hop():
+    from itpu.kernels_sw.ksg import SlidingKSG
+
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=3000)
+    y = x + rng.normal(size=3000)
+    engine = SlidingKSG(2000, k=5)
+    engine.push(x[:2000], y[:2000])
+    before = engine.n_recomputed
+    for a in range(2000, 3000, 20):
+        engine.push(x[a:a + 20], y[a:a + 20])
+    per_step = (engine.n_recomputed - before) / 50
+    assert per_step < 20 * (2 * 5 + 3)  # ~ (2k + 1) * hop, far below the window
+    assert engine.mi == ksg_mi_estimate(x[1000:], y[1000:], k=5)[0]
+
+
+def test_sliding_ksg_grid_queries_match_batch():
+    from itpu.kernels_sw.ksg import SlidingKSG
+
+    rng = np.random.default_rng(5)
+    x = np.round(rng.normal(size=20400), 2)  # ties across grid cells
+    y = x + rng.normal(size=20400)
+    engine = SlidingKSG(20000, k=5)
+    engine.push(x[:20000], y[:20000])
+    before = engine.n_recomputed
+    for a in range(20000, 20400, 10):
+        engine.push(x[a:a + 10], y[a:a + 10])
+    assert engine.n_recomputed - before < 40 * 10 * (2 * 5 + 3)
+    assert engine.mi == ksg_mi_estimate(x[400:], y[400:], k=5)[0]
+    with pytest.raises(ValueError):
+        engine.push([np.nan], [0.0])
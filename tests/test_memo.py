@@ -0,0 +1,77 @@
+# tests/test_memo.py
+import numpy as np
+import pytest
+
+import itpu
+from itpu.memo import MemoCache, fingerprint
+from itpu.sdk import ITPU
+from itpu.types import EstimatorValue
+
+
+def _pair(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    return x, 0.6 * x + rng.normal(size=n)
+
+
+def test_fingerprint_covers_contents_and_layout():
+    X = np.random.default_rng(0).normal(size=(300, 4))
+    col = X[:, 1]
+    assert fingerprint(col) == fingerprint(X[:, 1])
+    assert fingerprint(col) != fingerprint(np.ascontiguousarray(col))  # strides differ
+    assert fingerprint(col.astype(np.float32)) != fingerprint(col.astype(np.float32).astype(np.float64))
+    changed = X.copy()
+    changed[7, 1] += 1e-12
+    assert fingerprint(changed[:, 1]) != fingerprint(col)
+    assert fingerprint(X.T) == fingerprint(X.copy().T)
+
+
+def test_memoised_results_match_and_keep_estimator_tags():
+    x, y = _pair()
+    memo = MemoCache()
+    sdk, plain = ITPU(memo=memo), ITPU()
+    first = sdk.mutual_info(x, y, method="ksg", k=4)
+    again = sdk.mutual_info(x, y, method="ksg", k=4)
+    assert isinstance(again, EstimatorValue) and again.estimator == "ksg"
+    assert again == first == plain.mutual_info(x, y, method="ksg", k=4)
+    assert (memo.hits, memo.misses) == (1, 1)
+
+    assert sdk.mutual_info(x, y, method="ksg", k=5) != first  # parameter is part of the key
+    hist = sdk.mutual_info(x, y, method="hist", bins=16)
+    with pytest.raises(TypeError):
+        hist == first  # noqa: B015
+    local = sdk.mutual_info(x, y, method="hist", bins=16, pointwise=True)
+    local[:] = 0  # callers get a private copy
+    np.testing.assert_array_equal(sdk.mutual_info(x, y, method="hist", bins=16, pointwise=True),
+                                  plain.mutual_info(x, y, method="hist", bins=16, pointwise=True))
+    assert memo.misses == 4 and memo.hits == 2
+
+
+def test_byte_budget_lru_and_disk_tier(tmp_path):
+    x, y = _pair(n=500)
+    memo = MemoCache(max_bytes=2 * (500 * 8 + 128), disk_dir=str(tmp_path))
+    sdk = ITPU(memo=memo)
+    for bins in (4, 8, 16):
+        sdk.mutual_info(x, y, bins=bins, pointwise=True)
+    assert memo.evictions == 1 and len(memo) == 2 and memo.nbytes <= memo.max_bytes
+
+    sdk.mutual_info(x, y, bins=4, pointwise=True)  # evicted from memory, found on disk
+    assert memo.disk_hits == 1
+
+    fresh = ITPU(memo=MemoCache(disk_dir=str(tmp_path)))  # e.g. the next process
+    assert fresh.mutual_info(x, y, bins=16) == ITPU().mutual_info(x, y, bins=16)
+    assert fresh.mutual_info(x, y, bins=16, pointwise=True).shape == (500,)
+    assert fresh.memo.stats()["disk_hits"] == 1
+
+
+def test_to_common_basis_memo_is_opt_in():
+    x, y = _pair(seed=3)
+    hist = ITPU().mutual_info(x, y, bins=16)
+    plain = itpu.to_common_basis(hist, "ksg", x, y, k=3)
+    assert not hasattr(itpu, "_basis_itpu")  # no process-wide cache by default
+
+    memo = MemoCache()
+    a = itpu.to_common_basis(hist, "ksg", x, y, memo=memo, k=3)
+    b = itpu.to_common_basis(hist, "ksg", x, y, memo=memo, k=3)
+    assert a == b == plain and b.estimator == "ksg"
+    assert (memo.hits, memo.misses) == (1, 1)
@@ -17,3 +17,23 @@ def test_hist_mi_positive_and_reasonable():
     assert mi > 0
     # histogram MI will be biased low; allow 30% tolerance
     assert abs(mi - mi_ref) / mi_ref < 0.3
+
+
+def test_pointwise_mean_equals_estimate():
+    import pytest
+    from itpu.sdk import ITPU
+    from itpu.utils.windowed import windowed_mean
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=4000)
+    y = x + rng.normal(size=4000)
+    sdk = ITPU(device="software")
+    for method, kw in [("hist", {"bins": 16}), ("ksg", {"k": 5})]:
+        local = sdk.mutual_info(x, y, method=method, pointwise=True, **kw)
+        assert local.shape == x.shape
+        assert local.mean() == pytest.approx(float(sdk.mutual_info(x, y, method=method, **kw)), abs=1e-12)
+
+    local = sdk.mutual_info(x, y, method="hist", bins=16, pointwise=True)
+    starts, means = windowed_mean(local, window_size=500, hop_size=100)
+    ref = [local[s:s + 500].mean() for s in starts]
+    np.testing.assert_allclose(means, ref, atol=1e-12)
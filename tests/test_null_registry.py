@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from itpu.stats.null_registry import NullRegistry, rank_transform
+from itpu.stats.surrogate_test import surrogate_test, surrogate_test_matrix
+
+
+def test_rank_transform_is_permutation_of_range():
+    x = np.array([3.0, 1.0, 2.0, 1.0])
+    ranks = rank_transform(x, rng=0)
+    np.testing.assert_array_equal(ranks[[0, 2]], [3.0, 2.0])
+    np.testing.assert_array_equal(np.sort(ranks[[1, 3]]), [0.0, 1.0])
+    np.testing.assert_array_equal(rank_transform(x, rng=0), ranks)
+
+
+def test_rank_ties_broken_randomly_not_by_position():
+    # Independent, heavily tied (4-level) signals: tie-breaking by position
+    # would make both rank series rise with time inside every tie group.
+    rng = np.random.default_rng(0)
+    n = 2000
+    x, y = rng.integers(0, 4, n), rng.integers(0, 4, n)
+    first_ties = rank_transform(x, rng=1)[x == 0]
+    assert not np.all(np.diff(first_ties) > 0)
+
+    null = NullRegistry(rng=0).get("hist", n, 200, bins=8)
+    result = surrogate_test(x, y, method="hist", bins=8, n_surrogates=200, transform="rank",
+                            null_registry=NullRegistry(rng=0), rng=2)
+    assert result.mi < np.quantile(null, 0.99)
+    assert result.p_value > 0.01
+
+
+def test_null_computed_once_and_reused():
+    registry = NullRegistry(rng=0)
+    a = registry.get("hist", 200, 50, bins=8)
+    b = registry.get("hist", 200, 50, bins=8)
+    assert registry.n_computed == 50
+    np.testing.assert_array_equal(a, b)
+    # Asking for more extends the stored null instead of recomputing it.
+    c = registry.get("hist", 200, 80, bins=8)
+    assert registry.n_computed == 80
+    np.testing.assert_array_equal(c[:50], a)
+    # A different key is a different null.
+    registry.get("hist", 200, 10, bins=16)
+    assert registry.n_computed == 90
+
+
+def test_null_persisted_on_disk(tmp_path):
+    first = NullRegistry(cache_dir=str(tmp_path), rng=0)
+    a = first.get("hist", 150, 30, bins=8)
+    second = NullRegistry(cache_dir=str(tmp_path), rng=1)
+    b = second.get("hist", 150, 30, bins=8)
+    assert second.n_computed == 0
+    np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize(
+    "transform, surrogate_type, match",
+    [(None, "shuffle", "rank transform"), ("rank", "block", "exchangeable"),
+     ("rank", "iaaft", "exchangeable")],
+)
+def test_refuses_non_exchangeable_setups(transform, surrogate_type, match):
+    registry = NullRegistry(rng=0)
+    x = np.random.default_rng(0).standard_normal(100)
+    with pytest.raises(ValueError, match=match):
+        surrogate_test(
+            x, x, method="hist", n_surrogates=10, surrogate_type=surrogate_type,
+            transform=transform, null_registry=registry,
+        )
+    assert registry.n_computed == 0
+
+
+def test_shared_null_matches_per_pair_null_in_distribution():
+    rng = np.random.default_rng(5)
+    x = rng.exponential(size=300)
+    y = rng.standard_normal(300) ** 3
+    direct = surrogate_test(
+        x, y, method="hist", n_surrogates=400, transform="rank", rng=1, bins=8
+    )
+    shared = NullRegistry(rng=2).get("hist", 300, 400, bins=8)
+    assert stats.ks_2samp(direct.null_distribution, shared).pvalue > 0.01
+
+
+def test_surrogate_test_uses_registry():
+    registry = NullRegistry(rng=0)
+    rng = np.random.default_rng(6)
+    x = rng.standard_normal(250)
+    y = 0.7 * x + rng.standard_normal(250)
+    result = surrogate_test(
+        x, y, method="hist", n_surrogates=99, transform="rank",
+        null_registry=registry, bins=8,
+    )
+    assert registry.n_computed == 99
+    assert result.p_value == pytest.approx(1 / 100)
+    np.testing.assert_array_equal(
+        result.null_distribution, registry.get("hist", 250, 99, bins=8)
+    )
+
+
+def test_matrix_shares_one_null_across_pairs():
+    registry = NullRegistry(rng=0)
+    rng = np.random.default_rng(7)
+    X = rng.standard_normal((200, 6))
+    X[:, 1] += X[:, 0]
+    result = surrogate_test_matrix(
+        X, method="hist", n_surrogates=199, transform="rank",
+        null_registry=registry, bins=8,
+    )
+    assert registry.n_computed == 199
+    assert result.p_values[0, 1] == pytest.approx(1 / 200)
+    null = registry.get("hist", 200, 199, bins=8)
+    expected = (np.sum(null >= result.mi[2, 3]) + 1) / 200
+    assert result.p_values[2, 3] == pytest.approx(expected)
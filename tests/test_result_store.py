@@ -0,0 +1,64 @@
+# tests/test_result_store.py
+import json
+
+import numpy as np
+import pytest
+
+from itpu.io import ResultStore
+from itpu.types import EstimatorValue
+from itpu.utils.streaming import StreamingMI
+
+
+def test_append_grow_and_range_reads(tmp_path):
+    rng = np.random.default_rng(0)
+    session = StreamingMI(4, 256, 64, bins=8, ranges=(-4, 4))
+    rows = session.push(rng.normal(size=(4, 4096)))
+    store = ResultStore(str(tmp_path / "run"), capacity=8, flush_interval_s=None)
+    for w, row in enumerate(rows):
+        store.append(w * 0.25, *session.pairs, row)
+    store.append(100.0, 0, 1, EstimatorValue(0.5, "ksg"), p_value=0.01)
+
+    n_pairs = len(session.pairs[0])
+    assert len(store) == len(rows) * n_pairs + 1
+    assert store._capacity >= len(store)  # grew from 8 rows by doubling
+    whole = store.read()
+    np.testing.assert_array_equal(whole["mi"][:-1], rows.ravel())
+    np.testing.assert_array_equal(whole["i"][:n_pairs], session.pairs[0])
+    assert whole["estimator"][-1] == "ksg" and set(whole["estimator"][:-1]) == {"hist"}
+    assert np.isnan(whole["p_value"][0]) and whole["p_value"][-1] == 0.01
+
+    part = store.read(n_pairs, 3 * n_pairs, columns=["time", "mi"])
+    assert set(part) == {"time", "mi"}
+    np.testing.assert_array_equal(part["mi"], rows[1:3].ravel())
+    window = store.read_time(0.5, 1.0)
+    np.testing.assert_array_equal(window["time"], np.repeat([0.5, 0.75], n_pairs))
+
+    with pytest.raises(ValueError, match="time order"):
+        store.append(1.0, 0, 1, 0.1)
+    store.close()
+
+
+def test_flush_commits_and_reopen_resumes(tmp_path):
+    path = str(tmp_path / "run")
+    store = ResultStore(path, flush_every=4, flush_interval_s=None)
+    store.append(np.arange(3.0), 0, 1, [0.1, 0.2, 0.3])
+    with open(f"{path}/meta.json") as f:
+        assert json.load(f)["n_records"] == 0  # below flush_every: not yet committed
+    store.append(3.0, 0, 1, 0.4)
+    with open(f"{path}/meta.json") as f:
+        assert json.load(f)["n_records"] == 4
+    store.append(4.0, 0, 1, 0.5)  # never flushed: lost on "crash"
+    del store
+
+    store = ResultStore(path, flush_interval_s=None)
+    assert len(store) == 4
+    store.append(4.0, 2, 3, 0.9, estimator="ksg")
+    store.close()
+
+    reader = ResultStore(path, mode="r")
+    got = reader.read()
+    np.testing.assert_array_equal(got["mi"], [0.1, 0.2, 0.3, 0.4, 0.9])
+    assert list(got["estimator"]) == ["hist"] * 4 + ["ksg"]
+    with pytest.raises(RuntimeError, match="read-only"):
+        reader.append(5.0, 0, 1, 0.1)
+    assert len(ResultStore(path, mode="w")) == 0
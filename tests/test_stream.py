@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from itpu.stream import (
+    BoundedQueue,
+    Chunk,
+    ListSink,
+    StreamingMIStage,
+    aiter_source,
+    run_pipeline,
+    simulated_source,
+)
+from itpu.utils.streaming import StreamingMI
+
+
+def test_pipeline_matches_direct_session():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3, 2000))
+    chunks = [X[:, a:a + 40] for a in range(0, 2000, 40)]
+    sink = ListSink()
+    stage = StreamingMIStage(3, window=500, hop=100, bins=8, ranges=(-4, 4))
+    stats = asyncio.run(run_pipeline(aiter_source(chunks), [stage], sink))
+
+    direct = StreamingMI(3, window=500, hop=100, bins=8, ranges=(-4, 4)).push(X)
+    assert stats.n_chunks == 50 and stats.n_dropped == 0
+    assert [u.end for u in sink.items] == list(range(500, 2001, 100))
+    np.testing.assert_allclose(np.vstack([u.values for u in sink.items]), direct)
+
+
+@pytest.mark.parametrize("policy", ["drop_oldest", "drop_newest", "coalesce"])
+def test_slow_sink_bounds_queues(policy):
+    async def main():
+        sink = ListSink(delay_s=0.1)  # consumer slower than the 40 ms source
+        stage = StreamingMIStage(4, window=100, hop=10, bins=8, ranges=(-6, 6))
+        stats = await run_pipeline(
+            simulated_source(25, chunk_s=0.04, n_channels=4),
+            [stage], sink, maxsize=2, policy=policy, max_merge_samples=200,
+        )
+        return sink, stats
+
+    sink, stats = asyncio.run(main())
+    assert stats.n_chunks == 25
+    assert stats.n_dropped + stats.n_coalesced > 0
+    assert stats.n_outputs == len(sink.items) > 0
+    ends = [u.end for u in sink.items]
+    assert ends == sorted(ends)
+
+
+def test_block_policy_backpressure():
+    async def main():
+        q = BoundedQueue(maxsize=2, policy="block")
+        await q.put(1)
+        await q.put(2)
+        waiter = asyncio.ensure_future(q.put(3))
+        await asyncio.sleep(0.01)
+        assert not waiter.done() and q.qsize() == 2
+        assert await q.get() == 1
+        await waiter
+        return [await q.get(), await q.get()]
+
+    assert asyncio.run(main()) == [2, 3]
+
+
+def test_coalesce_merges_chunks():
+    async def main():
+        q = BoundedQueue(maxsize=1, policy="coalesce")
+        await q.put(Chunk(np.zeros((2, 5)), 0))
+        await q.put(Chunk(np.ones((2, 5)), 5))
+        return await q.get(), q
+
+    merged, q = asyncio.run(main())
+    assert merged.n_samples == 10 and merged.start == 0 and q.n_coalesced == 1
+
+
+def test_realtime_throughput_latency_and_loop_responsiveness():
+    async def main():
+        gaps = []
+
+        async def heartbeat():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        hb = asyncio.ensure_future(heartbeat())
+        sink = ListSink()
+        stage = StreamingMIStage(8, window=500, hop=10, bins=32, ranges=(-6, 6))
+        stats = await run_pipeline(
+            simulated_source(50, chunk_s=0.04, n_channels=8, sample_rate=250),
+            [stage], sink, maxsize=4, policy="drop_oldest",
+        )
+        hb.cancel()
+        return stats, gaps
+
+    stats, gaps = asyncio.run(main())
+    assert stats.n_samples == 50 * 10
+    assert stats.throughput > 200  # keeps up with 250 Hz
+    assert stats.latency_p99 < 100
+    assert max(gaps) < 0.1  # compute runs off the event loop
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from itpu.kernels_sw.hist import hist_codes, mi_from_codes
+from itpu.utils.streaming import StreamingMI
+
+
+def _feed(session, X, sizes):
+    out, pos = [], 0
+    for m in sizes:
+        if pos >= X.shape[1]:
+            break
+        out.append(session.push(X[:, pos:pos + m]))
+        pos += m
+    return np.vstack(out)
+
+
+@pytest.mark.parametrize("ranges", [None, (-4.0, 4.0)])
+def test_streaming_hist_matches_batch(ranges):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(4, 3000))
+    X[1] += X[0]
+    s = StreamingMI(4, window=400, hop=50, bins=8, ranges=ranges, resync_every=5)
+    res = _feed(s, X, rng.integers(1, 150, size=100))
+    ends = np.arange(400, 3001, 50)
+    assert res.shape == (len(ends), 6)
+    for e, row in zip(ends, res):
+        for p, (i, j) in enumerate(zip(*s.pairs)):
+            ref = mi_from_codes(
+                hist_codes(X[i, e - 400:e], 8, range=s._ranges[i]),
+                hist_codes(X[j, e - 400:e], 8, range=s._ranges[j]),
+                8,
+            )
+            assert row[p] == pytest.approx(ref, abs=1e-10)
+    M = s.matrix()
+    assert np.isnan(np.diag(M)).all() and np.allclose(M, M.T, equal_nan=True)
+    assert M[0, 1] == res[-1, 0]
+
+
+def test_streaming_only_completed_windows_and_latency():
+    rng = np.random.default_rng(1)
+    s = StreamingMI(3, window=200, hop=100, bins=8, ranges=(-5, 5), budget_ms=1e6)
+    assert s.push(rng.normal(size=(3, 150))).shape == (0, 3)
+    assert s.push(rng.normal(size=(3, 60))).shape == (1, 3)
+    assert s.push(rng.normal(size=(3, 250))).shape == (2, 3)  # ends at 300, 400
+    assert s.latency_p50 <= s.latency_p99 and s.n_over_budget == 0
+
+
+def test_streaming_ksg_and_validation():
+    from itpu.kernels_sw.ksg import ksg_mi_estimate
+
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(2, 700))
+    X[1] += X[0]
+    s = StreamingMI(2, window=300, hop=200, k=5)
+    res = s.push(X)
+    assert res.shape == (3, 1)
+    assert res[-1, 0] == pytest.approx(ksg_mi_estimate(X[0, 400:], X[1, 400:], k=5)[0])
+    with pytest.raises(ValueError):
+        StreamingMI(2, window=300, hop=200)
+    with pytest.raises(ValueError):
+        s.push(X[:1])
@@ -0,0 +1,278 @@
+"""Tests for surrogate_test() options beyond the locked validation gates."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from itpu.stats.surrogate_test import surrogate_test, surrogate_test_matrix
+
+
+# ---------------------------------------------------------------------------
+# Sequential (Besag-Clifford) stopping
+# ---------------------------------------------------------------------------
+
+def test_sequential_stops_early_under_null():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(300)
+    y = rng.standard_normal(300)
+    result = surrogate_test(
+        x, y, method="hist", n_surrogates=999, stopping="sequential", h=10, rng=1
+    )
+    assert result.stopping == "sequential(h=10, alpha=0.05)"
+    assert result.n_surrogates < 999
+    assert len(result.null_distribution) == result.n_surrogates
+    n_exceed = int(np.sum(result.null_distribution >= result.mi))
+    assert n_exceed == 10
+    assert result.p_value == pytest.approx(10 / result.n_surrogates)
+
+
+def test_sequential_keeps_decision_under_strong_dependence():
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(300)
+    y = 0.8 * x + 0.2 * rng.standard_normal(300)
+    result = surrogate_test(
+        x, y, method="hist", n_surrogates=199, stopping="sequential", rng=2
+    )
+    # No exceedances: sampling stops once the last alpha*(n+1) draws cannot
+    # lift p above alpha, reporting the conservative bound.
+    assert result.n_surrogates < 199
+    assert result.p_value <= 0.05
+
+
+def test_sequential_null_is_prefix_of_fixed_null():
+    rng = np.random.default_rng(2)
+    x = rng.standard_normal(200)
+    y = 0.3 * x + rng.standard_normal(200)
+    fixed = surrogate_test(x, y, method="hist", n_surrogates=99, rng=3)
+    seq = surrogate_test(
+        x, y, method="hist", n_surrogates=99, stopping="sequential", h=3, rng=3
+    )
+    assert fixed.stopping == "fixed"
+    assert fixed.n_surrogates == 99
+    np.testing.assert_allclose(
+        seq.null_distribution, fixed.null_distribution[: seq.n_surrogates]
+    )
+
+
+def test_sequential_type_one_error_controlled():
+    rejections = 0
+    n_trials = 200
+    for i in range(n_trials):
+        rng = np.random.default_rng(100 + i)
+        x = rng.standard_normal(150)
+        y = rng.standard_normal(150)
+        result = surrogate_test(
+            x, y, method="hist", n_surrogates=99, stopping="sequential", h=5,
+            rng=rng,
+        )
+        rejections += result.p_value <= 0.05
+    # Binomial(200, 0.05): mean 10, P(X > 20) < 0.002.
+    assert rejections <= 20
+
+
+def test_unknown_stopping_raises():
+    x = np.arange(10.0)
+    with pytest.raises(ValueError, match="stopping"):
+        surrogate_test(x, x, stopping="adaptive")
+
+
+# ---------------------------------------------------------------------------
+# surrogate_test_matrix
+# ---------------------------------------------------------------------------
+
+def _montage(n=400, n_channels=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, n_channels))
+    X[:, 1] = 0.8 * X[:, 0] + 0.2 * X[:, 1]
+    return X
+
+
+def test_matrix_mi_matches_pairwise_sdk():
+    from itpu.sdk import ITPU
+
+    X = _montage()
+    result = surrogate_test_matrix(X, method="hist", n_surrogates=9, rng=0, bins=16)
+    itpu = ITPU()
+    for i in range(X.shape[1]):
+        for j in range(i + 1, X.shape[1]):
+            expected = itpu.mutual_info(X[:, i], X[:, j], method="hist", bins=16)
+            assert result.mi[i, j] == pytest.approx(float(expected), abs=1e-12)
+            assert result.mi[j, i] == result.mi[i, j]
+    assert np.isnan(np.diag(result.mi)).all()
+    assert not np.diag(result.rejected).any()
+
+
+def test_matrix_applies_bh_across_pairs():
+    from itpu.stats.multiple_testing import benjamini_hochberg
+
+    X = _montage()
+    result = surrogate_test_matrix(X, method="hist", n_surrogates=499, rng=1, bins=16)
+    iu = np.triu_indices(X.shape[1], k=1)
+    bh = benjamini_hochberg(result.p_values[iu], alpha=0.05)
+    np.testing.assert_allclose(result.corrected_p_values[iu], bh["corrected_p_values"])
+    assert result.rejected[0, 1] and result.rejected[1, 0]
+    assert result.n_rejected == bh["n_rejected"]
+    np.testing.assert_array_equal(result.p_values, result.p_values.T)
+
+
+def test_matrix_null_matches_single_pair_test_in_distribution():
+    # Shared surrogates must not change the per-pair null: the raw p-value of
+    # an independent pair stays within the permutation grid and off zero.
+    X = _montage(seed=3)
+    result = surrogate_test_matrix(X, method="hist", n_surrogates=49, rng=2, bins=8)
+    p = result.p_values[np.triu_indices(X.shape[1], k=1)]
+    assert np.all((p >= 1 / 50) & (p <= 1.0))
+
+
+@pytest.mark.parametrize("surrogate_type", ["block", "iaaft"])
+def test_matrix_other_surrogates_wiring(surrogate_type):
+    X = _montage(n=128, n_channels=3)
+    result = surrogate_test_matrix(
+        X, method="hist", n_surrogates=5, surrogate_type=surrogate_type, rng=0, bins=8
+    )
+    assert result.p_values.shape == (3, 3)
+
+
+def test_matrix_ksg_wiring():
+    X = _montage(n=200, n_channels=3)
+    result = surrogate_test_matrix(X, method="ksg", n_surrogates=19, rng=0, k=5)
+    assert result.estimator == "ksg"
+    assert result.p_values[0, 1] == pytest.approx(1 / 20)
+
+
+def test_asymptotic_null_rejects_ksg():
+    x = np.arange(50.0)
+    with pytest.raises(ValueError, match="only available for method='hist'"):
+        surrogate_test(x, x, method="ksg", null="asymptotic")
+
+
+@pytest.mark.parametrize("option", [{"stopping": "sequential"}, {"tail": "gpd"}, {"keep_null": "sketch"}])
+def test_asymptotic_null_rejects_permutation_options(option):
+    x = np.random.default_rng(0).normal(size=500)
+    with pytest.raises(ValueError, match="only apply to permutation nulls"):
+        surrogate_test(x, x, method="hist", null="asymptotic", bins=4, **option)
+    # "auto" may still need them for its permutation fallback.
+    surrogate_test(x, x, method="hist", null="auto", bins=4, n_surrogates=20, **option)
+
+
+# ---------------------------------------------------------------------------
+# Generalized-Pareto tail extrapolation
+# ---------------------------------------------------------------------------
+
+def test_gpd_tail_extrapolates_exponential_null():
+    from itpu.stats.surrogate_test import _gpd_tail_p
+
+    null = np.random.default_rng(0).exponential(size=1000)
+    p, message = _gpd_tail_p(null, 10.0)
+    assert p < 1 / 1001
+    assert np.exp(-10.0) / 5 < p < np.exp(-10.0) * 5
+    assert "KS goodness-of-fit" in message
+
+
+def test_gpd_tail_matches_large_permutation_reference():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(300)
+    y = 0.3 * x + rng.standard_normal(300)
+    reference = surrogate_test(x, y, method="hist", n_surrogates=5000, bins=8, rng=1)
+    result = surrogate_test(x, y, method="hist", n_surrogates=999, tail="gpd", bins=8, rng=2)
+    assert any(w.startswith("GPD tail fit") for w in result.warnings)
+    assert reference.p_value / 3 < result.p_value < reference.p_value * 3
+
+
+def test_gpd_tail_not_used_with_many_exceedances():
+    rng = np.random.default_rng(3)
+    x = rng.standard_normal(200)
+    y = rng.standard_normal(200)
+    result = surrogate_test(x, y, method="hist", n_surrogates=199, tail="gpd", bins=8, rng=4)
+    n_exceed = int(np.sum(result.null_distribution >= result.mi))
+    assert n_exceed >= 10
+    assert result.p_value == pytest.approx((n_exceed + 1) / 200)
+    assert not any("GPD" in w for w in result.warnings)
+
+
+# ---------------------------------------------------------------------------
+# Contingency-table surrogates
+# ---------------------------------------------------------------------------
+
+def test_table_null_matches_shuffle_null():
+    from scipy import stats
+
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(1000)
+    y = 0.05 * x + rng.standard_normal(1000)
+    shuffle = surrogate_test(x, y, method="hist", n_surrogates=1000, bins=16, rng=1)
+    table = surrogate_test(
+        x, y, method="hist", n_surrogates=1000, surrogate_type="table", bins=16, rng=2
+    )
+    assert table.mi == pytest.approx(float(shuffle.mi), abs=1e-12)
+    assert stats.ks_2samp(shuffle.null_distribution, table.null_distribution).pvalue > 0.01
+
+
+def test_table_supports_sequential_stopping():
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(500)
+    y = rng.standard_normal(500)
+    result = surrogate_test(
+        x, y, method="hist", n_surrogates=9999, surrogate_type="table",
+        stopping="sequential", bins=8, rng=0,
+    )
+    assert result.n_surrogates < 9999
+
+
+def test_table_requires_hist():
+    x = np.arange(50.0)
+    with pytest.raises(ValueError, match="only available for method='hist'"):
+        surrogate_test(x, x, method="ksg", surrogate_type="table")
+
+
+# ---------------------------------------------------------------------------
+# keep_null: streaming null statistics
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("stopping", ["fixed", "sequential"])
+def test_keep_null_modes_agree_on_statistics(stopping):
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(300)
+    y = 0.1 * x + rng.standard_normal(300)
+    results = {
+        mode: surrogate_test(
+            x, y, method="hist", n_surrogates=500, bins=8, rng=1,
+            stopping=stopping, keep_null=mode, sketch_size=64,
+        )
+        for mode in ("full", "sketch", "none")
+    }
+    full = results["full"]
+    for mode in ("sketch", "none"):
+        assert results[mode].p_value == full.p_value
+        assert results[mode].power_estimate == full.power_estimate
+        assert results[mode].n_surrogates == full.n_surrogates
+        assert results[mode].null_mean == pytest.approx(full.null_mean)
+        assert results[mode].null_std == pytest.approx(full.null_std)
+    assert full.null_mean == pytest.approx(np.mean(full.null_distribution))
+    assert full.null_std == pytest.approx(np.std(full.null_distribution, ddof=1))
+    assert len(results["none"].null_distribution) == 0
+    sketch = results["sketch"].null_distribution
+    assert len(sketch) == min(64, full.n_surrogates)
+    assert np.isin(sketch, full.null_distribution).all()
+
+
+def test_sketch_reservoir_follows_caller_rng():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(300)
+    y = rng.standard_normal(300)
+
+    def kept(seed):
+        full = surrogate_test(x, y, method="hist", n_surrogates=400, bins=8, rng=seed)
+        sketch = surrogate_test(x, y, method="hist", n_surrogates=400, bins=8, rng=seed,
+                                keep_null="sketch", sketch_size=32)
+        assert np.isin(sketch.null_distribution, full.null_distribution).all()
+        return np.flatnonzero(np.isin(full.null_distribution, sketch.null_distribution))
+
+    np.testing.assert_array_equal(kept(1), kept(1))
+    assert not np.array_equal(kept(1), kept(2))
+
+
+def test_keep_null_none_rejects_gpd_tail():
+    x = np.arange(50.0)
+    with pytest.raises(ValueError, match="keep_null"):
+        surrogate_test(x, x, method="hist", tail="gpd", keep_null="none")
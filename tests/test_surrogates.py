@@ -3,7 +3,7 @@ from __future__ import annotations
 import numpy as np
 import pytest
 
-from itpu.stats.surrogates import block_bootstrap_surrogate, shuffle_surrogate, iaaft_surrogate
+from itpu.stats.surrogates import block_bootstrap_surrogate, shuffle_surrogate, iaaft_surrogate, table_surrogate
 
 
 RNG_SEED = 42
@@ -117,3 +117,42 @@ def test_iaaft_breaks_phase_correlation():
     assert not np.array_equal(surrogate, np.sort(x))  # not trivially sorted
     # LOCKED THRESHOLD — do not adjust post-hoc.
     assert abs(autocorr_surrogate - autocorr_original) < 0.05
+
+
+# ---------------------------------------------------------------------------
+# table_surrogate
+# ---------------------------------------------------------------------------
+
+ROWS = np.array([3, 4, 5, 0])
+COLS = np.array([2, 6, 4])
+
+
+def test_table_output_shape():
+    out = table_surrogate(ROWS, COLS, n_surrogates=50, rng=RNG_SEED)
+    assert out.shape == (50, 4, 3)
+
+
+def test_table_preserves_marginals():
+    out = table_surrogate(ROWS, COLS, n_surrogates=200, rng=RNG_SEED)
+    assert np.all(out >= 0)
+    assert np.all(out.sum(axis=2) == ROWS)
+    assert np.all(out.sum(axis=1) == COLS)
+
+
+def test_table_deterministic():
+    a = table_surrogate(ROWS, COLS, n_surrogates=10, rng=RNG_SEED)
+    b = table_surrogate(ROWS, COLS, n_surrogates=10, rng=RNG_SEED)
+    assert np.array_equal(a, b)
+
+
+def test_table_matches_shuffle_cell_distribution():
+    # Cell (0, 0) of a shuffled pair is hypergeometric(3, 9, 2).
+    out = table_surrogate(ROWS, COLS, n_surrogates=20000, rng=RNG_SEED)
+    freq = np.bincount(out[:, 0, 0], minlength=3) / 20000
+    expected = np.array([36, 27, 3]) / 66
+    np.testing.assert_allclose(freq, expected, atol=0.015)
+
+
+def test_table_rejects_mismatched_totals():
+    with pytest.raises(ValueError, match="same total"):
+        table_surrogate([1, 2], [1, 1], n_surrogates=1)
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from itpu.kernels_sw.hist import SlidingHistogramMI, hist_codes, mi_from_codes, sliding_windowed_mi
+from itpu.utils.windowed import windowed_mi
+
+
+def _batch_fixed_edges(x, y, window, hop, bins):
+    cx = hist_codes(x, bins, range=(x.min(), x.max()))
+    cy = hist_codes(y, bins, range=(y.min(), y.max()))
+    starts = np.arange(0, len(x) - window + 1, hop)
+    return starts, np.array([mi_from_codes(cx[s:s + window], cy[s:s + window], bins) for s in starts])
+
+
+@pytest.mark.parametrize("window,hop", [(400, 7), (400, 400), (400, 650), (1000, 40)])
+def test_sliding_matches_batch_fixed_edges(window, hop):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=6000)
+    y = 0.6 * x + rng.normal(size=6000)
+    starts, mi = sliding_windowed_mi(x, y, window, hop, bins=16)
+    ref_starts, ref = _batch_fixed_edges(x, y, window, hop, 16)
+    np.testing.assert_array_equal(starts, ref_starts)
+    np.testing.assert_allclose(mi, ref, rtol=0, atol=1e-10)
+
+
+def test_sliding_engine_push_and_resync():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=3000)
+    y = x + rng.normal(size=3000)
+    engine = SlidingHistogramMI(500, 8, (x.min(), x.max()), (y.min(), y.max()), resync_every=3)
+    for i in range(0, 3000, 25):
+        mi = engine.push(x[i:i + 25], y[i:i + 25])
+    assert engine.full and engine.count == 500
+    cx = hist_codes(x[-500:], 8, range=(x.min(), x.max()))
+    cy = hist_codes(y[-500:], 8, range=(y.min(), y.max()))
+    assert mi == pytest.approx(mi_from_codes(cx, cy, 8), abs=1e-12)
+
+
+def test_windowed_mi_global_edges():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=4000)
+    y = x + rng.normal(size=4000)
+    starts, mi = windowed_mi(x, y, window_size=1000, hop_size=200, bins=16, edges="global")
+    _, ref = _batch_fixed_edges(x, y, 1000, 200, 16)
+    np.testing.assert_allclose(mi, ref, atol=1e-10)
+    with pytest.raises(ValueError):
+        windowed_mi(x, y, window_size=1000, hop_size=200, method="ksg", edges="global")
+
+
+def test_multiscale_matches_per_window_batch():
+    from itpu.kernels_sw.streaming import multiscale_windowed_mi
+
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=5000)
+    y = 0.5 * x + rng.normal(size=5000)
+    scales = multiscale_windowed_mi(x, y, [400, 1000, 2200], hop_size=200, bins=16)
+    for window, (starts, mi) in scales.items():
+        ref_starts, ref = _batch_fixed_edges(x, y, window, 200, 16)
+        np.testing.assert_array_equal(starts, ref_starts)
+        np.testing.assert_allclose(mi, ref, atol=1e-10)
+
+
+def test_streaming_windowed_mi_mask_and_nan():
+    from itpu.kernels_sw.streaming import windowed_mi as streaming_windowed_mi
+
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=3000)
+    y = x + rng.normal(size=3000)
+    mask = rng.random(3000) > 0.1
+    x[5] = np.nan
+    valid = mask & ~np.isnan(x)
+    t_idx, mi = streaming_windowed_mi(x, y, window_size=1000, hop_size=500, bins=8, mask=mask)
+    np.testing.assert_array_equal(t_idx, [999, 1499, 1999, 2499, 2999])
+    x_range = (x[valid].min(), x[valid].max())
+    y_range = (y[valid].min(), y[valid].max())
+    for t, val in zip(t_idx, mi):
+        sl = slice(t - 999, t + 1)
+        v = valid[sl]
+        cx = hist_codes(x[sl][v], 8, range=x_range)
+        cy = hist_codes(y[sl][v], 8, range=y_range)
+        assert val == pytest.approx(mi_from_codes(cx, cy, 8), abs=1e-10)
+
+
+@pytest.mark.parametrize("decay", [0.999, 0.5])
+def test_ewma_matches_explicit_weighted_histogram(decay):
+    from itpu.kernels_sw.hist import EWMAHistogramMI, mi_from_joint
+
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=5000)
+    y = x + rng.normal(size=5000)
+    est = EWMAHistogramMI(decay, 8, (-4, 4), (-6, 6))
+    pos = 0
+    for m in rng.integers(1, 300, size=30):
+        est.push(x[pos:pos + m], y[pos:pos + m])
+        pos += m
+    cells = hist_codes(x[:pos], 8, range=(-4, 4)) * 8 + hist_codes(y[:pos], 8, range=(-6, 6))
+    w = decay ** np.arange(pos - 1, -1, -1.0)
+    joint = np.bincount(cells, weights=w, minlength=64).reshape(8, 8)
+    np.testing.assert_allclose(est.joint, joint, rtol=1e-9, atol=1e-12)
+    assert est.mi == pytest.approx(mi_from_joint(joint), abs=1e-12)
+    hx, hy, hxy = est.entropies()
+    assert est.mi == pytest.approx(hx + hy - hxy, abs=1e-12)
+    assert est.effective_n == pytest.approx(joint.sum())
+
+
+def test_ewma_series_tracks_coupling_change():
+    from itpu.kernels_sw.hist import ewma_mi_series
+
+    rng = np.random.default_rng(6)
+    x = rng.normal(size=20000)
+    y = rng.normal(size=20000)
+    y[10000:] += 2 * x[10000:]
+    t_idx, mi = ewma_mi_series(x, y, decay=0.999, hop_size=100, bins=16)
+    assert t_idx[0] == 99 and len(t_idx) == 200
+    assert mi[t_idx < 10000][-1] < 0.1 < 0.5 < mi[-1]
+
+
+def test_multiscale_rolling_prefix_small_blocks():
+    from itpu.kernels_sw.streaming import multiscale_windowed_mi
+
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=6000)
+    y = 0.5 * x + rng.normal(size=6000)
+    scales = multiscale_windowed_mi(x, y, [400, 1001], hop_size=7, bins=8)
+    for window, (starts, mi) in scales.items():
+        ref_starts, ref = _batch_fixed_edges(x, y, window, 7, 8)
+        np.testing.assert_array_equal(starts, ref_starts)
+        np.testing.assert_allclose(mi, ref, atol=1e-10)
+
+
+def test_global_windowed_mi_memory_with_indivisible_hop():
+    import tracemalloc
+
+    from itpu.kernels_sw.hist import windowed_mi as hist_windowed_mi
+    from itpu.kernels_sw.streaming import windowed_mi as streaming_windowed_mi
+
+    rng = np.random.default_rng(8)
+    x = rng.normal(size=4000)
+    y = x + rng.normal(size=4000)
+    _, ref = _batch_fixed_edges(x, y, 1001, 200, 128)
+    for run in (lambda: streaming_windowed_mi(x, y, 1001, 200, bins=128)[1],
+                lambda: hist_windowed_mi(x, y, 1001, 200, bins=128, edges="global")[1]):
+        tracemalloc.start()
+        mi = run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        np.testing.assert_allclose(mi, ref, atol=1e-10)
+        assert peak < 16 << 20
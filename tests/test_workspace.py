@@ -0,0 +1,99 @@
+# tests/test_workspace.py
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from itpu.kernels_sw.hist import hist_codes
+from itpu.sdk import ITPU
+from itpu.workspace import Workspace
+
+
+def _data(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    return x, 0.4 * x + rng.normal(size=n)
+
+
+def test_workspace_results_identical_and_allocation_free():
+    x, y = _data(3000)
+    sdk = ITPU()
+    ref = {m: sdk.mutual_info(x, y, method=m, bins=32, k=4) for m in ("hist", "ksg")}
+    with sdk.workspace(3000, bins=32, k=4) as ws:
+        reserved = ws.nbytes
+        assert reserved > 0 and ws.n_allocations == 0
+        for _ in range(3):
+            for m in ("hist", "ksg"):
+                assert sdk.mutual_info(x, y, method=m, bins=32, k=4) == ref[m]
+                assert ws.last_allocations == 0
+        assert ws.n_calls == 6 and ws.nbytes == reserved
+
+        # A different length reallocates once, then is steady again.
+        sdk.mutual_info(x[:1000], y[:1000], method="hist", bins=32)
+        assert ws.last_allocations > 0
+        sdk.mutual_info(x[1000:2000], y[1000:2000], method="hist", bins=32)
+        assert ws.last_allocations == 0
+    assert getattr(sdk._local, "workspace", None) is None
+
+
+def test_workspace_reduces_peak_memory_hist():
+    x, y = _data(200_000)
+    sdk = ITPU()
+
+    def peak():
+        tracemalloc.start()
+        sdk.mutual_info(x, y, method="hist", bins=64)
+        _, p = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return p
+
+    cold = peak()
+    with sdk.workspace(len(x), bins=64):
+        warm = peak()
+    # Only the bincount table and O(bins) temporaries remain per call.
+    assert warm < cold / 5
+
+
+@pytest.mark.parametrize("rng_range", [None, (-1.0, 1.0)])
+def test_hist_codes_out_and_work(rng_range):
+    x, _ = _data(500)
+    X = np.stack([x, 2 * x, np.ones_like(x)])
+    ws = Workspace()
+    for arr in (x, X):
+        out = np.empty(arr.shape, dtype=np.intp)
+        got = hist_codes(arr, 16, range=rng_range, out=out, work=ws)
+        assert got is out
+        np.testing.assert_array_equal(got, hist_codes(arr, 16, range=rng_range))
+
+
+def test_workspace_is_confined_to_entering_thread():
+    import threading
+
+    sdk = ITPU()
+    data = [_data(2000, seed=s) for s in range(4)]
+    expected = [sdk.mutual_info(x, y, bins=32) for x, y in data]
+    errors = []
+
+    def worker(t):
+        x, y = data[t]
+        try:
+            if t % 2:  # half the threads run inside their own workspace
+                with sdk.workspace(2000, bins=32):
+                    got = [sdk.mutual_info(x, y, bins=32) for _ in range(100)]
+            else:
+                got = [sdk.mutual_info(x, y, bins=32) for _ in range(100)]
+            if any(g != expected[t] for g in got):
+                errors.append(t)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    with sdk.workspace(1000, bins=32) as ws:
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        assert sdk.submit(*data[0], bins=32).result(timeout=10) == expected[0]
+        assert ws.n_calls == 0  # neither workers nor the dispatcher used it
+    assert errors == []
+    sdk.close()